@@ -0,0 +1,200 @@
+import argparse
+import json
+import sys
+import time
+
+from Benchmarks.Positions import POSITION_SETS
+from Domain.Board import Board
+from Domain.Move import Move
+from Domain.MoveValidator import MoveValidator
+from Service.BoardService import BoardService
+from Service.SearchStatistics import SearchStatistics
+
+OPERATIONS = ["generate_ai_move", "score", "check_win", "valid_moves"]
+
+
+def load_position(columns: str, max_depth: int = 7):
+
+    """
+    Builds a game from the columns played since the empty board, the player "0" moving first
+    :param columns: string with the column of every move
+    :param max_depth: deepest iteration searched by the AI of the game
+    :return: BoardService of the game
+    """
+
+    board_service = BoardService(Board(), MoveValidator(), max_depth=max_depth)
+
+    for index, column in enumerate(columns):
+        column = int(column)
+        token = "0" if index % 2 == 0 else "X"
+        board_service.make_move(Move(board_service.find_row(column), column, token))
+
+    return board_service
+
+
+def percentile(values: list, fraction: float):
+
+    """
+    Returns the value under which a fraction of the values lie, the nearest one being taken
+    :param values: values, at least one
+    :param fraction: fraction between 0 and 1
+    :return: value
+    """
+
+    ordered = sorted(values)
+
+    return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+
+def run_operation(operation: str, positions: list, max_depth: int = 7, repeat: int = 100):
+
+    """
+    Times an operation of BoardService on every position of a set
+    :param operation: name of the operation, one of OPERATIONS
+    :param positions: positions of the set
+    :param max_depth: deepest iteration searched by generate_ai_move
+    :param repeat: number of times the cheap operations are run on every position, a move being generated once
+    :return: dictionary with positions_per_second, nodes_per_second, mean and p95 latency in seconds
+    """
+
+    latencies = []
+    nodes = 0
+
+    for columns in positions:
+
+        board_service = load_position(columns, max_depth)
+        statistics = SearchStatistics()
+
+        if operation == "generate_ai_move":
+            calls = [lambda: board_service.generate_ai_move(statistics=statistics)]
+        elif operation == "score":
+            calls = [lambda: board_service.score(board_service.get_board(), "X")] * repeat
+        elif operation == "check_win":
+            calls = [lambda: board_service.check_win("X")] * repeat
+        elif operation == "valid_moves":
+            calls = [board_service.valid_moves] * repeat
+        else:
+            raise ValueError("Unknown operation " + operation + "!\n")
+
+        for call in calls:
+            start = time.perf_counter()
+            call()
+            latencies.append(time.perf_counter() - start)
+
+        nodes += statistics.nodes
+
+    total = sum(latencies)
+
+    return {"positions_per_second": len(latencies) / total if total else 0.0,
+            "nodes_per_second": nodes / total if total else 0.0,
+            "mean": total / len(latencies),
+            "p95": percentile(latencies, 0.95)}
+
+
+def run_benchmarks(max_depth: int = 7, repeat: int = 100, position_sets: dict = None):
+
+    """
+    Times every operation on every set of positions
+    :param max_depth: deepest iteration searched by generate_ai_move
+    :param repeat: number of times the cheap operations are run on every position
+    :param position_sets: dictionary from the name of every set to its positions, POSITION_SETS if not given
+    :return: dictionary from "set/operation" to the results of run_operation
+    """
+
+    if position_sets is None:
+        position_sets = POSITION_SETS
+
+    results = {}
+
+    for set_name, positions in position_sets.items():
+        for operation in OPERATIONS:
+            results[set_name + "/" + operation] = run_operation(operation, positions, max_depth, repeat)
+
+    return results
+
+
+def save_results(path: str, results: dict):
+
+    """
+    Writes results to a JSON baseline file
+    :param path: path of the file
+    :param results: results of run_benchmarks
+    :return:
+    """
+
+    with open(path, "w") as baseline_file:
+        json.dump(results, baseline_file, indent=2, sort_keys=True)
+
+
+def load_results(path: str):
+
+    """
+    Reads the results of a JSON baseline file
+    :param path: path of the file
+    :return: results of run_benchmarks
+    """
+
+    with open(path) as baseline_file:
+        return json.load(baseline_file)
+
+
+def find_regressions(results: dict, baseline: dict, threshold: float = 0.2):
+
+    """
+    Compares results with a baseline, a benchmark regressing when its mean latency grew by more than the threshold
+    :param results: results of run_benchmarks
+    :param baseline: results the current ones are compared with
+    :param threshold: allowed relative growth of the mean latency
+    :return: list of messages, one per regressed benchmark
+    """
+
+    regressions = []
+
+    for name, result in sorted(results.items()):
+
+        if name not in baseline:
+            continue
+
+        old_mean = baseline[name]["mean"]
+
+        if result["mean"] > old_mean * (1 + threshold):
+            regressions.append("{}: {:.6f} s instead of {:.6f} s".format(name, result["mean"], old_mean))
+
+    return regressions
+
+
+def main(arguments: list = None):
+
+    parser = argparse.ArgumentParser(description="Times the engine on fixed sets of positions")
+    parser.add_argument("--baseline", help="JSON file the results are compared with")
+    parser.add_argument("--save", help="JSON file the results are written to")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative growth of the mean latency")
+    parser.add_argument("--depth", type=int, default=7, help="deepest iteration searched by the AI")
+    parser.add_argument("--repeat", type=int, default=100, help="runs of the cheap operations on every position")
+
+    arguments = parser.parse_args(arguments)
+
+    results = run_benchmarks(arguments.depth, arguments.repeat)
+
+    for name, result in sorted(results.items()):
+        print("{:32} {:12.1f} pos/s {:12.0f} nodes/s  mean {:.6f} s  p95 {:.6f} s".format(
+            name, result["positions_per_second"], result["nodes_per_second"], result["mean"], result["p95"]))
+
+    if arguments.save is not None:
+        save_results(arguments.save, results)
+
+    if arguments.baseline is not None:
+
+        regressions = find_regressions(results, load_results(arguments.baseline), arguments.threshold)
+
+        for regression in regressions:
+            print("Regression:", regression)
+
+        if regressions:
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
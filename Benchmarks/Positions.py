@@ -0,0 +1,14 @@
+# Fixed positions of the benchmarks, every position being the columns played from the empty board, the player "0"
+# moving first. All of them have the AI ("X") to move and no winner yet
+
+OPENING = ["3", "2", "6", "315", "421", "536", "562", "41565", "32345", "41245", "24056"]
+
+MIDGAME = ["615653566514163", "062533055162322", "612332416311051", "606264264653402",
+           "6546113211234651234", "5006101351210162164", "4234353160222145524", "0454355500104161540"]
+
+ENDGAME = ["24235033622441166621363423156", "66104231421462141535412266240", "44065364634266555112511305612",
+           "13102562362006654656322341310", "153065036030223225135361066615252",
+           "235543455465215104302430023063664", "045540552053132660366205416433614",
+           "466150115410124133046366255523506"]
+
+POSITION_SETS = {"opening": OPENING, "midgame": MIDGAME, "endgame": ENDGAME}
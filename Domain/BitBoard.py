@@ -0,0 +1,415 @@
+from Domain.Windows import Geometry, DEFAULT_GEOMETRY
+
+TOKENS = ("X", "0")
+OPPONENT = {"X": "0", "0": "X"}
+
+try:
+    popcount = int.bit_count
+except AttributeError:  # Python < 3.10
+
+    def popcount(value: int):
+        return bin(value).count("1")
+
+
+def winning_cells_function(geometry: Geometry):
+
+    """
+    Builds the function finding the winning cells on the boards of a geometry, its shifts and masks being bound
+    once instead of being looked up on every call
+    :param geometry: geometry of the board
+    :return: function of (position, mask) returning the mask of the winning cells, playable or not
+    """
+
+    connect = geometry.connect
+    free_board = geometry.board_mask
+    shifts = (geometry.horizontal, geometry.diagonal_left_to_right, geometry.diagonal_right_to_left)
+
+    if connect == 4:
+
+        def winning_cells_4(position: int, mask: int):
+
+            # vertical, only upwards
+            cells = (position << 1) & (position << 2) & (position << 3)
+
+            for shift in shifts:
+
+                pairs = (position << shift) & (position << 2 * shift)
+                cells |= pairs & (position << 3 * shift)
+                cells |= pairs & (position >> shift)
+
+                pairs = (position >> shift) & (position >> 2 * shift)
+                cells |= pairs & (position << shift)
+                cells |= pairs & (position >> 3 * shift)
+
+            return cells & (free_board ^ mask)
+
+        return winning_cells_4
+
+    def winning_cells_n(position: int, mask: int):
+
+        # vertical, only upwards
+        cells = position << 1
+        for offset in range(2, connect):
+            cells &= position << offset
+
+        for shift in shifts:
+
+            # before[k] and after[k] hold the cells having k successive tokens right before and right after them,
+            # a cell winning when the two runs add up to connect - 1 tokens
+            before = [-1]
+            after = [-1]
+            for length in range(1, connect):
+                before.append(before[-1] & (position << (length * shift)))
+                after.append(after[-1] & (position >> (length * shift)))
+
+            for length in range(connect):
+                cells |= before[length] & after[connect - 1 - length]
+
+        return cells & (free_board ^ mask)
+
+    return winning_cells_n
+
+
+_winning_cells_functions = {DEFAULT_GEOMETRY: winning_cells_function(DEFAULT_GEOMETRY)}
+
+
+def mirror_function(geometry: Geometry):
+
+    """
+    Builds the function mirroring the bitboards of a geometry, the shifts of every pair of mirrored columns being
+    computed once
+    :param geometry: geometry of the board
+    :return: function of a key or a mask returning the same bits with the columns in reverse order
+    """
+
+    height = geometry.height
+    column_bits = (1 << height) - 1
+    columns = geometry.columns
+
+    # Every column is moved by the distance to its mirror, the middle column of an odd board staying in place
+    moves = [(column * height, (columns - 1 - 2 * column) * height) for column in range(columns)]
+
+    def mirror(bits: int):
+
+        result = 0
+
+        for start, distance in moves:
+            if distance >= 0:
+                result |= (bits & (column_bits << start)) << distance
+            else:
+                result |= (bits & (column_bits << start)) >> -distance
+
+        return result
+
+    return mirror
+
+
+_mirror_functions = {}
+
+
+def mirror(bits: int, geometry: Geometry = DEFAULT_GEOMETRY):
+
+    """
+    Mirrors a key or a mask of a bitboard left to right. Every column keeps its bits, keys included, as the bottom
+    bit added by BitBoard.key never carries into the next column
+    :param bits: key of a position or mask of cells
+    :param geometry: geometry of the board
+    :return: bits of the mirrored board
+    """
+
+    function = _mirror_functions.get(geometry)
+
+    if function is None:
+        function = mirror_function(geometry)
+        _mirror_functions[geometry] = function
+
+    return function(bits)
+
+
+def winning_cells(position: int, mask: int, geometry: Geometry = DEFAULT_GEOMETRY):
+
+    """
+    Finds the empty cells that would complete a line, a column or a diagonal of connect tokens
+    :param position: mask of the tokens of a player
+    :param mask: mask of all the occupied cells
+    :param geometry: geometry of the board
+    :return: mask of the winning cells, playable or not
+    """
+
+    function = _winning_cells_functions.get(geometry)
+
+    if function is None:
+        function = winning_cells_function(geometry)
+        _winning_cells_functions[geometry] = function
+
+    return function(position, mask)
+
+
+class BitBoard:
+
+    def __init__(self, geometry: Geometry = DEFAULT_GEOMETRY):
+
+        """
+        :param geometry: geometry of the board, the standard 6 x 7 one if not given
+        """
+
+        self._geometry = geometry
+        self._rows = geometry.rows
+        self._height = geometry.height
+        self._masks = {"X": 0, "0": 0}
+        self._heights = [0] * geometry.columns
+        self._moves = []
+
+    @property
+    def geometry(self):
+        return self._geometry
+
+    @property
+    def masks(self):
+        return self._masks
+
+    @property
+    def heights(self):
+        return self._heights
+
+    @property
+    def moves(self):
+        return self._moves
+
+    @property
+    def mask(self):
+
+        """
+        Returns the mask of all the occupied cells
+        """
+
+        return self._masks["X"] | self._masks["0"]
+
+    def key(self):
+
+        """
+        Returns an integer that identifies the position: adding the bottom row to the mask of the occupied cells
+        marks the first free cell of every column, and the tokens of X below it can then be added without collisions
+        :return: key of the position
+        """
+
+        return self._masks["X"] + self.mask + self._geometry.bottom_mask
+
+    def canonical_key(self):
+
+        """
+        Returns the key shared by the position and its mirror, the smaller of their two keys, so that a table keyed
+        on it holds a single entry for both. The columns stored for the mirror have to be mirrored back with
+        Geometry.mirror_column
+        :return: tuple (canonical key, True if it is the key of the mirror)
+        """
+
+        key = self.key()
+        mirrored = mirror(key, self._geometry)
+
+        if mirrored < key:
+            return mirrored, True
+
+        return key, False
+
+    def copy(self):
+
+        """
+        Creates a copy of the bitboard
+        :return: new bitboard with the same tokens
+        """
+
+        duplicate = BitBoard(self._geometry)
+        duplicate._masks = self._masks.copy()
+        duplicate._heights = self._heights.copy()
+        duplicate._moves = self._moves.copy()
+
+        return duplicate
+
+    def get_token(self, row: int, column: int):
+
+        """
+        Returns the token sign found on a cell
+        :param row: row index corresponding to the token
+        :param column: column index corresponding to the token
+        :return: token
+        """
+
+        bit = self._geometry.cell_bit(row, column)
+
+        for token in TOKENS:
+            if self._masks[token] & bit:
+                return token
+
+        return " "
+
+    def set_token(self, row: int, column: int, token: str):
+
+        """
+        Places a token on any cell of the board, or clears it when the token is " "
+        :param row: row index of the cell
+        :param column: column index of the cell
+        :param token: token to be placed
+        :return:
+        """
+
+        bit = self._geometry.cell_bit(row, column)
+
+        for sign in TOKENS:
+            self._masks[sign] &= ~bit
+
+        if token != " ":
+            self._masks[token] |= bit
+
+        mask = self.mask
+        height = 0
+        while height < self._rows and mask & (1 << (column * self._height + height)):
+            height += 1
+
+        self._heights[column] = height
+
+    def can_play(self, column: int):
+
+        """
+        Checks if a token can still be dropped on a column
+        :param column: column index
+        :return: True/False
+        """
+
+        return self._heights[column] < self._rows
+
+    def next_row(self, column: int):
+
+        """
+        Returns the row index where a token dropped on the column would land
+        :param column: column index
+        :return: row index, None if the column is full
+        """
+
+        height = self._heights[column]
+
+        if height < self._rows:
+            return self._rows - 1 - height
+
+        return None
+
+    def playable_cells(self):
+
+        """
+        Returns the mask of the cells a token dropped on a column would land on
+        """
+
+        return (self.mask + self._geometry.bottom_mask) & self._geometry.board_mask
+
+    def valid_columns(self):
+
+        """
+        Finds all the columns that are not full
+        :return: list of column indexes
+        """
+
+        rows = self._rows
+
+        return [column for column, height in enumerate(self._heights) if height < rows]
+
+    def play(self, column: int, token: str):
+
+        """
+        Drops a token on a column, the column being pushed on the move stack so that it can be undone
+        :param column: column index
+        :param token: token to be dropped
+        :return: row index where the token landed
+        """
+
+        height = self._heights[column]
+        self._masks[token] |= 1 << (column * self._height + height)
+        self._heights[column] = height + 1
+        self._moves.append(column)
+
+        return self._rows - 1 - height
+
+    def undo(self):
+
+        """
+        Removes the token dropped by the last play
+        :return: column index of the removed token
+        """
+
+        column = self._moves.pop()
+        height = self._heights[column] - 1
+        bit = ~(1 << (column * self._height + height))
+
+        self._masks["X"] &= bit
+        self._masks["0"] &= bit
+        self._heights[column] = height
+
+        return column
+
+    def is_full(self):
+
+        """
+        Checks if there are no more free cells on the board
+        :return: True/False
+        """
+
+        rows = self._rows
+
+        return all(height == rows for height in self._heights)
+
+    def has_line(self, token: str, shift: int):
+
+        """
+        Checks if a token has connect successive cells in the direction given by a shift
+        :param token: token of the player
+        :param shift: vertical, horizontal, diagonal_left_to_right or diagonal_right_to_left shift of the geometry
+        :return: True/False
+        """
+
+        position = self._masks[token]
+        connect = self._geometry.connect
+
+        # line keeps the cells starting length successive tokens, doubling length while it fits in connect
+        line = position
+        length = 1
+
+        while 2 * length <= connect:
+            line &= line >> (length * shift)
+            length *= 2
+
+        if length < connect:
+            line &= line >> ((connect - length) * shift)
+
+        return line != 0
+
+    def is_win_through(self, row: int, column: int, token: str):
+
+        """
+        Checks if a token has connect successive cells on one of the lines passing through a cell,
+        used to check only the cell that was just played instead of the whole board
+        :param row: row index of the cell
+        :param column: column index of the cell
+        :param token: token of the player
+        :return: True/False
+        """
+
+        position = self._masks[token]
+
+        for window in self._geometry.cell_window_masks[self._geometry.cell_position(row, column)]:
+            if position & window == window:
+                return True
+
+        return False
+
+    def is_win(self, token: str):
+
+        """
+        Checks if a token has a line, column or diagonal of connect successive cells
+        :param token: token of the player
+        :return: True/False
+        """
+
+        geometry = self._geometry
+
+        return self.has_line(token, geometry.vertical) or self.has_line(token, geometry.horizontal) or \
+            self.has_line(token, geometry.diagonal_left_to_right) or \
+            self.has_line(token, geometry.diagonal_right_to_left)
@@ -1,16 +1,35 @@
 
+from Domain.BitBoard import BitBoard
+from Domain.Move import Move
+from Domain.Windows import ROWS, COLUMNS, CONNECT, get_geometry
+
+
 class Board:
 
-    def __init__(self):
+    def __init__(self, rows: int = ROWS, columns: int = COLUMNS, connect: int = CONNECT):
+
+        """
+        :param rows: number of rows
+        :param columns: number of columns
+        :param connect: number of successive tokens that win the game
+        """
+
+        self._board = [[" "] * columns for _ in range(rows)]
 
-        self._board = [[" ", " ", " ", " ", " ", " ", " "], [" ", " ", " ", " ", " ", " ", " "],
-                       [" ", " ", " ", " ", " ", " ", " "], [" ", " ", " ", " ", " ", " ", " "],
-                       [" ", " ", " ", " ", " ", " ", " "], [" ", " ", " ", " ", " ", " ", " "]]
+        self._bitboard = BitBoard(get_geometry(rows, columns, connect))
 
     @property
     def board(self):
         return self._board
 
+    @property
+    def bitboard(self):
+        return self._bitboard
+
+    @property
+    def geometry(self):
+        return self._bitboard.geometry
+
     def get_token(self, row: int, column: int):
 
         """
@@ -30,3 +49,33 @@ class Board:
         """
 
         self._board[row][column] = token
+        self._bitboard.set_token(row, column, token)
+
+    def play(self, column: int, token: str):
+
+        """
+        Drops a token on a column, the column being pushed on the move stack of the bitboard so that it can be undone
+        :param column: column index
+        :param token: token to be dropped
+        :return: row index where the token landed
+        """
+
+        row = self._bitboard.play(column, token)
+        self._board[row][column] = token
+
+        return row
+
+    def undo(self):
+
+        """
+        Removes the token dropped by the last play
+        :return: the move taken back
+        """
+
+        column = self._bitboard.undo()
+        row = self._bitboard.next_row(column)
+
+        token = self._board[row][column]
+        self._board[row][column] = " "
+
+        return Move(row, column, token)
@@ -14,9 +14,13 @@ class MoveValidator:
 
         errors = ""
 
-        if move.column > 6 or move.column < 0:
+        if move.column >= board.geometry.columns or move.column < 0:
 
             errors += "Row index out of bound!\n"
 
+        elif move.row is None:
+
+            errors += "The column is already full!\n"
+
         if errors:
             raise ValueError(errors)
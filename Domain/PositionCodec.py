@@ -0,0 +1,115 @@
+from Domain.BitBoard import BitBoard
+from Domain.Board import Board
+from Domain.Windows import Geometry, DEFAULT_GEOMETRY
+
+# Largest number of columns whose indexes fit in half a byte
+PACKED_COLUMNS = 16
+
+
+def packed_moves_size(geometry: Geometry = DEFAULT_GEOMETRY):
+
+    """
+    Returns the number of bytes needed by the columns of the longest game, two moves being packed in every byte
+    :param geometry: geometry of the board
+    :return: number of bytes
+    """
+
+    return (geometry.cells + 1) // 2
+
+
+def encode_board(board: Board):
+
+    """
+    Encodes a position reached by dropping tokens as the key of its bitboard, fitting in columns * (rows + 1) bits,
+    49 bits for the standard board
+    :param board: board of the game
+    :return: key of the position
+    """
+
+    return board.bitboard.key()
+
+
+def decode_bitboard(key: int, geometry: Geometry = DEFAULT_GEOMETRY):
+
+    """
+    Builds the bitboard of a position from its key. The highest set bit of every column marks its first free cell,
+    the set bits below it being the tokens of X and the clear ones the tokens of 0
+    :param key: key of the position, as returned by BitBoard.key
+    :param geometry: geometry of the board
+    :return: bitboard of the position
+    """
+
+    height = geometry.height
+
+    if key < 0 or key >= 1 << (geometry.columns * height):
+        raise ValueError("Invalid position key!\n")
+
+    board = BitBoard(geometry)
+
+    for column in range(geometry.columns):
+
+        bits = (key >> (column * height)) & ((1 << height) - 1)
+        tokens = bits.bit_length() - 1
+
+        if tokens < 0:
+            raise ValueError("Invalid position key!\n")
+
+        for level in range(tokens):
+            board.set_token(geometry.rows - 1 - level, column, "X" if bits >> level & 1 else "0")
+
+    return board
+
+
+def decode_board(key: int, geometry: Geometry = DEFAULT_GEOMETRY):
+
+    """
+    Builds the board of a position from its key
+    :param key: key of the position, as returned by encode_board
+    :param geometry: geometry of the board
+    :return: board of the position
+    """
+
+    bitboard = decode_bitboard(key, geometry)
+    board = Board(geometry.rows, geometry.columns, geometry.connect)
+
+    for row in range(geometry.rows):
+        for column in range(geometry.columns):
+
+            token = bitboard.get_token(row, column)
+            if token != " ":
+                board.update_board(row, column, token)
+
+    return board
+
+
+def pack_moves(columns: list, geometry: Geometry = DEFAULT_GEOMETRY):
+
+    """
+    Packs the columns of a game in half a byte each, the rows following from the order of the moves
+    :param columns: columns played, in order
+    :param geometry: geometry of the board, of at most PACKED_COLUMNS columns
+    :return: bytes with the first move of every pair in the low half
+    """
+
+    packed = bytearray((len(columns) + 1) // 2)
+
+    for index, column in enumerate(columns):
+
+        if not 0 <= column < min(geometry.columns, PACKED_COLUMNS):
+            raise ValueError("Column index out of bound!\n")
+
+        packed[index // 2] |= column << (4 * (index % 2))
+
+    return bytes(packed)
+
+
+def unpack_moves(packed: bytes, count: int):
+
+    """
+    Unpacks the columns of a game packed by pack_moves
+    :param packed: packed columns
+    :param count: number of moves
+    :return: list of columns
+    """
+
+    return [(packed[index // 2] >> (4 * (index % 2))) & 15 for index in range(count)]
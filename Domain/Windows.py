@@ -0,0 +1,328 @@
+ROWS = 6
+COLUMNS = 7
+CONNECT = 4
+
+TOKEN_CODES = {" ": 0, "X": 1, "0": 2}
+
+
+def window_score(own_count: int, opp_count: int, connect: int = CONNECT):
+
+    """
+    Returns the score of a window from the number of tokens of each player in it
+    :param own_count: number of tokens of the player the score is computed for
+    :param opp_count: number of tokens of the opponent
+    :param connect: number of cells of the window
+    :return: score of the window
+    """
+
+    if own_count == connect:
+        return 10000
+    if opp_count == connect:
+        return -10000
+    if own_count == connect - 1 and opp_count == 0:
+        return 5
+    if own_count == connect - 2 and opp_count == 0:
+        return 2
+    if opp_count == connect - 1 and own_count == 0:
+        return -4
+
+    return 0
+
+
+class Geometry:
+
+    def __init__(self, rows: int = ROWS, columns: int = COLUMNS, connect: int = CONNECT):
+
+        """
+        Dimensions of a board together with all the tables generated from them: the windows, the bitboard masks and
+        the scores of the windows. Geometries are built once by get_geometry and shared by all the boards of the
+        same size
+        :param rows: number of rows
+        :param columns: number of columns
+        :param connect: number of successive tokens that win the game
+        """
+
+        if rows < 1 or columns < 1:
+            raise ValueError("The board must have at least one row and one column!\n")
+
+        # The evaluators start from a score of 0, which only matches the empty board if its windows score nothing
+        if connect < 3:
+            raise ValueError("At least three tokens must be connected to win!\n")
+
+        if connect > max(rows, columns):
+            raise ValueError("The connect length does not fit on the board!\n")
+
+        self._rows = rows
+        self._columns = columns
+        self._connect = connect
+
+        # Every column takes rows + 1 bits on a bitboard, the extra bit on top of each column is always empty so
+        # that the shifts used by the win detection never carry a line over from one column into the next one
+        self._height = rows + 1
+
+        self._window_cells = self._build_window_cells()
+        self._window_masks = [sum(self.cell_bit(row, column) for row, column in window)
+                              for window in self._window_cells]
+
+        # Cells of every window together with the weight of their code in the pattern of the window
+        self._window_weights = [tuple((row, column, 3 ** index) for index, (row, column) in enumerate(window))
+                                for window in self._window_cells]
+
+        # Indexes of the windows passing through every bit position of a bitboard
+        self._cell_windows = [[] for _ in range(columns * self._height)]
+        for index, window in enumerate(self._window_cells):
+            for row, column in window:
+                self._cell_windows[self.cell_position(row, column)].append(index)
+
+        self._cell_window_masks = [[self._window_masks[index] for index in windows] for windows in self._cell_windows]
+
+        # Both middle columns get the center bonus on boards with an even number of columns, so that a position
+        # and its mirror score alike
+        self._center_columns = tuple(sorted({(columns - 1) // 2, columns // 2}))
+        self._center_mask = sum(self.cell_bit(row, column) for row in range(rows) for column in self._center_columns)
+        self._bottom_mask = sum(1 << (column * self._height) for column in range(columns))
+        self._board_mask = self._bottom_mask * ((1 << rows) - 1)
+        self._column_masks = [((1 << rows) - 1) << (column * self._height) for column in range(columns)]
+
+        # Columns sorted from the center to the edges, the center ones taking part in the most windows
+        self._center_order = sorted(range(columns), key=lambda column: abs(2 * column - (columns - 1)))
+        self._center_rank = [self._center_order.index(column) for column in range(columns)]
+
+        self._count_scores = [[window_score(own, opp, connect) for opp in range(connect + 1)]
+                              for own in range(connect + 1)]
+        self._pattern_scores = {"X": self._build_pattern_scores("X"), "0": self._build_pattern_scores("0")}
+
+    def __reduce__(self):
+
+        # Only the dimensions are pickled, the tables being built again or taken from the cache of get_geometry
+        return get_geometry, (self._rows, self._columns, self._connect)
+
+    @property
+    def rows(self):
+        return self._rows
+
+    @property
+    def columns(self):
+        return self._columns
+
+    @property
+    def connect(self):
+        return self._connect
+
+    @property
+    def height(self):
+        return self._height
+
+    @property
+    def cells(self):
+        return self._rows * self._columns
+
+    @property
+    def vertical(self):
+
+        """
+        Returns the shift that moves a bit to its neighbour on the same column
+        """
+
+        return 1
+
+    @property
+    def horizontal(self):
+        return self._height
+
+    @property
+    def diagonal_left_to_right(self):
+        return self._height + 1
+
+    @property
+    def diagonal_right_to_left(self):
+        return self._height - 1
+
+    @property
+    def window_cells(self):
+        return self._window_cells
+
+    @property
+    def window_masks(self):
+        return self._window_masks
+
+    @property
+    def window_weights(self):
+        return self._window_weights
+
+    @property
+    def cell_windows(self):
+        return self._cell_windows
+
+    @property
+    def cell_window_masks(self):
+        return self._cell_window_masks
+
+    @property
+    def center_columns(self):
+        return self._center_columns
+
+    @property
+    def center_mask(self):
+        return self._center_mask
+
+    @property
+    def bottom_mask(self):
+        return self._bottom_mask
+
+    @property
+    def board_mask(self):
+        return self._board_mask
+
+    @property
+    def column_masks(self):
+        return self._column_masks
+
+    @property
+    def center_order(self):
+        return self._center_order
+
+    @property
+    def center_rank(self):
+        return self._center_rank
+
+    @property
+    def count_scores(self):
+        return self._count_scores
+
+    @property
+    def pattern_scores(self):
+        return self._pattern_scores
+
+    def cell_position(self, row: int, column: int):
+
+        """
+        Returns the bit position of a cell on a bitboard
+        :param row: row index of the cell, 0 being the top row as in Board
+        :param column: column index of the cell
+        :return: bit position
+        """
+
+        return column * self._height + self._rows - 1 - row
+
+    def cell_bit(self, row: int, column: int):
+
+        """
+        Returns the bit corresponding to a cell of the board
+        :param row: row index of the cell, 0 being the top row as in Board
+        :param column: column index of the cell
+        :return: integer with a single bit set
+        """
+
+        return 1 << self.cell_position(row, column)
+
+    def mirror_column(self, column: int):
+
+        """
+        Returns the column a column is mapped to by the left-right mirror of the board
+        :param column: column index
+        :return: column index
+        """
+
+        return self._columns - 1 - column
+
+    def _build_window_cells(self):
+
+        """
+        Builds all the groups of connect successive cells from a line, column or diagonal
+        :return: list of tuples of (row, column) cells
+        """
+
+        rows, columns, connect = self._rows, self._columns, self._connect
+        windows = []
+
+        for row in range(rows - 1, -1, -1):
+            for column in range(columns - connect + 1):
+                windows.append(tuple((row, column + i) for i in range(connect)))
+
+        for column in range(columns):
+            for row in range(rows - connect + 1):
+                windows.append(tuple((row + i, column) for i in range(connect)))
+
+        for row in range(rows - 1, connect - 2, -1):
+            for column in range(columns - connect + 1):
+                windows.append(tuple((row - i, column + i) for i in range(connect)))
+
+        for row in range(rows - 1, connect - 2, -1):
+            for column in range(connect - 1, columns):
+                windows.append(tuple((row - i, column - i) for i in range(connect)))
+
+        return windows
+
+    def _build_pattern_scores(self, token: str):
+
+        """
+        Scores every possible content of a window, the pattern of a window being the sum of
+        TOKEN_CODES[token] * 3 ** index over its cells
+        :param token: token of the player the scores are computed for
+        :return: list with the score of every pattern
+        """
+
+        own_code = TOKEN_CODES[token]
+        connect = self._connect
+        scores = []
+
+        for pattern in range(3 ** connect):
+
+            codes = [pattern // 3 ** index % 3 for index in range(connect)]
+            own_count = codes.count(own_code)
+            opp_count = connect - own_count - codes.count(0)
+
+            scores.append(window_score(own_count, opp_count, connect))
+
+        return scores
+
+
+_geometries = {}
+
+
+def get_geometry(rows: int = ROWS, columns: int = COLUMNS, connect: int = CONNECT):
+
+    """
+    Returns the geometry of a board size, building its tables only the first time the size is used
+    :param rows: number of rows
+    :param columns: number of columns
+    :param connect: number of successive tokens that win the game
+    :return: Geometry
+    """
+
+    geometry = _geometries.get((rows, columns, connect))
+
+    if geometry is None:
+        geometry = Geometry(rows, columns, connect)
+        _geometries[(rows, columns, connect)] = geometry
+
+    return geometry
+
+
+def add_geometry_arguments(parser):
+
+    """
+    Adds the --rows, --columns and --connect options of the board size to the parser of a command line entry point
+    :param parser: argparse.ArgumentParser
+    :return:
+    """
+
+    parser.add_argument("--rows", type=int, default=ROWS, help="number of rows of the board")
+    parser.add_argument("--columns", type=int, default=COLUMNS, help="number of columns of the board")
+    parser.add_argument("--connect", type=int, default=CONNECT, help="number of successive tokens that win the game")
+
+
+def geometry_from_arguments(arguments):
+
+    """
+    Returns the geometry of the board size parsed from the options added by add_geometry_arguments
+    :param arguments: parsed arguments
+    :return: Geometry
+    """
+
+    return get_geometry(arguments.rows, arguments.columns, arguments.connect)
+
+
+# Geometry of the standard 6 x 7 board
+DEFAULT_GEOMETRY = get_geometry()
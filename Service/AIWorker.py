@@ -0,0 +1,142 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from Service.BoardService import BoardService
+
+
+class AIWorker:
+
+    def __init__(self, board_service: BoardService):
+
+        """
+        Runs the search of the AI on a background thread, so that the user interface keeps handling its events.
+        The board must not be changed while the AI is thinking, but it can while the AI is pondering
+        :param board_service: service of the game
+        """
+
+        self._board_service = board_service
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-worker")
+        self._future = None
+        self._stop_event = None
+        self._ponder_future = None
+        self._ponder_event = None
+
+    @property
+    def pondering(self):
+
+        """
+        Checks if the AI is searching on the time of the player
+        """
+
+        return self._ponder_future is not None and not self._ponder_future.done()
+
+    @property
+    def thinking(self):
+
+        """
+        Checks if a search was started and its move was not taken yet
+        """
+
+        return self._future is not None
+
+    def start(self):
+
+        """
+        Starts the search of the move of the AI
+        :return: future of the move
+        """
+
+        if self._future is not None:
+            raise ValueError("The AI is already thinking!\n")
+
+        self.stop_pondering()
+
+        self._stop_event = threading.Event()
+        self._future = self._executor.submit(self._board_service.generate_ai_move, self._stop_event)
+
+        return self._future
+
+    def ponder(self):
+
+        """
+        Starts searching the answers to the replies of the player, to be called after the move of the AI was made
+        :return: future of the pondering
+        """
+
+        if self._future is not None:
+            raise ValueError("The AI is already thinking!\n")
+
+        self.stop_pondering()
+
+        self._ponder_event = threading.Event()
+        self._ponder_future = self._executor.submit(self._board_service.ponder,
+                                                    self._board_service.game_board.bitboard.copy(),
+                                                    self._ponder_event)
+
+        return self._ponder_future
+
+    def stop_pondering(self):
+
+        """
+        Stops the pondering, keeping the answers already found
+        :return:
+        """
+
+        if self._ponder_future is None:
+            return
+
+        self._ponder_event.set()
+        self._ponder_future.exception()
+
+        self._ponder_future = None
+        self._ponder_event = None
+
+    def done(self):
+
+        """
+        Checks if the move of the AI is ready
+        :return: True/False
+        """
+
+        return self._future is not None and self._future.done()
+
+    def result(self):
+
+        """
+        Takes the move found by the AI, to be called once done returns True
+        :return: move of the AI
+        """
+
+        future = self._future
+        self._future = None
+        self._stop_event = None
+
+        return future.result()
+
+    def cancel(self):
+
+        """
+        Stops the running search and drops its result
+        :return:
+        """
+
+        self.stop_pondering()
+
+        if self._future is None:
+            return
+
+        self._stop_event.set()
+        self._future.exception()
+
+        self._future = None
+        self._stop_event = None
+
+    def shutdown(self):
+
+        """
+        Cancels the running search and stops the thread
+        :return:
+        """
+
+        self.cancel()
+        self._executor.shutdown()
@@ -0,0 +1,516 @@
+import argparse
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from Domain.BitBoard import BitBoard, OPPONENT, popcount
+from Domain.Windows import Geometry, DEFAULT_GEOMETRY, add_geometry_arguments, geometry_from_arguments
+from Service.EndgameSolver import EndgameSolver
+from Service.SearchEngine import SearchEngine
+
+RANDOM = "random"
+SEARCH = "search"
+
+FIRST_TOKEN = "0"
+
+# Random moves played before the players take over, so that deterministic players do not repeat a single game
+OPENING_PLIES = 4
+
+
+class PlayerConfig:
+
+    def __init__(self, name: str, kind: str = SEARCH, max_depth: int = 7, time_budget: float = None,
+                 node_budget: int = None, endgame_threshold: int = None):
+
+        """
+        Settings of a player of the arena, sent to the worker processes that build the player for every game
+        :param name: name of the player in the results
+        :param kind: RANDOM for a player choosing a random valid column, SEARCH for the minimax engine
+        :param max_depth: deepest iteration searched, None to search until the board is full
+        :param time_budget: seconds a move may take, None for no limit
+        :param node_budget: nodes a move may search, None for no limit
+        :param endgame_threshold: number of empty cells from which the game is solved exactly instead of searched,
+                                  None to always search
+        """
+
+        if kind not in (RANDOM, SEARCH):
+            raise ValueError("Unknown kind of player!\n")
+
+        self._name = name
+        self._kind = kind
+        self._max_depth = max_depth
+        self._time_budget = time_budget
+        self._node_budget = node_budget
+        self._endgame_threshold = endgame_threshold
+
+    @property
+    def name(self):
+        return self._name
+
+    @property
+    def kind(self):
+        return self._kind
+
+    @property
+    def max_depth(self):
+        return self._max_depth
+
+    @property
+    def time_budget(self):
+        return self._time_budget
+
+    @property
+    def node_budget(self):
+        return self._node_budget
+
+    @property
+    def endgame_threshold(self):
+        return self._endgame_threshold
+
+    @staticmethod
+    def parse(name: str, specification: str):
+
+        """
+        Builds a player from the command line, "random" or "search:DEPTH[:SECONDS]"
+        :param name: name of the player
+        :param specification: description of the player
+        :return: PlayerConfig
+        """
+
+        parts = specification.split(":")
+
+        if parts == [RANDOM]:
+            return PlayerConfig(name, RANDOM)
+
+        if parts[0] != SEARCH or len(parts) > 3:
+            raise ValueError("Invalid player " + specification + "!\n")
+
+        max_depth = int(parts[1]) if len(parts) > 1 else 7
+        time_budget = float(parts[2]) if len(parts) > 2 else None
+
+        return PlayerConfig(name, SEARCH, max_depth, time_budget)
+
+
+class ArenaPlayer:
+
+    def __init__(self, config: PlayerConfig, token: str, seed: int = None):
+
+        """
+        Player built from its settings for a single game
+        :param config: settings of the player
+        :param token: token the player moves with
+        :param seed: seed of the random player, None for a random one
+        """
+
+        self._config = config
+        self._token = token
+        self._random = random.Random(seed)
+        self._engine = None
+        self._solver = None
+
+        if config.kind == SEARCH:
+            self._engine = SearchEngine(token, max_depth=config.max_depth, time_budget=config.time_budget,
+                                        node_budget=config.node_budget)
+
+    def choose(self, board: BitBoard):
+
+        """
+        Chooses the column of the player on a position
+        :param board: position on which the player has to move, left unchanged
+        :return: tuple (column, nodes searched)
+        """
+
+        if self._engine is None:
+            return self._random.choice(board.valid_columns()), 0
+
+        threshold = self._config.endgame_threshold
+
+        if threshold is not None and board.geometry.cells - popcount(board.mask) <= threshold:
+
+            if self._solver is None:
+                self._solver = EndgameSolver()
+
+            column = self._solver.solve(board, self._token).column
+
+            return column, self._solver.nodes
+
+        column = self._engine.search(board)[0]
+
+        return column, self._engine.nodes
+
+
+class GameResult:
+
+    def __init__(self, index: int, first: str, second: str, winner: str, columns: list, times: dict, nodes: dict,
+                 opening_plies: int = 0):
+
+        """
+        Outcome of a game of the arena
+        :param index: index of the game in the match
+        :param first: name of the player that moved first
+        :param second: name of the player that moved second
+        :param winner: name of the winner, None for a draw
+        :param columns: columns played, in order, the random opening included
+        :param times: seconds spent choosing moves by every player
+        :param nodes: nodes searched by every player
+        :param opening_plies: number of random moves the game started with
+        """
+
+        self._index = index
+        self._first = first
+        self._second = second
+        self._winner = winner
+        self._columns = columns
+        self._times = times
+        self._nodes = nodes
+        self._opening_plies = opening_plies
+
+    @property
+    def index(self):
+        return self._index
+
+    @property
+    def first(self):
+        return self._first
+
+    @property
+    def second(self):
+        return self._second
+
+    @property
+    def winner(self):
+        return self._winner
+
+    @property
+    def columns(self):
+        return self._columns
+
+    @property
+    def times(self):
+        return self._times
+
+    @property
+    def nodes(self):
+        return self._nodes
+
+    @property
+    def opening_plies(self):
+        return self._opening_plies
+
+    def move_count(self, name: str):
+
+        """
+        Returns the number of moves a player chose in the game, the moves of the random opening not counting
+        :param name: name of the player
+        :return: number of moves
+        """
+
+        parity = 0 if name == self._first else 1
+
+        return sum(1 for index in range(self._opening_plies, len(self._columns)) if index % 2 == parity)
+
+
+def random_opening(board: BitBoard, plies: int, seed: int = None):
+
+    """
+    Plays random moves from the empty board, none of them winning the game
+    :param board: empty board, the moves being played on it
+    :param plies: number of moves
+    :param seed: seed of the moves, None for random ones
+    :return: list of the columns played
+    """
+
+    generator = random.Random(seed)
+    token = FIRST_TOKEN
+    columns = []
+
+    for ply in range(plies):
+
+        candidates = []
+
+        for column in board.valid_columns():
+
+            row = board.play(column, token)
+            if not board.is_win_through(row, column, token):
+                candidates.append(column)
+            board.undo()
+
+        if not candidates:
+            break
+
+        column = generator.choice(candidates)
+        board.play(column, token)
+        columns.append(column)
+        token = OPPONENT[token]
+
+    return columns
+
+
+def play_game(index: int, first: PlayerConfig, second: PlayerConfig, seed: int = None,
+              geometry: Geometry = DEFAULT_GEOMETRY, opening_plies: int = 0, opening_seed: int = None):
+
+    """
+    Plays a game between two players, run by the worker processes
+    :param index: index of the game in the match
+    :param first: settings of the player moving first
+    :param second: settings of the player moving second
+    :param seed: seed of the random players, None for random ones
+    :param geometry: geometry of the board
+    :param opening_plies: number of random moves played before the players take over
+    :param opening_seed: seed of the random opening, None for a random one
+    :return: GameResult
+    """
+
+    tokens = {first.name: FIRST_TOKEN, second.name: OPPONENT[FIRST_TOKEN]}
+    second_seed = None if seed is None else seed + 1
+    players = [ArenaPlayer(first, tokens[first.name], seed), ArenaPlayer(second, tokens[second.name], second_seed)]
+    names = [first.name, second.name]
+
+    board = BitBoard(geometry)
+    opening = random_opening(board, opening_plies, opening_seed)
+    columns = list(opening)
+    times = {first.name: 0.0, second.name: 0.0}
+    nodes = {first.name: 0, second.name: 0}
+    winner = None
+
+    while not board.is_full():
+
+        turn = len(columns) % 2
+        name = names[turn]
+
+        start = time.perf_counter()
+        column, searched = players[turn].choose(board)
+        times[name] += time.perf_counter() - start
+        nodes[name] += searched
+
+        row = board.play(column, tokens[name])
+        columns.append(column)
+
+        if board.is_win_through(row, column, tokens[name]):
+            winner = name
+            break
+
+    return GameResult(index, first.name, second.name, winner, columns, times, nodes, len(opening))
+
+
+class ArenaStatistics:
+
+    def __init__(self, names: list):
+
+        """
+        Totals of the games of a match, updated as the results come in
+        :param names: names of the two players
+        """
+
+        self._games = 0
+        self._draws = 0
+        self._wins = {name: 0 for name in names}
+        self._moves = {name: 0 for name in names}
+        self._times = {name: 0.0 for name in names}
+        self._nodes = {name: 0 for name in names}
+
+    @property
+    def games(self):
+        return self._games
+
+    @property
+    def draws(self):
+        return self._draws
+
+    def add(self, result: GameResult):
+
+        """
+        Adds the result of a game to the totals
+        :param result: result of the game
+        :return:
+        """
+
+        self._games += 1
+
+        if result.winner is None:
+            self._draws += 1
+        else:
+            self._wins[result.winner] += 1
+
+        for name in self._wins:
+            self._moves[name] += result.move_count(name)
+            self._times[name] += result.times[name]
+            self._nodes[name] += result.nodes[name]
+
+    def wins(self, name: str):
+
+        return self._wins[name]
+
+    def win_rate(self, name: str):
+
+        """
+        Returns the share of the games won by a player
+        :param name: name of the player
+        :return: win rate between 0 and 1
+        """
+
+        if self._games == 0:
+            return 0.0
+
+        return self._wins[name] / self._games
+
+    def mean_latency(self, name: str):
+
+        """
+        Returns the average number of seconds a player took for a move
+        :param name: name of the player
+        :return: seconds
+        """
+
+        if self._moves[name] == 0:
+            return 0.0
+
+        return self._times[name] / self._moves[name]
+
+    def nodes_per_second(self, name: str):
+
+        """
+        Returns the search speed of a player over all its moves
+        :param name: name of the player
+        :return: nodes per second
+        """
+
+        if self._times[name] == 0:
+            return 0.0
+
+        return self._nodes[name] / self._times[name]
+
+    def summary(self):
+
+        """
+        Returns a line of text with the totals of every player
+        :return: string
+        """
+
+        parts = []
+
+        for name in self._wins:
+            parts.append("{}: {} wins ({:.1%}), {:.4f} s/move, {:.0f} nodes/s".format(
+                name, self._wins[name], self.win_rate(name), self.mean_latency(name), self.nodes_per_second(name)))
+
+        parts.append("{} draws of {} games".format(self._draws, self._games))
+
+        return "; ".join(parts)
+
+
+class Arena:
+
+    def __init__(self, first: PlayerConfig, second: PlayerConfig, workers: int = None, seed: int = 0,
+                 geometry: Geometry = DEFAULT_GEOMETRY, opening_plies: int = OPENING_PLIES):
+
+        """
+        Plays matches between two players across a pool of processes, the players switching sides after every game.
+        Every game starts with random moves, the two games of a pair playing the same opening with the players on
+        both sides of it
+        :param first: settings of the player moving first in the even games
+        :param second: settings of the player moving first in the odd games
+        :param workers: number of worker processes, the number of processors if not given
+        :param seed: seed of the random players and of the openings, every game using the seed plus its index
+        :param geometry: geometry of the board of the games
+        :param opening_plies: number of random moves every game starts with
+        """
+
+        if first.name == second.name:
+            raise ValueError("The players must have different names!\n")
+
+        self._first = first
+        self._second = second
+        self._workers = workers
+        self._seed = seed
+        self._geometry = geometry
+        self._opening_plies = opening_plies
+
+        self._executor = None
+        self._statistics = ArenaStatistics([first.name, second.name])
+
+    @property
+    def statistics(self):
+        return self._statistics
+
+    def play(self, games: int):
+
+        """
+        Plays a match, yielding the result of every game as soon as it ends, so results are not in the order of the
+        games. The statistics of the arena are updated before every result is yielded
+        :param games: number of games
+        :return: generator of GameResult
+        """
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self._workers)
+
+        futures = []
+
+        for index in range(games):
+
+            if index % 2 == 0:
+                players = (self._first, self._second)
+            else:
+                players = (self._second, self._first)
+
+            futures.append(self._executor.submit(play_game, index, players[0], players[1], self._seed + index,
+                                                 self._geometry, self._opening_plies, self._seed + index // 2))
+
+        try:
+            for future in as_completed(futures):
+
+                result = future.result()
+                self._statistics.add(result)
+
+                yield result
+        finally:
+            for future in futures:
+                future.cancel()
+
+    def shutdown(self):
+
+        """
+        Stops the worker processes
+        :return:
+        """
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.shutdown()
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Plays games between two players of the AI")
+    parser.add_argument("first", help='first player, "random" or "search:DEPTH[:SECONDS]"')
+    parser.add_argument("second", help='second player, "random" or "search:DEPTH[:SECONDS]"')
+    parser.add_argument("--games", type=int, default=100, help="number of games")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the random players and of the openings")
+    parser.add_argument("--opening-plies", type=int, default=OPENING_PLIES,
+                        help="random moves every game starts with")
+    add_geometry_arguments(parser)
+
+    arguments = parser.parse_args()
+
+    first = PlayerConfig.parse("first", arguments.first)
+    second = PlayerConfig.parse("second", arguments.second)
+    geometry = geometry_from_arguments(arguments)
+
+    with Arena(first, second, arguments.workers, arguments.seed, geometry, arguments.opening_plies) as arena:
+        for result in arena.play(arguments.games):
+            print("Game", result.index, "won by", result.winner or "nobody", "in", len(result.columns), "moves")
+
+        print(arena.statistics.summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,348 @@
+import argparse
+import collections
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+from Domain.BitBoard import BitBoard, OPPONENT, popcount
+from Domain.Windows import Geometry, DEFAULT_GEOMETRY, add_geometry_arguments, geometry_from_arguments
+from Service.BatchEvaluator import BatchEvaluator
+from Service.EndgameSolver import EndgameSolver, EndgameResult, WIN, LOSS
+from Service.SearchEngine import SearchEngine, win_score, loss_score
+from Service.SearchStatistics import SearchStatistics, ENDGAME, SEARCH
+from Service.TranspositionTable import TranspositionTable
+
+FIRST_TOKEN = "0"
+
+# Source of the results scored without searching
+STATIC = "static"
+
+# Number of positions scored together by a static analysis
+STATIC_CHUNK = 4096
+
+
+def parse_position(line: str):
+
+    """
+    Reads the moves of a position from a line of JSONL input, either a string or an object with a "moves" key,
+    the moves being the columns played from the empty board
+    :param line: line of input
+    :return: string with the column of every move
+    """
+
+    position = json.loads(line)
+
+    if isinstance(position, dict):
+        position = position.get("moves")
+
+    if not isinstance(position, str):
+        raise ValueError("The line holds no moves!\n")
+
+    return position
+
+
+def endgame_score(result: EndgameResult, moves: int):
+
+    """
+    Maps the exact result of the endgame solver onto the scale of the scores of the search
+    :param result: result of the solved position
+    :param moves: number of tokens on the solved position
+    :return: score, as win_score or loss_score of the ply of the winning move, 0 for a draw
+    """
+
+    if result.outcome == WIN:
+        return win_score(moves + result.distance, result.cells)
+
+    if result.outcome == LOSS:
+        return loss_score(moves + result.distance, result.cells)
+
+    return 0
+
+
+def board_from_moves(moves: str, geometry: Geometry = DEFAULT_GEOMETRY):
+
+    """
+    Plays the moves of a position from the empty board, the player FIRST_TOKEN moving first
+    :param moves: string with the column of every move
+    :param geometry: geometry of the board
+    :return: tuple (bitboard, token of the player to move)
+    """
+
+    board = BitBoard(geometry)
+    token = FIRST_TOKEN
+
+    for character in moves:
+
+        if not character.isdigit() or int(character) >= geometry.columns or not board.can_play(int(character)):
+            raise ValueError("Invalid move " + character + "!\n")
+
+        column = int(character)
+        row = board.play(column, token)
+
+        if board.is_win_through(row, column, token):
+            raise ValueError("The game is already won!\n")
+
+        token = OPPONENT[token]
+
+    if board.is_full():
+        raise ValueError("The board is full!\n")
+
+    return board, token
+
+
+def analyse_position(moves: str, max_depth: int = 7, time_budget: float = None, endgame_threshold: int = 16,
+                     table_size: int = 1 << 18, geometry: Geometry = DEFAULT_GEOMETRY):
+
+    """
+    Finds the best move of the player to move on a position, run by the worker processes. Every position is
+    searched with empty tables, so the result does not depend on the positions analysed before it
+    :param moves: string with the column of every move
+    :param max_depth: deepest iteration searched, None to search until the board is full
+    :param time_budget: seconds the search may take, None for no limit
+    :param endgame_threshold: number of empty cells from which the position is solved exactly, None to always search
+    :param table_size: number of slots of the transposition table
+    :param geometry: geometry of the board
+    :return: dictionary with the moves, the token to move, the column, the score and the statistics of the search,
+             or with an error. The score of a solved position is given on the scale of the search, its exact outcome
+             and the number of moves until the win being in the "outcome" and "distance" keys, None when searched
+    """
+
+    try:
+        board, token = board_from_moves(moves, geometry)
+    except ValueError as error:
+        return {"moves": moves, "error": str(error).strip()}
+
+    statistics = SearchStatistics()
+
+    if endgame_threshold is not None and board.geometry.cells - popcount(board.mask) <= endgame_threshold:
+
+        solver = EndgameSolver(TranspositionTable(table_size))
+        result = solver.solve(board, token)
+        column, score = result.column, endgame_score(result, popcount(board.mask))
+        outcome, distance = result.outcome, result.distance
+
+        statistics.source = ENDGAME
+        statistics.add_nodes(solver.nodes)
+    else:
+
+        engine = SearchEngine(token, TranspositionTable(table_size), max_depth=max_depth, time_budget=time_budget)
+        column, score = engine.search(board, statistics=statistics)
+        outcome, distance = None, None
+
+        statistics.source = SEARCH
+
+    return {"moves": moves, "token": token, "column": column, "score": score, "outcome": outcome,
+            "distance": distance, "source": statistics.source, "nodes": statistics.nodes,
+            "depth": len(statistics.depths), "seconds": statistics.seconds}
+
+
+class BatchAnalysis:
+
+    def __init__(self, workers: int = None, max_in_flight: int = None, max_depth: int = 7, time_budget: float = None,
+                 endgame_threshold: int = 16, static: bool = False, geometry: Geometry = DEFAULT_GEOMETRY):
+
+        """
+        Analyses a stream of positions across a pool of processes. At most max_in_flight positions are read ahead of
+        the first result not yet yielded, so the memory used does not grow with the size of the input
+        :param workers: number of worker processes, the number of processors if not given
+        :param max_in_flight: number of positions submitted and not yet yielded, four per worker if not given
+        :param max_depth: deepest iteration searched, None to search until the board is full
+        :param time_budget: seconds the search of a position may take, None for no limit
+        :param endgame_threshold: number of empty cells from which a position is solved exactly, None to always search
+        :param static: True to score the moves of the positions with the batch evaluator instead of searching them,
+                       max_in_flight positions, STATIC_CHUNK if not given, being scored together
+        :param geometry: geometry of the board of the positions
+        """
+
+        if max_in_flight is not None and max_in_flight < 1:
+            raise ValueError("At least one position must be in flight!\n")
+
+        self._workers = workers
+        self._max_in_flight = max_in_flight
+        self._max_depth = max_depth
+        self._time_budget = time_budget
+        self._endgame_threshold = endgame_threshold
+        self._static = static
+        self._geometry = geometry
+
+        self._executor = None
+        self._evaluator = None
+
+    def analyse(self, lines):
+
+        """
+        Analyses positions as they are read, yielding their results in the order of the input
+        :param lines: iterable of JSONL lines, blank lines being skipped
+        :return: generator of the dictionaries returned by analyse_position
+        """
+
+        if self._static:
+            yield from self.analyse_static(lines)
+            return
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self._workers)
+
+        max_in_flight = self._max_in_flight
+        if max_in_flight is None:
+            max_in_flight = 4 * (self._workers or os.cpu_count() or 1)
+
+        pending = collections.deque()
+
+        try:
+            for line in lines:
+
+                if not line.strip():
+                    continue
+
+                try:
+                    moves = parse_position(line)
+                except ValueError as error:
+                    pending.append({"line": line.strip(), "error": str(error).strip()})
+                else:
+                    pending.append(self._executor.submit(analyse_position, moves, self._max_depth, self._time_budget,
+                                                         self._endgame_threshold, geometry=self._geometry))
+
+                while len(pending) >= max_in_flight:
+                    yield self.take(pending.popleft())
+
+            while pending:
+                yield self.take(pending.popleft())
+        finally:
+            for future in pending:
+                if not isinstance(future, dict):
+                    future.cancel()
+
+    def analyse_static(self, lines):
+
+        """
+        Scores every move of the positions as they are read, a whole chunk of positions being evaluated by a single
+        numpy call in this process
+        :param lines: iterable of JSONL lines, blank lines being skipped
+        :return: generator of dictionaries with the moves, the token to move, the best column, its score and the
+                 score of every move, or with an error, in the order of the input
+        """
+
+        if self._evaluator is None:
+            self._evaluator = BatchEvaluator(self._geometry)
+
+        chunk_size = self._max_in_flight or STATIC_CHUNK
+        chunk = []
+
+        for line in lines:
+
+            if not line.strip():
+                continue
+
+            try:
+                moves = parse_position(line)
+                board, token = board_from_moves(moves, self._geometry)
+            except ValueError as error:
+                chunk.append({"line": line.strip(), "error": str(error).strip()})
+            else:
+                chunk.append((moves, board, token))
+
+            if len(chunk) >= chunk_size:
+                yield from self.score_chunk(chunk)
+                chunk = []
+
+        if chunk:
+            yield from self.score_chunk(chunk)
+
+    def score_chunk(self, chunk: list):
+
+        """
+        Scores the moves of a chunk of positions together
+        :param chunk: list of tuples (moves, bitboard, token to move), or of the results of the lines that could
+                      not be read
+        :return: list of result dictionaries
+        """
+
+        positions = [item for item in chunk if not isinstance(item, dict)]
+        scores = iter(self._evaluator.score_children([board for moves, board, token in positions],
+                                                     [token for moves, board, token in positions]))
+        results = []
+
+        for item in chunk:
+
+            if isinstance(item, dict):
+                results.append(item)
+                continue
+
+            moves, board, token = item
+            move_scores = next(scores)
+
+            # Ties go to the column nearest to the center
+            column = max((column for column in board.geometry.center_order if column in move_scores),
+                         key=move_scores.get)
+
+            results.append({"moves": moves, "token": token, "column": column, "score": move_scores[column],
+                            "source": STATIC, "scores": {str(column): move_scores[column] for column in move_scores}})
+
+        return results
+
+    @staticmethod
+    def take(pending):
+
+        """
+        Returns the result of a position, waiting for it if it is still analysed
+        :param pending: future of the position, or its result if it could not be read
+        :return: dictionary
+        """
+
+        if isinstance(pending, dict):
+            return pending
+
+        return pending.result()
+
+    def shutdown(self):
+
+        """
+        Stops the worker processes
+        :return:
+        """
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.shutdown()
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Finds the best move of every position of a JSONL file")
+    parser.add_argument("input", nargs="?", default="-", help="JSONL file of positions, - for the standard input")
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes")
+    parser.add_argument("--in-flight", type=int, default=None, help="number of positions read ahead")
+    parser.add_argument("--depth", type=int, default=7, help="deepest iteration searched")
+    parser.add_argument("--time", type=float, default=None, help="seconds the search of a position may take")
+    parser.add_argument("--static", action="store_true",
+                        help="scores the moves with the numpy batch evaluator instead of searching")
+    add_geometry_arguments(parser)
+
+    arguments = parser.parse_args()
+
+    geometry = geometry_from_arguments(arguments)
+
+    input_file = sys.stdin if arguments.input == "-" else open(arguments.input)
+
+    try:
+        with BatchAnalysis(arguments.workers, arguments.in_flight, arguments.depth, arguments.time,
+                           static=arguments.static, geometry=geometry) as analysis:
+            for result in analysis.analyse(input_file):
+                print(json.dumps(result), flush=True)
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+
+
+if __name__ == "__main__":
+    main()
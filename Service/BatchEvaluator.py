@@ -0,0 +1,153 @@
+from Domain.BitBoard import BitBoard, TOKENS, OPPONENT
+from Domain.Windows import Geometry, DEFAULT_GEOMETRY, TOKEN_CODES
+
+# numpy is only needed by the batch evaluator, the rest of the engine running without it
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+class BatchEvaluator:
+
+    def __init__(self, geometry: Geometry = DEFAULT_GEOMETRY):
+
+        """
+        Scores many positions at once with numpy, giving the same results as BoardService.score. The positions are
+        stacked in an N x ROWS x COLUMNS int8 array holding the TOKEN_CODES of the cells
+        :param geometry: geometry of the boards scored
+        """
+
+        if numpy is None:
+            raise ImportError("The batch evaluator needs numpy!\n")
+
+        self._geometry = geometry
+
+        # Flat cell index of every cell of every window, and the weight of every cell in the pattern of its window.
+        # The patterns of windows longer than 9 cells do not fit in int16, so they are folded in int32
+        self._window_indexes = numpy.array([[row * geometry.columns + column for row, column in window]
+                                            for window in geometry.window_cells], dtype=numpy.intp)
+        self._weights = numpy.array([3 ** index for index in range(geometry.connect)], dtype=numpy.int32)
+        self._pattern_scores = {token: numpy.array(geometry.pattern_scores[token], dtype=numpy.int32)
+                                for token in TOKENS}
+
+        # Bit position of every cell on a bitboard, in the row by row order of the arrays. The masks of boards
+        # wider than 64 bits are kept as Python integers in object arrays
+        if geometry.columns * geometry.height <= 64:
+            self._mask_type, self._one = numpy.uint64, numpy.uint64(1)
+        else:
+            self._mask_type, self._one = object, 1
+
+        self._cell_positions = numpy.array([[geometry.cell_position(row, column) for column in range(geometry.columns)]
+                                            for row in range(geometry.rows)]).astype(self._mask_type)
+
+    @property
+    def geometry(self):
+        return self._geometry
+
+    def encode_boards(self, boards: list):
+
+        """
+        Stacks list boards, as returned by BoardService.get_board, into an array
+        :param boards: list of boards
+        :return: N x ROWS x COLUMNS int8 array
+        """
+
+        codes = [[[TOKEN_CODES[token] for token in line] for line in board] for board in boards]
+
+        return numpy.array(codes, dtype=numpy.int8).reshape(len(boards), self._geometry.rows, self._geometry.columns)
+
+    def encode_masks(self, x_masks: list, zero_masks: list):
+
+        """
+        Stacks positions given by the masks of the tokens of both players, every cell being read from the masks by
+        a single shift of the whole stack
+        :param x_masks: masks of the tokens of X
+        :param zero_masks: masks of the tokens of 0
+        :return: N x ROWS x COLUMNS int8 array
+        """
+
+        positions = self._cell_positions
+        one = self._one
+
+        x_bits = (numpy.array(x_masks, dtype=self._mask_type)[:, None, None] >> positions) & one
+        zero_bits = (numpy.array(zero_masks, dtype=self._mask_type)[:, None, None] >> positions) & one
+
+        return (x_bits * TOKEN_CODES["X"] + zero_bits * TOKEN_CODES["0"]).astype(numpy.int8)
+
+    def encode_bitboards(self, boards: list):
+
+        """
+        Stacks bitboards into an array
+        :param boards: list of bitboards
+        :return: N x ROWS x COLUMNS int8 array
+        """
+
+        return self.encode_masks([board.masks["X"] for board in boards], [board.masks["0"] for board in boards])
+
+    def score(self, boards, token: str):
+
+        """
+        Scores every position of a stack
+        :param boards: N x ROWS x COLUMNS array of TOKEN_CODES
+        :param token: token of the player the scores are computed for
+        :return: array with the N scores
+        """
+
+        boards = numpy.asarray(boards, dtype=numpy.int8)
+        flat = boards.reshape(len(boards), self._geometry.cells).astype(numpy.int32)
+
+        # N x windows x CONNECT codes, folded into the pattern of every window and looked up in a single gather
+        patterns = flat[:, self._window_indexes] @ self._weights
+        scores = self._pattern_scores[token][patterns].sum(axis=1)
+
+        center = (boards[:, :, list(self._geometry.center_columns)] == TOKEN_CODES[token]).sum(axis=(1, 2))
+
+        return scores + center * 3
+
+    def score_children(self, boards: list, tokens: list):
+
+        """
+        Scores the positions reached by every move on many positions with a single evaluation of the whole stack.
+        The children are only built as masks, the tokens of the player to move being encoded as X so that the
+        scores of both players come from the same table
+        :param boards: positions, left unchanged
+        :param tokens: token of the player to move on every position
+        :return: list with a dictionary from every valid column to the score of its position for the player, for
+                 every position
+        """
+
+        height = self._geometry.height
+        owners = []
+        own_masks = []
+        opponent_masks = []
+
+        for index, (board, token) in enumerate(zip(boards, tokens)):
+
+            own = board.masks[token]
+            opponent = board.masks[OPPONENT[token]]
+            heights = board.heights
+
+            for column in board.valid_columns():
+                owners.append((index, column))
+                own_masks.append(own | 1 << (column * height + heights[column]))
+                opponent_masks.append(opponent)
+
+        scores = [{} for _ in boards]
+
+        if owners:
+            for (index, column), score in zip(owners, self.score(self.encode_masks(own_masks, opponent_masks), "X")):
+                scores[index][column] = int(score)
+
+        return scores
+
+    def score_moves(self, board: BitBoard, token: str):
+
+        """
+        Scores the positions reached by every move of a player, to order or analyse the moves of a position
+        :param board: position on which the player has to move, left unchanged
+        :param token: token of the player to move
+        :return: dictionary from every valid column to the score of its position for the player
+        """
+
+        return self.score_children([board], [token])[0]
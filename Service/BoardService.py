@@ -1,35 +1,219 @@
-import math
+import logging
 import random
+import threading
 
+from Domain.BitBoard import BitBoard, OPPONENT, popcount
 from Domain.Board import Board
 from Domain.Move import Move
 from Domain.MoveValidator import MoveValidator
+from Domain.Windows import TOKEN_CODES, window_score
+from Service.EndgameSolver import EndgameSolver
+from Service.MoveOrdering import MoveOrdering
+from Service.OpeningBook import OpeningBook
+from Service.ParallelSearch import ParallelSearch
+from Service.SearchEngine import SearchEngine, score_bitboard
+from Service.SearchStatistics import SearchStatistics, BOOK, PONDERED, THREAT, ENDGAME, SEARCH, PARALLEL
+from Service.ThreatAnalysis import ThreatAnalysis
+from Service.TranspositionTable import TranspositionTable
+
+logger = logging.getLogger(__name__)
 
 
 class BoardService:
 
-    def __init__(self, board: Board, move_validator: MoveValidator()):
+    def __init__(self, board: Board, move_validator: MoveValidator(), transposition_table: TranspositionTable = None,
+                 max_depth: int = 7, time_budget: float = None, node_budget: int = None,
+                 move_ordering: MoveOrdering = None, workers: int = None, opening_book: OpeningBook = None,
+                 endgame_threshold: int = 16):
+
+        """
+        :param board: board of the game
+        :param move_validator: validator of the moves of the player
+        :param transposition_table: table shared by the searches of the AI, a new one is created if not given
+        :param max_depth: deepest iteration searched by the AI, None to search until the board is full
+        :param time_budget: seconds the AI may spend on a move, None for no limit
+        :param node_budget: nodes the AI may search for a move, None for no limit
+        :param move_ordering: killer and history tables shared by the searches, new ones are created if not given
+        :param workers: number of processes the root moves of the AI are split across, None to search on the
+                        current process
+        :param opening_book: book checked by the AI before searching, None to always search
+        :param endgame_threshold: number of empty cells from which the AI solves the game exactly instead of
+                                  searching, None to always search
+        """
+
+        if opening_book is not None and opening_book.token != "X":
+            raise ValueError("The opening book was not made for the AI!\n")
+
+        if opening_book is not None and opening_book.geometry is not board.geometry:
+            raise ValueError("The opening book was not made for this board!\n")
 
         self._game_board = board
         self._move_validator = move_validator
+        self._winner = None
+        self._undone_moves = []
+
+        self._search_engine = SearchEngine("X", transposition_table, move_ordering, max_depth, time_budget,
+                                           node_budget)
+
+        self._opening_book = opening_book
+        self._endgame_threshold = endgame_threshold
+        self._endgame_solver = None
+        self._pondered_columns = {}
+        self._nodes = 0
+
+        self._parallel_search = None
+        if workers is not None:
+            self._parallel_search = ParallelSearch("X", workers, max_depth, time_budget, node_budget)
 
     @property
     def game_board(self):
         return self._game_board
 
+    @property
+    def winner(self):
+        return self._winner
+
+    @property
+    def moves(self):
+
+        """
+        Returns the moves played on the board, rebuilt from the move stack of its bitboard
+        """
+
+        board = self._game_board
+        heights = board.bitboard.heights.copy()
+        moves = []
+
+        for column in reversed(board.bitboard.moves):
+            heights[column] -= 1
+            row = board.geometry.rows - 1 - heights[column]
+            moves.append(Move(row, column, board.get_token(row, column)))
+
+        moves.reverse()
+
+        return moves
+
+    @property
+    def search_engine(self):
+        return self._search_engine
+
+    @property
+    def transposition_table(self):
+        return self._search_engine.transposition_table
+
+    @property
+    def move_ordering(self):
+        return self._search_engine.move_ordering
+
+    @property
+    def pondered_columns(self):
+        return self._pondered_columns
+
+    @property
+    def opening_book(self):
+        return self._opening_book
+
+    @property
+    def parallel_search(self):
+        return self._parallel_search
+
+    @property
+    def nodes(self):
+
+        """
+        Returns the nodes visited to find the last move of the AI, 0 if it came from the opening book, the threats
+        on the board or pondering
+        """
+
+        return self._nodes
+
+    def shutdown(self):
+
+        """
+        Stops the worker processes of the parallel search, started again by the next search of the AI
+        :return:
+        """
+
+        if self._parallel_search is not None:
+            self._parallel_search.shutdown()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.shutdown()
+
     def make_move(self, move: Move):
 
         """
-        Updates the board with a move done either by the player or computer
+        Updates the board with a move done either by the player or computer, only the lines passing through
+        the played cell being checked for a win
         :param move: a connect 4 move
-        :return: None
+        :return: True if the move won the game, False otherwise
+        """
+
+        won = self.play_move(move)
+
+        # The redo history is only dropped once the move was played, a rejected move leaving it as it was
+        self._undone_moves.clear()
+
+        return won
+
+    def play_move(self, move: Move):
+
+        """
+        Drops the token of a move on the board, its column being pushed on the move stack of the bitboard
+        :param move: a connect 4 move
+        :return: True if the move won the game, False otherwise
         """
 
-        row = move.row
         column = move.column
         token = move.token
 
-        self._game_board.update_board(row, column, token)
+        if move.row != self.find_row(column):
+            raise ValueError("The token must land on the first empty row of the column!\n")
+
+        row = self._game_board.play(column, token)
+
+        if self._game_board.bitboard.is_win_through(row, column, token):
+            self._winner = token
+
+        return self._winner == token
+
+    def undo(self):
+
+        """
+        Takes back the last move made on the board
+        :return: the move taken back, None if there are no moves on the board
+        """
+
+        if not self._game_board.bitboard.moves:
+            return None
+
+        move = self._game_board.undo()
+        self._undone_moves.append(move)
+
+        # The game stops at the first win, so no win is left on the board once the last move is taken back
+        self._winner = None
+
+        return move
+
+    def redo(self):
+
+        """
+        Plays again the last move taken back by undo
+        :return: the move played again, None if there is nothing to redo
+        """
+
+        if not self._undone_moves:
+            return None
+
+        move = self._undone_moves.pop()
+        self.play_move(move)
+
+        return move
 
     def get_board(self) -> list:
         """
@@ -43,14 +227,14 @@ class BoardService:
         """
         Computes a move made by the player
         :param column: column on which the player made the move
-        :return:
+        :return: True if the move won the game, False otherwise
         """
 
         player_move = self.generate_player_move(column)
 
         self._move_validator.validate(player_move, self._game_board)
 
-        self.make_move(player_move)
+        return self.make_move(player_move)
 
     def generate_player_move(self, column: int) -> Move:
         """
@@ -68,41 +252,58 @@ class BoardService:
         """
         Finds the first empty row, for a given column
         :param column: column index
-        :return: index of the row
+        :return: index of the row, None if the column is full or outside the board
         """
 
-        for row in range(5, -1, -1):
+        if column < 0 or column >= self._game_board.geometry.columns:
+            return None
 
-            if self._game_board.get_token(row, column) == " ":
-                return row
+        return self._game_board.bitboard.next_row(column)
 
     def computer_move(self):
         """
         Handles the creation of a computer move
-        :return:
+        :return: True if the move won the game, False otherwise
         """
 
         computer_move = self.generate_computer_move()
-        self.make_move(computer_move)
+        return self.make_move(computer_move)
 
     def ai_move(self):
         """
         Handles the creation of a move made by de AI
-        :return:
+        :return: True if the move won the game, False otherwise
         """
 
         ai_move = self.generate_ai_move()
-        self.make_move(ai_move)
+        return self.make_move(ai_move)
 
-    def generate_ai_move(self) -> Move:
+    def generate_ai_move(self, stop_event: threading.Event = None, statistics: SearchStatistics = None) -> Move:
         """
         Generates a move made by the AI
-        :return:
+        :param stop_event: event another thread sets to cancel the search, None if it cannot be cancelled
+        :param statistics: statistics filled by the search and logged once the move is found, None to not
+                           collect them
+        :return: the move, None if the search was cancelled before finding one
         """
 
-        aux_board = self._game_board.board
+        board = self._game_board.bitboard
+
+        # The answer found while pondering on the time of the player is taken without searching again
+        column = self.pondered_column(board)
+        self._nodes = 0
+
+        if column is not None and statistics is not None:
+            statistics.source = PONDERED
 
-        column = self.minimax(aux_board, 7, -math.inf, math.inf, True)[0]
+        if column is None:
+            column, self._nodes = self.search_ai_column(board, stop_event, statistics)
+
+        if statistics is not None:
+            logger.info("AI move in column %s: %s", column, statistics.summary())
+
+        if column is None:
+            return None
 
         row = self.find_row(column)
 
@@ -110,6 +311,150 @@ class BoardService:
 
         return ai_move
 
+    def find_ai_column(self, board: BitBoard, stop_event: threading.Event = None,
+                       statistics: SearchStatistics = None):
+        """
+        Finds the column of the AI on a position from the opening book, the threats on the board, the endgame solver
+        or the search
+        :param board: position on which the AI has to move
+        :param stop_event: event another thread sets to cancel the search, None if it cannot be cancelled
+        :param statistics: statistics filled by the search, None to not collect them
+        :return: column index, None if the search was cancelled before finding one
+        """
+
+        return self.search_ai_column(board, stop_event, statistics)[0]
+
+    def search_ai_column(self, board: BitBoard, stop_event: threading.Event = None,
+                         statistics: SearchStatistics = None):
+        """
+        Finds the column of the AI on a position as find_ai_column, together with the nodes visited by whichever
+        source produced it
+        :param board: position on which the AI has to move
+        :param stop_event: event another thread sets to cancel the search, None if it cannot be cancelled
+        :param statistics: statistics filled by the search, None to not collect them
+        :return: tuple (column, nodes), the column being None if the search was cancelled before finding one
+        """
+
+        if self._opening_book is not None:
+
+            column = self._opening_book.lookup(board)
+
+            if column is not None:
+                if statistics is not None:
+                    statistics.source = BOOK
+                return column, 0
+
+        # Wins, forced blocks and lost positions are played without searching
+        column = ThreatAnalysis(board, "X").obvious_column
+
+        if column is not None:
+            if statistics is not None:
+                statistics.source = THREAT
+            return column, 0
+
+        if self.is_endgame(board):
+
+            column = self.solve(board).column
+
+            if statistics is not None:
+                statistics.source = ENDGAME
+                statistics.add_nodes(self._endgame_solver.nodes)
+
+            return column, self._endgame_solver.nodes
+
+        if statistics is not None:
+            statistics.source = SEARCH if self._parallel_search is None else PARALLEL
+
+        if self._parallel_search is not None:
+            return self._parallel_search.search(board, stop_event, statistics)[0], self._parallel_search.nodes
+
+        return self._search_engine.search(board, stop_event, statistics)[0], self._search_engine.nodes
+
+    def ponder(self, board: BitBoard, stop_event: threading.Event = None):
+        """
+        Searches the answer of the AI to every reply of the player, to be run while the player is thinking.
+        The answers are kept until the next call and the transposition table stays warm for the replies
+        that were not searched before the player moved
+        :param board: copy of the position on which the player has to move
+        :param stop_event: event set once the player moved, None to ponder on all the replies
+        :return:
+        """
+
+        self._pondered_columns = {}
+        geometry = board.geometry
+
+        for column in board.geometry.center_order:
+
+            if not board.can_play(column):
+                continue
+
+            row = board.play(column, "0")
+
+            # The answers are kept under the canonical keys, so the mirror of a reply already searched is skipped
+            key, mirrored = board.canonical_key()
+
+            if key not in self._pondered_columns and not board.is_win_through(row, column, "0") and \
+                    not board.is_full():
+
+                answer = self.find_ai_column(board, stop_event)
+
+                # A search cancelled by the player only completed the first iterations, so its answer is dropped
+                if stop_event is not None and stop_event.is_set():
+                    board.undo()
+                    return
+
+                if answer is not None and mirrored:
+                    answer = geometry.mirror_column(answer)
+
+                self._pondered_columns[key] = answer
+
+            board.undo()
+
+    def pondered_column(self, board: BitBoard):
+        """
+        Finds the answer pondered for a position or for its mirror
+        :param board: position on which the AI has to move
+        :return: column index, None if the position was not pondered
+        """
+
+        key, mirrored = board.canonical_key()
+        column = self._pondered_columns.get(key)
+
+        if column is not None and mirrored:
+            return board.geometry.mirror_column(column)
+
+        return column
+
+    def is_endgame(self, board: BitBoard = None):
+        """
+        Checks if there are few enough empty cells for the AI to solve the game exactly
+        :param board: position to be checked, the board of the game if not given
+        :return: True/False
+        """
+
+        if board is None:
+            board = self._game_board.bitboard
+
+        if self._endgame_threshold is None:
+            return False
+
+        return board.geometry.cells - popcount(board.mask) <= self._endgame_threshold
+
+    def solve(self, board: BitBoard = None):
+        """
+        Solves the game exactly for the AI, to be used on positions with few empty cells
+        :param board: position to be solved, the board of the game if not given
+        :return: EndgameResult with the best column, the outcome and the number of moves until the win
+        """
+
+        if board is None:
+            board = self._game_board.bitboard
+
+        if self._endgame_solver is None:
+            self._endgame_solver = EndgameSolver()
+
+        return self._endgame_solver.solve(board, "X")
+
     def generate_computer_move(self) -> Move:
         """
         Generates a move made by the computer
@@ -134,15 +479,7 @@ class BoardService:
         :return:
         """
 
-        valid_moves = []
-
-        for column in range(0, 7):
-            for row in range(5, -1, -1):
-                if self._game_board.get_token(row, column) == " ":
-                    valid_moves.append((row, column))
-                    break
-
-        return valid_moves
+        return self.valid_moves_for_board(self._game_board.bitboard)
 
     def check_win(self, token: str):
 
@@ -168,16 +505,8 @@ class BoardService:
         Checks if the winning condition was satisfied on a line
         :return: 
         """
-        
-        for line in range(5, -1, -1):
-            for column in range(0, 4):
-                if self._game_board.get_token(line, column) == token and self._game_board.get_token(line, column) \
-                        == self._game_board.get_token(line, column + 1) \
-                        == self._game_board.get_token(line, column + 2) == self._game_board.get_token(line, column + 3):
 
-                    return True
-
-        return False
+        return self._game_board.bitboard.has_line(token, self._game_board.geometry.horizontal)
     
     def check_win_on_columns(self, token: str):
         
@@ -185,16 +514,8 @@ class BoardService:
         Checks if the winning condition was satisfied on a column
         :return: 
         """
-        
-        for column in range(0, 7):
-            for line in range(5, 2, -1):
-                if self._game_board.get_token(line, column) == token and\
-                        self._game_board.get_token(line, column) == self._game_board.get_token(line - 1, column) \
-                        == self._game_board.get_token(line - 2, column) == self._game_board.get_token(line - 3, column):
 
-                    return True
-
-        return False
+        return self._game_board.bitboard.has_line(token, self._game_board.geometry.vertical)
     
     def check_win_on_diagonals_left_to_right(self, token: str):
         
@@ -202,16 +523,8 @@ class BoardService:
         Checks if the winning condition was satisfied on a diagonal from left to right
         :return: 
         """
-        
-        for line in range(5, 2, -1):
-            for column in range(4):
-                if self._game_board.get_token(line, column) == token and\
-                        self._game_board.get_token(line, column) == self._game_board.get_token(line - 1, column + 1) \
-                        == self._game_board.get_token(line - 2, column + 2) ==\
-                        self._game_board.get_token(line - 3, column + 3):
-
-                    return True
-        return False
+
+        return self._game_board.bitboard.has_line(token, self._game_board.geometry.diagonal_left_to_right)
     
     def check_win_on_diagonals_from_right_to_left(self, token: str):
         
@@ -220,16 +533,8 @@ class BoardService:
         token: token of the player or of the computer
         :return: 
         """
-        
-        for line in range(5, 2, -1):
-            for column in range(3, 7):
-                if self._game_board.get_token(line, column) == token and\
-                        self._game_board.get_token(line, column) == self._game_board.get_token(line - 1, column - 1) \
-                        == self._game_board.get_token(line - 2, column - 2) ==\
-                        self._game_board.get_token(line - 3, column - 3):
-
-                    return True
-        return False
+
+        return self._game_board.bitboard.has_line(token, self._game_board.geometry.diagonal_right_to_left)
 
     def check_draw(self):
         """
@@ -237,209 +542,89 @@ class BoardService:
         :return:
         """
 
-        valid_moves = self.valid_moves()
-
-        if len(valid_moves) == 0:
-            return True
-        return False
+        return self._game_board.bitboard.is_full()
 
-    def minimax(self, aux_board: list, depth: int, alpha, beta, maximizing_player: bool):
+    def minimax(self, aux_board: BitBoard, depth: int, alpha, beta, maximizing_player: bool):
 
         """
-        Implementation of the minimax algorithm to determine the column of the best move to be made by the AI,
-        optimized with alpha, beta pruning
-        :param aux_board: a copy of the board that the game is running
+        Runs the minimax algorithm of the AI on a position, see SearchEngine.minimax
+        :param aux_board: bitboard of the searched position
         :param depth: depth of the tree that will be generated
         :param alpha: alpha value
         :param beta: beta value
         :param maximizing_player: True for the maximizing player and False for the minimizing player
-        :return: index of the column resulted from the search
+        :return: tuple (column, score)
         """
 
-        valid_moves = self.valid_moves_for_board(aux_board)
-
-        is_terminal = self.is_terminal_node()
-
-        if depth == 0 or is_terminal:
-
-            if is_terminal:
-
-                if self.check_win("X"):
-                    return None, 20000
-
-                elif self.check_win("0"):
-                    return None, -10000
-
-                else:
-                    return None, 0
-            else:
-                return None, self.score(aux_board, "X")
-
-        if maximizing_player:
-
-            value = -math.inf
-            column = valid_moves[0][1]
-            for move in valid_moves:
-
-                row = move[0]
-                col = move[1]
-
-                duplicate_board = self.get_copy_of_board(aux_board)
-                duplicate_board[row][col] = "X"
-                new_score = self.minimax(duplicate_board, depth - 1, alpha, beta, False)[1]
-
-                if new_score > value:
-                    value = new_score
-                    column = col
-
-                alpha = max(alpha, value)
-                if alpha >= beta:
-                    break
-
-            return column, value
-        else:
-
-            value = math.inf
-            column = valid_moves[0][1]
-            for move in valid_moves:
-
-                row = move[0]
-                col = move[1]
-
-                duplicate_board = self.get_copy_of_board(aux_board)
-                duplicate_board[row][col] = "0"
-                new_score = self.minimax(duplicate_board, depth - 1, alpha, beta, True)[1]
+        self._search_engine.set_position(aux_board)
 
-                if new_score < value:
-                    value = new_score
-                    column = col
-
-                beta = min(beta, value)
-                if alpha >= beta:
-                    break
-            return column, value
+        return self._search_engine.minimax(aux_board, depth, alpha, beta, maximizing_player)
 
     @staticmethod
-    def valid_moves_for_board(board: list):
+    def valid_moves_for_board(board: BitBoard):
 
         """
         Finds all moves that can be made on the current board status
-        :param board: board of the current game
+        :param board: bitboard of the current game
         :return: list with indexes of all possible moves
         """
 
-        valid_moves = []
-
-        for column in range(0, 7):
-            for row in range(5, -1, -1):
-                if board[row][column] == " ":
-                    valid_moves.append((row, column))
-                    break
-
-        return valid_moves
-
-    @staticmethod
-    def get_copy_of_board(board: list):
-
-        """
-        Creates a copy of a board
-        :param board: current board of the game
-        :return:
-        """
-
-        board_duplicate = []
-
-        for row in board:
-            board_duplicate.append(row.copy())
-
-        return board_duplicate
+        return [(board.next_row(column), column) for column in board.valid_columns()]
 
     def is_terminal_node(self):
         """
         Checks if the node from the minimax algorithm tree is terminal
         :return:
         """
-        return self.check_win("X") or self.check_win("0") or self.check_draw()
+        return self._winner is not None or self.check_draw()
 
     def score(self, board: list, token: str):
 
         """
-        Generates the score of a move
+        Generates the score of a move, every window being scored from the pattern of its cells
         :param board: possible board configuration
         :param token: token of the minimizing/maximizing player
         :return:score of a move
         """
 
-        score = 0
+        geometry = self._game_board.geometry
+        pattern_scores = geometry.pattern_scores[token]
 
-        # Score center column
+        # Score center columns
 
-        center_array = [i[3] for i in board]
-        center_count = center_array.count(token)
-        score += center_count * 3
+        score = sum(row[column] == token for row in board for column in geometry.center_columns) * 3
 
-        # Score Horizontal
+        for window in geometry.window_weights:
 
-        for row in board:
-            for column in range(4):
-                window = row[column:column + 4]
-                score += self.evaluate_windows(window, token)
+            pattern = 0
+            for row, column, weight in window:
+                pattern += TOKEN_CODES[board[row][column]] * weight
 
-        # Score Vertical
+            score += pattern_scores[pattern]
 
-        column_array = []
-        for column in range(7):
-            column_array.append([i[column] for i in board])
-
-        for column in column_array:
-            for row in range(3):
-                window = column[row: row + 4]
-                score += self.evaluate_windows(window, token)
-
-        # Score diagonals left to right
-        diagonals_array = []
-        for r in range(5, 2, -1):
-            for c in range(0, 4):
-                diagonals_array.append([board[r][c], board[r - 1][c + 1], board[r - 2][c + 2], board[r - 3][c + 3]])
-
-        for window in diagonals_array:
-            score += self.evaluate_windows(window, token)
+        return score
 
-        diagonals_array = []
-        for r in range(5, 2, -1):
-            for c in range(3, 7):
-                diagonals_array.append([board[r][c], board[r - 1][c - 1], board[r - 2][c - 2], board[r - 3][c - 3]])
+    @staticmethod
+    def score_bitboard(board: BitBoard, token: str):
 
-        for window in diagonals_array:
-            score += self.evaluate_windows(window, token)
+        """
+        Generates the score of a move, giving the same result as score for the matching list board
+        :param board: possible bitboard configuration
+        :param token: token of the minimizing/maximizing player
+        :return: score of a move
+        """
 
-        return score
+        return score_bitboard(board, token)
 
     @staticmethod
     def evaluate_windows(window: list, token: str):
 
         """
         Return the score for a certain windows of the board
-        :param window:represents a list of 4 elements representing
-                      4 successive elements from a line/column or a diagonal from the board
+        :param window:represents a list of connect elements representing
+                      connect successive elements from a line/column or a diagonal from the board
         :param token: current board state of the game
         :return: score of the window
         """
 
-        score = 0
-        opp_token = "0"
-        if token == "0":
-            opp_token = "X"
-
-        if window.count(token) == 4:
-            score += 10000
-        elif window.count(token) == 3 and window.count(" ") == 1:
-            score += 5
-        elif window.count(token) == 2 and window.count(" ") == 2:
-            score += 2
-        if window.count(opp_token) == 3 and window.count(" ") == 1:
-            score -= 4
-        if window.count(opp_token) == 4:
-            score -= 10000
-
-        return score
+        return window_score(window.count(token), window.count(OPPONENT[token]), len(window))
@@ -0,0 +1,250 @@
+from Domain.BitBoard import BitBoard, winning_cells_function, mirror_function, popcount
+from Domain.Windows import Geometry, DEFAULT_GEOMETRY
+from Service.TranspositionTable import TranspositionTable, UPPER_BOUND
+
+WIN = "win"
+DRAW = "draw"
+LOSS = "loss"
+
+
+class EndgameResult:
+
+    def __init__(self, column: int, score: int, moves: int, cells: int):
+
+        """
+        Proven result of a position
+        :param column: best column of the player to move
+        :param score: 0 for a draw, positive if the player to move wins, negative if it loses, a sooner end of the
+                      game being further from 0
+        :param moves: number of tokens on the solved position
+        :param cells: number of cells of the board
+        """
+
+        self._column = column
+        self._score = score
+        self._moves = moves
+        self._cells = cells
+
+    @property
+    def column(self):
+        return self._column
+
+    @property
+    def score(self):
+        return self._score
+
+    @property
+    def cells(self):
+        return self._cells
+
+    @property
+    def outcome(self):
+
+        if self._score > 0:
+            return WIN
+        if self._score < 0:
+            return LOSS
+
+        return DRAW
+
+    @property
+    def distance(self):
+
+        """
+        Returns the number of moves, of both players, until the winning move is made, None for a draw
+        """
+
+        if self._score == 0:
+            return None
+
+        # the winning move is made when cells + 1 - 2 * |score| or cells - 2 * |score| tokens are on the board,
+        # whichever belongs to the winner
+        winner_parity = self._moves % 2 if self._score > 0 else (self._moves + 1) % 2
+        moves_before_win = self._cells + 1 - 2 * abs(self._score)
+
+        if moves_before_win % 2 != winner_parity:
+            moves_before_win -= 1
+
+        return moves_before_win - self._moves + 1
+
+
+class EndgameSolver:
+
+    def __init__(self, transposition_table: TranspositionTable = None):
+
+        """
+        Exact solver for positions with few empty cells, searching with null windows until the score is known.
+        The positions are seen from the player to move, so its own transposition table does not depend on tokens
+        :param transposition_table: table of the upper bounds found, a new one is created if not given
+        """
+
+        if transposition_table is None:
+            transposition_table = TranspositionTable()
+
+        self._transposition_table = transposition_table
+        self._nodes = 0
+        self._geometry = None
+        self.set_geometry(DEFAULT_GEOMETRY)
+
+    @property
+    def nodes(self):
+        return self._nodes
+
+    def set_geometry(self, geometry: Geometry):
+
+        """
+        Loads the tables of the boards to be solved, the table of the solver being cleared when they change size
+        :param geometry: geometry of the boards
+        :return:
+        """
+
+        if self._geometry is not None and geometry is not self._geometry:
+            self._transposition_table.clear()
+
+        self._geometry = geometry
+        self._cells = geometry.cells
+        self._bottom_mask = geometry.bottom_mask
+        self._board_mask = geometry.board_mask
+        self._column_masks = geometry.column_masks
+        self._center_order = geometry.center_order
+        self._winning_cells = winning_cells_function(geometry)
+        self._mirror = mirror_function(geometry)
+
+    def solve(self, board: BitBoard, token: str):
+
+        """
+        Finds the proven result of a position on which no player won yet
+        :param board: position to be solved
+        :param token: token of the player to move
+        :return: EndgameResult with the best column and its score
+        """
+
+        self._nodes = 0
+
+        if board.geometry is not self._geometry:
+            self.set_geometry(board.geometry)
+
+        cells = self._cells
+        position = board.masks[token]
+        mask = board.mask
+        moves = popcount(mask)
+        possible = (mask + self._bottom_mask) & self._board_mask
+
+        wins = self._winning_cells(position, mask) & possible
+
+        for column in self._center_order:
+            if wins & self._column_masks[column]:
+                return EndgameResult(column, (cells + 1 - moves) // 2, moves, cells)
+
+        best_column = None
+        best_score = -cells
+
+        for column in self._center_order:
+
+            move = possible & self._column_masks[column]
+            if not move:
+                continue
+
+            score = -self.solve_score(position ^ mask, mask | move, moves + 1)
+
+            if best_column is None or score > best_score:
+                best_column = column
+                best_score = score
+
+        if best_column is None:
+            return EndgameResult(None, 0, moves, cells)
+
+        return EndgameResult(best_column, best_score, moves, cells)
+
+    def solve_score(self, position: int, mask: int, moves: int):
+
+        """
+        Narrows the score of a position with null window searches
+        :param position: mask of the tokens of the player to move
+        :param mask: mask of all the occupied cells
+        :param moves: number of tokens on the board
+        :return: exact score of the position
+        """
+
+        minimum = -((self._cells - moves) // 2)
+        maximum = (self._cells + 1 - moves) // 2
+
+        while minimum < maximum:
+
+            middle = minimum + (maximum - minimum) // 2
+
+            # searching around 0 first proves draws and short wins sooner
+            if middle <= 0 and int(minimum / 2) < middle:
+                middle = int(minimum / 2)
+            elif middle >= 0 and maximum // 2 > middle:
+                middle = maximum // 2
+
+            score = self.negamax(position, mask, moves, middle, middle + 1)
+
+            if score <= middle:
+                maximum = score
+            else:
+                minimum = score
+
+        return minimum
+
+    def negamax(self, position: int, mask: int, moves: int, alpha: int, beta: int):
+
+        """
+        Negamax search with alpha, beta pruning down to the end of the game
+        :param position: mask of the tokens of the player to move
+        :param mask: mask of all the occupied cells
+        :param moves: number of tokens on the board
+        :param alpha: alpha value
+        :param beta: beta value
+        :return: score of the position if it lies between alpha and beta, a bound of it otherwise
+        """
+
+        self._nodes += 1
+
+        cells = self._cells
+        bottom_mask = self._bottom_mask
+        possible = (mask + bottom_mask) & self._board_mask
+
+        if self._winning_cells(position, mask) & possible:
+            return (cells + 1 - moves) // 2
+
+        if not possible:
+            return 0
+
+        maximum = (cells - 1 - moves) // 2
+
+        # A position and its mirror have the same score, so they share their entry
+        key = position + mask + bottom_mask
+        mirror_key = self._mirror(key)
+        if mirror_key < key:
+            key = mirror_key
+
+        entry = self._transposition_table.lookup(key)
+
+        if entry is not None:
+            maximum = min(maximum, entry[3])
+
+        if beta > maximum:
+            beta = maximum
+            if alpha >= beta:
+                return beta
+
+        opponent = position ^ mask
+        column_masks = self._column_masks
+
+        for column in self._center_order:
+
+            move = possible & column_masks[column]
+            if move:
+
+                score = -self.negamax(opponent, mask | move, moves + 1, -beta, -alpha)
+
+                if score >= beta:
+                    return score
+                if score > alpha:
+                    alpha = score
+
+        self._transposition_table.store(key, 0, UPPER_BOUND, alpha, None)
+
+        return alpha
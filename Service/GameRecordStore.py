@@ -0,0 +1,216 @@
+import mmap
+import os
+import struct
+
+from Domain.BitBoard import BitBoard, OPPONENT
+from Domain.PositionCodec import PACKED_COLUMNS, packed_moves_size, pack_moves, unpack_moves
+from Domain.Windows import Geometry, DEFAULT_GEOMETRY, TOKEN_CODES
+
+MAGIC = b"C4GR"
+VERSION = 2
+
+# magic, version, rows, columns, connect length
+HEADER = struct.Struct("<4sHBBB")
+
+
+def record_struct(geometry: Geometry = DEFAULT_GEOMETRY):
+
+    """
+    Returns the layout of a record: number of moves, code of the winner, packed columns
+    :param geometry: geometry of the board
+    :return: struct of a record
+    """
+
+    return struct.Struct("<BB" + str(packed_moves_size(geometry)) + "s")
+
+
+RECORD = record_struct()
+
+WINNERS = {code: token for token, code in TOKEN_CODES.items() if token != " "}
+
+
+class GameRecord:
+
+    def __init__(self, columns: list, winner: str = None):
+
+        """
+        Game read from a record file
+        :param columns: columns played, in order
+        :param winner: token of the winner, None for a draw or an unfinished game
+        """
+
+        self._columns = columns
+        self._winner = winner
+
+    @property
+    def columns(self):
+        return self._columns
+
+    @property
+    def winner(self):
+        return self._winner
+
+
+class GameRecordStore:
+
+    def __init__(self, path: str, geometry: Geometry = DEFAULT_GEOMETRY):
+
+        """
+        Append-only file of games. Every record has the same size, so the records are memory-mapped and reached by
+        their index without reading the ones before them
+        :param path: path of the record file, created if it does not exist
+        :param geometry: geometry of the board of the games
+        """
+
+        if geometry.cells > 255 or geometry.columns > PACKED_COLUMNS:
+            raise ValueError("The games of this board do not fit in a record!\n")
+
+        self._geometry = geometry
+        self._record = record_struct(geometry)
+        self._file = open(path, "a+b")
+        self._map = None
+
+        dimensions = (geometry.rows, geometry.columns, geometry.connect)
+
+        self._file.seek(0, os.SEEK_END)
+
+        if self._file.tell() == 0:
+            self._file.write(HEADER.pack(MAGIC, VERSION, *dimensions))
+            self._file.flush()
+
+        self._file.seek(0)
+        header = self._file.read(HEADER.size)
+
+        if len(header) != HEADER.size or HEADER.unpack(header) != (MAGIC, VERSION) + dimensions:
+            self._file.close()
+            raise ValueError("The file is not a game record file of this board!\n")
+
+        if (self.file_size() - HEADER.size) % self._record.size:
+            self._file.close()
+            raise ValueError("The game record file is truncated!\n")
+
+    @property
+    def geometry(self):
+        return self._geometry
+
+    def file_size(self):
+
+        return os.fstat(self._file.fileno()).st_size
+
+    def __len__(self):
+
+        return (self.file_size() - HEADER.size) // self._record.size
+
+    def append(self, columns: list, winner: str = None):
+
+        """
+        Appends a game to the file
+        :param columns: columns played, in order
+        :param winner: token of the winner, None for a draw or an unfinished game
+        :return: index of the record
+        """
+
+        if len(columns) > self._geometry.cells:
+            raise ValueError("The game has too many moves!\n")
+
+        code = 0 if winner is None else TOKEN_CODES[winner]
+
+        self._file.write(self._record.pack(len(columns), code, pack_moves(columns, self._geometry)))
+        self._file.flush()
+
+        return len(self) - 1
+
+    def read_map(self):
+
+        """
+        Returns the mapping of the file, mapped again once records were appended after it
+        :return: mmap of the file
+        """
+
+        size = self.file_size()
+
+        if self._map is None or len(self._map) != size:
+
+            if self._map is not None:
+                self._map.close()
+
+            self._map = mmap.mmap(self._file.fileno(), size, access=mmap.ACCESS_READ)
+
+        return self._map
+
+    def __getitem__(self, index: int):
+
+        """
+        Reads a game
+        :param index: index of the record
+        :return: GameRecord
+        """
+
+        count = len(self)
+
+        if index < 0:
+            index += count
+
+        if not 0 <= index < count:
+            raise IndexError("Game record index out of range!\n")
+
+        moves, code, packed = self._record.unpack_from(self.read_map(), HEADER.size + index * self._record.size)
+
+        return GameRecord(unpack_moves(packed, moves), WINNERS.get(code))
+
+    def __iter__(self):
+
+        for index in range(len(self)):
+            yield self[index]
+
+    def winners(self):
+
+        """
+        Scans the winner of every game, reading a single byte of every record
+        :return: generator of the token of the winner of every game, None for a draw
+        """
+
+        data = self.read_map()
+
+        for offset in range(HEADER.size + 1, len(data), self._record.size):
+            yield WINNERS.get(data[offset])
+
+    def replay(self, index: int, first_token: str = "0"):
+
+        """
+        Plays a game again from the empty board
+        :param index: index of the record
+        :param first_token: token of the player that made the first move
+        :return: generator of the key of every position of the game, after every move
+        """
+
+        board = BitBoard(self._geometry)
+        token = first_token
+
+        for column in self[index].columns:
+
+            board.play(column, token)
+            token = OPPONENT[token]
+
+            yield board.key()
+
+    def close(self):
+
+        """
+        Unmaps and closes the record file
+        :return:
+        """
+
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+
+        self._file.close()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.close()
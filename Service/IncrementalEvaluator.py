@@ -0,0 +1,142 @@
+from Domain.BitBoard import BitBoard, TOKENS, OPPONENT
+from Domain.Windows import Geometry, DEFAULT_GEOMETRY
+
+
+def build_deltas(geometry: Geometry):
+
+    """
+    Builds the change of the score of a window when a token is added to it, for the player that added it and for
+    its opponent, indexed by the counts before the token was added, and the bonus of every cell of the center columns
+    :param geometry: geometry of the board
+    :return: tuple (own deltas, opponent deltas, center bonus)
+    """
+
+    count_scores = geometry.count_scores
+    connect = geometry.connect
+
+    own_deltas = [[count_scores[own + 1][opp] - count_scores[own][opp] if own + opp < connect else 0
+                   for opp in range(connect + 1)] for own in range(connect + 1)]
+    opp_deltas = [[count_scores[opp][own + 1] - count_scores[opp][own] if own + opp < connect else 0
+                   for opp in range(connect + 1)] for own in range(connect + 1)]
+
+    center_bonus = [3 if geometry.center_mask & (1 << position) else 0
+                    for position in range(geometry.columns * geometry.height)]
+
+    return own_deltas, opp_deltas, center_bonus
+
+
+_deltas = {DEFAULT_GEOMETRY: build_deltas(DEFAULT_GEOMETRY)}
+
+
+class IncrementalEvaluator:
+
+    def __init__(self, board: BitBoard = None):
+
+        """
+        Keeps the number of tokens of each player in every window together with the score of the position for both
+        players, updated only for the windows passing through a cell when a token is placed or removed
+        :param board: position the evaluator starts from, the empty standard board if not given
+        """
+
+        geometry = DEFAULT_GEOMETRY if board is None else board.geometry
+
+        if geometry not in _deltas:
+            _deltas[geometry] = build_deltas(geometry)
+
+        self._own_deltas, self._opp_deltas, self._center_bonus = _deltas[geometry]
+        self._cell_windows = geometry.cell_windows
+        self._connect = geometry.connect
+
+        window_count = len(geometry.window_masks)
+        self._counts = {"X": [0] * window_count, "0": [0] * window_count}
+        self._scores = {"X": 0, "0": 0}
+
+        if board is not None:
+            for token in TOKENS:
+                mask = board.masks[token]
+                for position in range(geometry.columns * geometry.height):
+                    if mask & (1 << position):
+                        self.place(position, token)
+
+    @property
+    def counts(self):
+        return self._counts
+
+    def score(self, token: str):
+
+        """
+        Returns the score of the position, equal to BoardService.score
+        :param token: token of the player the score is computed for
+        :return: score
+        """
+
+        return self._scores[token]
+
+    def place(self, position: int, token: str):
+
+        """
+        Updates the windows passing through a cell on which a token was placed
+        :param position: bit position of the cell on the bitboard
+        :param token: token placed on the cell
+        :return: True if the token completed a window, False otherwise
+        """
+
+        opp_token = OPPONENT[token]
+        own_counts = self._counts[token]
+        opp_counts = self._counts[opp_token]
+
+        own_deltas = self._own_deltas
+        opp_deltas = self._opp_deltas
+        last = self._connect - 1
+
+        own_delta = self._center_bonus[position]
+        opp_delta = 0
+        completed = False
+
+        for index in self._cell_windows[position]:
+
+            own_count = own_counts[index]
+            opp_count = opp_counts[index]
+
+            own_delta += own_deltas[own_count][opp_count]
+            opp_delta += opp_deltas[own_count][opp_count]
+            own_counts[index] = own_count + 1
+
+            if own_count == last:
+                completed = True
+
+        self._scores[token] += own_delta
+        self._scores[opp_token] += opp_delta
+
+        return completed
+
+    def remove(self, position: int, token: str):
+
+        """
+        Updates the windows passing through a cell from which a token was removed
+        :param position: bit position of the cell on the bitboard
+        :param token: token removed from the cell
+        :return:
+        """
+
+        opp_token = OPPONENT[token]
+        own_counts = self._counts[token]
+        opp_counts = self._counts[opp_token]
+
+        own_deltas = self._own_deltas
+        opp_deltas = self._opp_deltas
+
+        own_delta = self._center_bonus[position]
+        opp_delta = 0
+
+        for index in self._cell_windows[position]:
+
+            own_count = own_counts[index] - 1
+            opp_count = opp_counts[index]
+
+            own_delta += own_deltas[own_count][opp_count]
+            opp_delta += opp_deltas[own_count][opp_count]
+            own_counts[index] = own_count
+
+        self._scores[token] -= own_delta
+        self._scores[opp_token] -= opp_delta
@@ -0,0 +1,104 @@
+from Domain.BitBoard import BitBoard
+from Domain.Windows import Geometry, DEFAULT_GEOMETRY
+
+
+class MoveOrdering:
+
+    def __init__(self, killers_per_ply: int = 2, geometry: Geometry = DEFAULT_GEOMETRY):
+
+        """
+        Orders the moves searched by minimax: the best move known for the position, then the killer moves that
+        caused a cutoff on the same ply, then the moves with the best history, the center columns first on ties.
+        The tables are kept between searches, the moves of the game only adding tokens to the board
+        :param killers_per_ply: number of killer moves remembered for every ply
+        :param geometry: geometry of the searched boards
+        """
+
+        self._killers_per_ply = killers_per_ply
+        self._geometry = None
+        self.set_geometry(geometry)
+
+    @property
+    def killers(self):
+        return self._killers
+
+    @property
+    def history(self):
+        return self._history
+
+    @property
+    def geometry(self):
+        return self._geometry
+
+    def set_geometry(self, geometry: Geometry):
+
+        """
+        Sizes the tables for the boards of a geometry, forgetting them when the geometry changes
+        :param geometry: geometry of the searched boards
+        :return:
+        """
+
+        if geometry is self._geometry:
+            return
+
+        self._geometry = geometry
+        self._height = geometry.height
+        self._center_rank = geometry.center_rank
+        self._killers = [[] for _ in range(geometry.cells + 1)]
+        self._history = {"X": [0] * (geometry.columns * geometry.height),
+                         "0": [0] * (geometry.columns * geometry.height)}
+
+    def order(self, board: BitBoard, columns: list, ply: int, token: str, best_column: int = None):
+
+        """
+        Sorts the columns that can be played on a position
+        :param board: searched position
+        :param columns: columns that can be played
+        :param ply: number of tokens on the board, identifying the ply of the position
+        :param token: token of the player to move
+        :param best_column: best column stored for the position, None if unknown
+        :return: sorted list of columns
+        """
+
+        killers = self._killers[ply]
+        history = self._history[token]
+        heights = board.heights
+        height = self._height
+        center_rank = self._center_rank
+
+        return sorted(columns, key=lambda column: (column != best_column, column not in killers,
+                                                   -history[column * height + heights[column]],
+                                                   center_rank[column]))
+
+    def record_cutoff(self, board: BitBoard, ply: int, column: int, token: str, depth: int):
+
+        """
+        Remembers a move that produced a beta cutoff, before being played on the board
+        :param board: position on which the move was played
+        :param ply: number of tokens on the board
+        :param column: column of the move
+        :param token: token of the player that made the move
+        :param depth: remaining depth of the search, deeper cutoffs weighting more in the history
+        :return:
+        """
+
+        killers = self._killers[ply]
+
+        if column not in killers:
+            killers.insert(0, column)
+            del killers[self._killers_per_ply:]
+
+        self._history[token][column * self._height + board.heights[column]] += depth * depth
+
+    def clear(self):
+
+        """
+        Forgets all the killer moves and the history
+        :return:
+        """
+
+        for killers in self._killers:
+            killers.clear()
+
+        for token in self._history:
+            self._history[token] = [0] * len(self._history[token])
@@ -0,0 +1,219 @@
+import argparse
+import mmap
+import struct
+
+from Domain.BitBoard import BitBoard, OPPONENT, popcount
+from Domain.Windows import Geometry, DEFAULT_GEOMETRY, get_geometry, add_geometry_arguments, geometry_from_arguments
+from Service.SearchEngine import SearchEngine
+
+MAGIC = b"C4BK"
+VERSION = 3
+
+# magic, version, token to move, number of plies, rows, columns, connect length, number of positions
+HEADER = struct.Struct("<4sHcBBBBQ")
+KEY = struct.Struct("<Q")
+
+
+class OpeningBook:
+
+    def __init__(self, path: str):
+
+        """
+        Read-only opening book memory-mapped from a file written by generate_opening_book. The file holds the header,
+        then the sorted keys of the positions as 64 bit integers, then the best column of every position as a byte,
+        so a lookup is a binary search reading only a few pages of the file. A position and its mirror are stored
+        once, under their canonical key
+        :param path: path of the book file
+        """
+
+        self._file = open(path, "rb")
+
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError("The opening book file is empty!\n")
+
+        if len(self._map) < HEADER.size:
+            self.close()
+            raise ValueError("The file is not an opening book!\n")
+
+        magic, version, token, plies, rows, columns, connect, count = HEADER.unpack_from(self._map, 0)
+
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError("The file is not an opening book!\n")
+
+        if len(self._map) != HEADER.size + count * (KEY.size + 1):
+            self.close()
+            raise ValueError("The opening book file is truncated!\n")
+
+        self._token = token.decode()
+        self._plies = plies
+        self._geometry = get_geometry(rows, columns, connect)
+        self._count = count
+        self._columns_offset = HEADER.size + count * KEY.size
+
+    @property
+    def token(self):
+        return self._token
+
+    @property
+    def plies(self):
+        return self._plies
+
+    @property
+    def geometry(self):
+        return self._geometry
+
+    def __len__(self):
+
+        return self._count
+
+    def lookup(self, board: BitBoard):
+
+        """
+        Finds the best column of a position
+        :param board: position of the game
+        :return: column index, None if the position is not in the book
+        """
+
+        key, mirrored = board.canonical_key()
+        low = 0
+        high = self._count - 1
+
+        while low <= high:
+
+            middle = (low + high) // 2
+            middle_key = KEY.unpack_from(self._map, HEADER.size + middle * KEY.size)[0]
+
+            if middle_key < key:
+                low = middle + 1
+            elif middle_key > key:
+                high = middle - 1
+            else:
+                column = self._map[self._columns_offset + middle]
+                return self._geometry.mirror_column(column) if mirrored else column
+
+        return None
+
+    def close(self):
+
+        """
+        Unmaps and closes the book file
+        :return:
+        """
+
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.close()
+
+
+def collect_positions(plies: int, token: str = "X", first_token: str = "0", geometry: Geometry = DEFAULT_GEOMETRY):
+
+    """
+    Finds all the positions with at most a number of tokens on which a player has to move, no player having won
+    :param plies: maximum number of tokens on the positions
+    :param token: token of the player to move
+    :param first_token: token of the player that makes the first move of the game
+    :param geometry: geometry of the board
+    :return: dictionary from the key of every position to its bitboard
+    """
+
+    positions = {}
+
+    def visit(board: BitBoard, to_move: str):
+
+        if to_move == token:
+            key = board.key()
+            if key in positions:
+                return
+            positions[key] = board.copy()
+
+        if popcount(board.mask) == plies:
+            return
+
+        for column in board.valid_columns():
+
+            row = board.play(column, to_move)
+            if not board.is_win_through(row, column, to_move):
+                visit(board, OPPONENT[to_move])
+            board.undo()
+
+    visit(BitBoard(geometry), first_token)
+
+    return positions
+
+
+def generate_opening_book(path: str, plies: int, depth: int = 7, token: str = "X", first_token: str = "0",
+                          geometry: Geometry = DEFAULT_GEOMETRY):
+
+    """
+    Searches all the positions with at most a number of tokens on which a player has to move and writes their best
+    columns to a book file, a position and its mirror sharing a single entry
+    :param path: path of the book file
+    :param plies: maximum number of tokens on the positions of the book
+    :param depth: depth of the search of every position
+    :param token: token of the player the book is made for
+    :param first_token: token of the player that makes the first move of the game
+    :param geometry: geometry of the board, its keys having to fit in 64 bits
+    :return: number of positions written
+    """
+
+    if geometry.columns * geometry.height > 8 * KEY.size:
+        raise ValueError("The positions of this board do not fit in the keys of a book!\n")
+
+    positions = collect_positions(plies, token, first_token, geometry)
+    engine = SearchEngine(token, max_depth=depth)
+    book = {}
+
+    # Only one of a position and its mirror is searched, its column being mirrored for the canonical key
+    for board in positions.values():
+
+        key, mirrored = board.canonical_key()
+
+        if key not in book:
+            column = engine.search(board)[0]
+            book[key] = geometry.mirror_column(column) if mirrored else column
+
+    keys = sorted(book)
+    columns = bytes(book[key] for key in keys)
+
+    with open(path, "wb") as book_file:
+
+        book_file.write(HEADER.pack(MAGIC, VERSION, token.encode(), plies, geometry.rows, geometry.columns,
+                                    geometry.connect, len(keys)))
+        for key in keys:
+            book_file.write(KEY.pack(key))
+        book_file.write(columns)
+
+    return len(keys)
+
+
+def main():
+
+    parser = argparse.ArgumentParser(description="Generates the opening book of the AI")
+    parser.add_argument("path", help="path of the book file")
+    parser.add_argument("--plies", type=int, default=4, help="maximum number of tokens on the positions")
+    parser.add_argument("--depth", type=int, default=7, help="depth of the search of every position")
+    parser.add_argument("--token", default="X", help="token of the player the book is made for")
+    parser.add_argument("--first", default="0", help="token of the player that moves first")
+    add_geometry_arguments(parser)
+
+    arguments = parser.parse_args()
+
+    geometry = geometry_from_arguments(arguments)
+    count = generate_opening_book(arguments.path, arguments.plies, arguments.depth, arguments.token, arguments.first,
+                                  geometry)
+    print("Wrote", count, "positions")
+
+
+if __name__ == "__main__":
+    main()
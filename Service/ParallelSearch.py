@@ -0,0 +1,314 @@
+import math
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait
+
+from Domain.BitBoard import BitBoard, popcount
+from Service.SearchEngine import SearchEngine, SearchTimeout, win_score, loss_score
+from Service.SearchStatistics import SearchStatistics
+from Service.ThreatAnalysis import ThreatAnalysis
+from Service.TranspositionTable import TranspositionTable
+
+# Engines of the worker process, kept between tasks so that their transposition tables stay warm
+_worker_engines = {}
+_worker_search_ids = {}
+_worker_table_size = 1 << 18
+
+# Seconds between two checks of the stop event while waiting on the workers
+_POLL_INTERVAL = 0.02
+
+
+def _initialize_worker(table_size: int):
+
+    """
+    Initializer of the worker processes
+    :param table_size: number of slots of the transposition table of every worker engine
+    :return:
+    """
+
+    global _worker_table_size
+
+    _worker_table_size = table_size
+    _worker_engines.clear()
+    _worker_search_ids.clear()
+
+
+def _search_root_move(board: BitBoard, column: int, token: str, depth: int, alpha, deadline: float,
+                      node_budget: int = None, search_id: int = None):
+
+    """
+    Searches the position reached after a root move, run by the worker processes
+    :param board: root position
+    :param column: root move to be searched
+    :param token: token of the player to move on the root position
+    :param depth: depth of the root search
+    :param alpha: best score already proven for the root, the move only matters if it scores more
+    :param deadline: time.time() at which the whole search has to stop, None for no limit
+    :param node_budget: nodes the search may visit, None for no limit
+    :param search_id: id of the search the move belongs to, the transposition table of the worker being aged once
+                      per search
+    :return: tuple (column, score, nodes), the score being None if the time or node budget ran out
+    """
+
+    engine = _worker_engines.get(token)
+
+    if engine is None:
+        engine = SearchEngine(token, TranspositionTable(_worker_table_size))
+        _worker_engines[token] = engine
+
+    if search_id != _worker_search_ids.get(token):
+        engine.transposition_table.new_search()
+        _worker_search_ids[token] = search_id
+
+    # A move picked up once the search is over is not started
+    if deadline is not None and time.time() >= deadline:
+        return column, None, 0
+
+    row = board.play(column, token)
+
+    if board.is_win_through(row, column, token):
+        return column, win_score(popcount(board.mask), board.geometry.cells), 1
+
+    engine.set_position(board)
+    engine.start_budget(node_budget=node_budget, deadline=deadline)
+
+    try:
+        score = engine.minimax(board, depth - 1, alpha, math.inf, False)[1]
+    except SearchTimeout:
+        return column, None, engine.nodes
+
+    return column, score, engine.nodes
+
+
+class ParallelSearch:
+
+    def __init__(self, token: str = "X", workers: int = None, max_depth: int = 7, time_budget: float = None,
+                 node_budget: int = None, table_size: int = 1 << 18):
+
+        """
+        Splits the root moves of a search across a pool of processes. The first move of every iteration is searched
+        alone and its score is then given as alpha to the searches of its brothers, which run in parallel
+        :param token: token of the player the search is made for
+        :param workers: number of worker processes, the number of processors if not given
+        :param max_depth: deepest iteration searched, None to search until the board is full
+        :param time_budget: seconds a search may take, None for no limit
+        :param node_budget: nodes a search may visit across all the workers, None for no limit, the nodes left
+                            after the first move of an iteration being shared evenly by its brothers
+        :param table_size: number of slots of the transposition table of every worker
+        """
+
+        self._token = token
+        self._workers = workers
+        self._max_depth = max_depth
+        self._time_budget = time_budget
+        self._node_budget = node_budget
+        self._table_size = table_size
+
+        self._executor = None
+        self._search_id = 0
+        self._nodes = 0
+
+    @property
+    def token(self):
+        return self._token
+
+    @property
+    def nodes(self):
+        return self._nodes
+
+    def search(self, board: BitBoard, stop_event: threading.Event = None, statistics: SearchStatistics = None):
+
+        """
+        Searches the best move of the player on a position with iterative deepening
+        :param board: position to be searched, left unchanged
+        :param stop_event: event another thread sets to cancel the search, None if it cannot be cancelled. The
+                           moves already handed to the workers run until their own budget is spent
+        :param statistics: statistics filled with the nodes and the time of every iteration, the counters of the
+                           workers staying in their processes, None to not collect them
+        :return: tuple (column, score), the column being None if the search was cancelled before completing an
+                 iteration
+        """
+
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(self._workers, initializer=_initialize_worker,
+                                                 initargs=(self._table_size,))
+
+        max_depth = self._max_depth
+        if max_depth is None:
+            max_depth = board.geometry.cells - popcount(board.mask)
+
+        # Wins and lost positions are proven by the first iteration, as by SearchEngine.iterative_deepening
+        threats = ThreatAnalysis(board, self._token)
+        if threats.winning_columns or threats.lost:
+            max_depth = min(max_depth, 1)
+
+        # A single deadline is shared by all the moves of the search, wherever they wait before being searched
+        deadline = None
+        if self._time_budget is not None:
+            deadline = time.time() + self._time_budget
+
+        self._search_id += 1
+        self._nodes = 0
+
+        column, value = None, 0
+
+        for depth in range(1, max_depth + 1):
+
+            if stop_event is not None and stop_event.is_set():
+                break
+
+            # The first iteration always completes, so that there is a move to return
+            iteration_deadline = None
+            if deadline is not None and depth > 1:
+                iteration_deadline = deadline
+                if time.time() >= deadline:
+                    break
+
+            node_budget = None
+            if self._node_budget is not None and depth > 1:
+                node_budget = self._node_budget - self._nodes
+                if node_budget <= 0:
+                    break
+
+            iteration_start = time.perf_counter()
+            iteration_nodes = self._nodes
+
+            result = self.search_depth(board, depth, column, iteration_deadline, node_budget, stop_event)
+
+            if result is None:
+                break
+
+            column, value = result
+
+            if statistics is not None:
+                statistics.add_depth(depth, time.perf_counter() - iteration_start, self._nodes - iteration_nodes)
+
+        if statistics is not None:
+            statistics.add_nodes(self._nodes)
+
+        return column, value
+
+    def search_depth(self, board: BitBoard, depth: int, best_column: int = None, deadline: float = None,
+                     node_budget: int = None, stop_event: threading.Event = None):
+
+        """
+        Searches a position with a fixed depth
+        :param board: position to be searched
+        :param depth: depth of the search
+        :param best_column: column searched first, the best one of the previous iteration
+        :param deadline: time.time() at which the search has to stop, None for no limit
+        :param node_budget: nodes the search may visit, None for no limit
+        :param stop_event: event another thread sets to cancel the search, None if it cannot be cancelled
+        :return: tuple (column, score), None if the time or node budget ran out or the search was cancelled
+        """
+
+        if board.is_full():
+            return None, 0
+
+        # Wins and lost positions are scored as by the tactical pre-pass of SearchEngine.minimax, the workers
+        # not seeing the threats of the opponent on the leaves of a search of depth 1
+        threats = ThreatAnalysis(board, self._token)
+        ply = popcount(board.mask)
+
+        if threats.winning_columns:
+            return threats.winning_columns[0], win_score(ply + 1, board.geometry.cells)
+
+        if threats.lost:
+            return threats.obvious_column, loss_score(ply + 2, board.geometry.cells)
+
+        # The root moves that let the opponent win on its next move are not searched
+        columns = threats.safe_columns
+
+        if best_column in columns:
+            columns.remove(best_column)
+            columns.insert(0, best_column)
+
+        first = self._executor.submit(_search_root_move, board, columns[0], self._token, depth, -math.inf,
+                                      deadline, node_budget, self._search_id)
+
+        if not self.wait(first, stop_event=stop_event):
+            return None
+
+        first_column, value, nodes = first.result()
+        self._nodes += nodes
+
+        if value is None:
+            return None
+
+        if node_budget is not None and len(columns) > 1:
+            node_budget = (node_budget - nodes) // (len(columns) - 1)
+            if node_budget <= 0:
+                return None
+
+        column = first_column
+        futures = [self._executor.submit(_search_root_move, board, brother, self._token, depth, value, deadline,
+                                         node_budget, self._search_id)
+                   for brother in columns[1:]]
+
+        if not self.wait(*futures, stop_event=stop_event):
+            return None
+
+        timed_out = False
+
+        for future in futures:
+
+            brother, score, nodes = future.result()
+            self._nodes += nodes
+
+            if score is None:
+                timed_out = True
+            elif score > value:
+                value = score
+                column = brother
+
+        if timed_out:
+            return None
+
+        return column, value
+
+    @staticmethod
+    def wait(*futures, stop_event: threading.Event = None):
+
+        """
+        Waits for the moves handed to the workers, checking the stop event every few milliseconds
+        :param futures: futures of the moves
+        :param stop_event: event another thread sets to cancel the search, None if it cannot be cancelled
+        :return: True if all the moves were searched, False if the search was cancelled, the moves not yet started
+                 being cancelled as well
+        """
+
+        if stop_event is None:
+            wait(futures)
+            return True
+
+        pending = futures
+
+        while pending:
+
+            if stop_event.is_set():
+                for future in pending:
+                    future.cancel()
+                return False
+
+            pending = wait(pending, timeout=_POLL_INTERVAL).not_done
+
+        return True
+
+    def shutdown(self):
+
+        """
+        Stops the worker processes
+        :return:
+        """
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self):
+
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+
+        self.shutdown()
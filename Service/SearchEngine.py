@@ -0,0 +1,483 @@
+import math
+import threading
+import time
+
+from Domain.BitBoard import BitBoard, OPPONENT, popcount, winning_cells_function, mirror_function
+from Domain.Windows import DEFAULT_GEOMETRY
+from Service.IncrementalEvaluator import IncrementalEvaluator
+from Service.MoveOrdering import MoveOrdering
+from Service.SearchStatistics import SearchStatistics
+from Service.ThreatAnalysis import ThreatAnalysis, non_losing_cells
+from Service.TranspositionTable import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+
+WIN_SCORE = 20000
+LOSS_SCORE = -10000
+
+
+class SearchTimeout(Exception):
+
+    """
+    Raised inside minimax when the time or node budget of the current search ran out
+    """
+
+
+def win_score(ply: int, cells: int):
+
+    """
+    Returns the score of a position won by the searching player, sooner wins scoring higher
+    :param ply: number of tokens on the board after the winning move
+    :param cells: number of cells of the board
+    :return: score
+    """
+
+    return WIN_SCORE + cells - ply
+
+
+def loss_score(ply: int, cells: int):
+
+    """
+    Returns the score of a position lost by the searching player, sooner losses scoring lower
+    :param ply: number of tokens on the board after the winning move of the opponent
+    :param cells: number of cells of the board
+    :return: score
+    """
+
+    return LOSS_SCORE - (cells - ply)
+
+
+def score_bitboard(board: BitBoard, token: str):
+
+    """
+    Generates the score of a position, giving the same result as BoardService.score for the matching list board
+    :param board: possible bitboard configuration
+    :param token: token of the minimizing/maximizing player
+    :return: score of the position
+    """
+
+    geometry = board.geometry
+    count_scores = geometry.count_scores
+    own = board.masks[token]
+    opponent = board.masks[OPPONENT[token]]
+
+    score = popcount(own & geometry.center_mask) * 3
+
+    for window in geometry.window_masks:
+        score += count_scores[popcount(own & window)][popcount(opponent & window)]
+
+    return score
+
+
+class SearchEngine:
+
+    def __init__(self, token: str = "X", transposition_table: TranspositionTable = None,
+                 move_ordering: MoveOrdering = None, max_depth: int = 7, time_budget: float = None,
+                 node_budget: int = None):
+
+        """
+        Minimax search working only on the positions it is given, so that an engine can be used by its own thread or
+        process without touching the state of a game
+        :param token: token of the player the engine searches for, the maximizing player
+        :param transposition_table: table shared by the searches, a new one is created if not given
+        :param move_ordering: killer and history tables shared by the searches, new ones are created if not given
+        :param max_depth: deepest iteration searched, None to search until the board is full
+        :param time_budget: seconds a search may take, None for no limit
+        :param node_budget: nodes a search may visit, None for no limit
+        """
+
+        if transposition_table is None:
+            transposition_table = TranspositionTable()
+
+        if move_ordering is None:
+            move_ordering = MoveOrdering()
+
+        self._token = token
+        self._opponent = OPPONENT[token]
+        self._transposition_table = transposition_table
+        self._move_ordering = move_ordering
+
+        self._max_depth = max_depth
+        self._time_budget = time_budget
+        self._node_budget = node_budget
+
+        self._nodes = 0
+        self._deadline = None
+        self._node_limit = None
+        self._stop_event = None
+        self._statistics = None
+        self._evaluator = IncrementalEvaluator()
+        self._geometry = None
+        self.set_geometry(DEFAULT_GEOMETRY)
+
+    @property
+    def token(self):
+        return self._token
+
+    @property
+    def transposition_table(self):
+        return self._transposition_table
+
+    @property
+    def move_ordering(self):
+        return self._move_ordering
+
+    @property
+    def nodes(self):
+        return self._nodes
+
+    def search(self, board: BitBoard, stop_event: threading.Event = None, statistics: SearchStatistics = None):
+
+        """
+        Searches the best move of the engine on a position with the depth and budget of the engine
+        :param board: position to be searched, left unchanged
+        :param stop_event: event another thread sets to cancel the search, None if it cannot be cancelled
+        :param statistics: statistics filled by the search, None to not collect them
+        :return: tuple (column, score)
+        """
+
+        return self.iterative_deepening(board.copy(), self._max_depth, self._time_budget, self._node_budget,
+                                        stop_event, statistics)
+
+    def set_position(self, aux_board: BitBoard):
+
+        """
+        Loads the position minimax will be called on, so that the leaves are scored from the evaluator that follows
+        the moves played during the search
+        :param aux_board: bitboard to be searched
+        :return:
+        """
+
+        self._evaluator = IncrementalEvaluator(aux_board)
+        self.set_geometry(aux_board.geometry)
+
+    def set_geometry(self, geometry):
+
+        """
+        Binds the masks and the winning cells function of the geometry of the searched positions
+        :param geometry: geometry of the board
+        :return:
+        """
+
+        if geometry is self._geometry:
+            return
+
+        self._geometry = geometry
+        self._height = geometry.height
+        self._cells = geometry.cells
+        self._bottom_mask = geometry.bottom_mask
+        self._board_mask = geometry.board_mask
+        self._column_masks = geometry.column_masks
+        self._winning_cells = winning_cells_function(geometry)
+        self._move_ordering.set_geometry(geometry)
+
+        # A position and its mirror score alike, so they share their entry of the transposition table
+        self._mirror = mirror_function(geometry)
+        self._last_column = geometry.columns - 1
+
+    def start_budget(self, time_budget: float = None, node_budget: int = None, deadline: float = None):
+
+        """
+        Resets the node counter and starts the budget minimax raises SearchTimeout after
+        :param time_budget: seconds from now the search may take, None for no limit
+        :param node_budget: nodes the search may visit, None for no limit
+        :param deadline: time.time() at which the search has to stop, comparable across processes, None for no
+                         limit. The earlier of the deadline and the time budget is kept
+        :return:
+        """
+
+        self._nodes = 0
+        self._deadline = None if time_budget is None else time.perf_counter() + time_budget
+
+        if deadline is not None:
+            deadline = time.perf_counter() + deadline - time.time()
+            if self._deadline is None or deadline < self._deadline:
+                self._deadline = deadline
+
+        self._node_limit = node_budget
+
+    def iterative_deepening(self, aux_board: BitBoard, max_depth: int = None, time_budget: float = None,
+                            node_budget: int = None, stop_event: threading.Event = None,
+                            statistics: SearchStatistics = None):
+
+        """
+        Runs minimax with depth 1, 2, 3... until the maximum depth is reached or the budget of the move runs out.
+        The transposition table keeps the best move of every iteration, so it is searched first by the next one
+        :param aux_board: bitboard to be searched
+        :param max_depth: deepest iteration, None to search until the board is full
+        :param time_budget: seconds the search may take, None for no limit
+        :param node_budget: nodes the search may visit, None for no limit
+        :param stop_event: event another thread sets to cancel the search, None if it cannot be cancelled
+        :param statistics: statistics filled by the search, None to not collect them
+        :return: tuple (column, score) found by the last completed iteration, the column being None if the search
+                 was cancelled before completing one
+        """
+
+        if max_depth is None:
+            max_depth = aux_board.geometry.cells - popcount(aux_board.mask)
+
+        # The score of a win or of a lost position is proven by the first iteration. A single move that does not
+        # lose right away is still searched, its score being unknown
+        threats = ThreatAnalysis(aux_board, self._token)
+        if threats.winning_columns or threats.lost:
+            max_depth = min(max_depth, 1)
+
+        self.set_position(aux_board)
+        self._transposition_table.new_search()
+
+        start = time.perf_counter()
+        self.start_budget()
+        self._stop_event = stop_event
+        self._statistics = statistics
+
+        column, value = None, 0
+
+        for depth in range(1, max_depth + 1):
+
+            iteration_start = time.perf_counter()
+            iteration_nodes = self._nodes
+
+            try:
+                column, value = self.minimax(aux_board, depth, -math.inf, math.inf, True)
+            except SearchTimeout:
+                break
+
+            if statistics is not None:
+                statistics.add_depth(depth, time.perf_counter() - iteration_start, self._nodes - iteration_nodes)
+
+            # The first iteration always completes, so that there is a move to return
+            if time_budget is not None:
+                self._deadline = start + time_budget
+                if time.perf_counter() >= self._deadline:
+                    break
+
+            if node_budget is not None:
+                self._node_limit = node_budget
+                if self._nodes >= self._node_limit:
+                    break
+
+        if statistics is not None:
+            statistics.add_nodes(self._nodes)
+
+        self._deadline = None
+        self._node_limit = None
+        self._stop_event = None
+        self._statistics = None
+
+        return column, value
+
+    def minimax(self, aux_board: BitBoard, depth: int, alpha, beta, maximizing_player: bool):
+
+        """
+        Implementation of the minimax algorithm to determine the column of the best move to be made by the AI,
+        optimized with alpha, beta pruning. The moves are played on aux_board and taken back after being searched,
+        so a single bitboard is used for the whole tree. A move that wins is played right away, and the moves
+        that let the opponent win on its next move are only searched when every move does
+        :param aux_board: bitboard of the searched position, loaded by set_position, none of the players having
+                          won on it
+        :param depth: depth of the tree that will be generated
+        :param alpha: alpha value
+        :param beta: beta value
+        :param maximizing_player: True for the maximizing player and False for the minimizing player
+        :return: tuple (column, score), the column being None on a leaf
+        """
+
+        self._nodes += 1
+
+        if self._node_limit is not None and self._nodes > self._node_limit:
+            raise SearchTimeout()
+
+        if self._nodes & 1023 == 0:
+
+            if self._deadline is not None and time.perf_counter() > self._deadline:
+                raise SearchTimeout()
+
+            if self._stop_event is not None and self._stop_event.is_set():
+                raise SearchTimeout()
+
+        valid_columns = aux_board.valid_columns()
+
+        if not valid_columns:
+            return None, 0
+
+        if depth == 0:
+
+            if self._statistics is not None:
+                self._statistics.add_leaf()
+
+            return None, self._evaluator.score(self._token)
+
+        # Positions reached before through another order of the moves, or their mirrors, are taken from the
+        # transposition table
+
+        key = aux_board.key()
+        mirrored = False
+
+        mirror_key = self._mirror(key)
+        if mirror_key < key:
+            key = mirror_key
+            mirrored = True
+
+        entry = self._transposition_table.lookup(key)
+        alpha_original = alpha
+        beta_original = beta
+        entry_column = None
+
+        if entry is not None:
+
+            if self._statistics is not None:
+                self._statistics.add_table_hit()
+
+            entry_depth, flag, entry_score, entry_column = entry[1:]
+
+            if mirrored and entry_column is not None:
+                entry_column = self._last_column - entry_column
+
+            if entry_depth >= depth:
+
+                if flag == EXACT:
+                    return entry_column, entry_score
+                elif flag == LOWER_BOUND:
+                    alpha = max(alpha, entry_score)
+                else:
+                    beta = min(beta, entry_score)
+
+                if alpha >= beta:
+                    return entry_column, entry_score
+
+        ply = popcount(aux_board.mask)
+        cells = self._cells
+        token = self._token if maximizing_player else self._opponent
+
+        # Tactical pre-pass, the winning cells of both players being found with a few shifts of their masks
+        masks = aux_board.masks
+        position = masks[token]
+        opponent = masks[OPPONENT[token]]
+        mask = position | opponent
+        possible = (mask + self._bottom_mask) & self._board_mask
+        column_masks = self._column_masks
+
+        wins = self._winning_cells(position, mask) & possible
+
+        if wins:
+            column = next(col for col in valid_columns if wins & column_masks[col])
+            return column, win_score(ply + 1, cells) if maximizing_player else loss_score(ply + 1, cells)
+
+        threats = self._winning_cells(opponent, mask)
+        safe = non_losing_cells(threats, possible)
+
+        if not safe:
+            forced = threats & possible
+            column = next((col for col in valid_columns if forced & column_masks[col]), valid_columns[0])
+            return column, loss_score(ply + 2, cells) if maximizing_player else win_score(ply + 2, cells)
+
+        if safe != possible:
+            valid_columns = [col for col in valid_columns if safe & column_masks[col]]
+
+        valid_columns = self._move_ordering.order(aux_board, valid_columns, ply, token, entry_column)
+        evaluator = self._evaluator
+        heights = aux_board.heights
+        height = self._height
+
+        if maximizing_player:
+
+            value = -math.inf
+            column = valid_columns[0]
+            for col in valid_columns:
+
+                position = col * height + heights[col]
+                aux_board.play(col, token)
+                try:
+                    if evaluator.place(position, token):
+                        new_score = win_score(ply + 1, cells)
+                    else:
+                        new_score = self.minimax(aux_board, depth - 1, alpha, beta, False)[1]
+                finally:
+                    evaluator.remove(position, token)
+                    aux_board.undo()
+
+                if new_score > value:
+                    value = new_score
+                    column = col
+
+                alpha = max(alpha, value)
+                if alpha >= beta:
+                    self._move_ordering.record_cutoff(aux_board, ply, col, token, depth)
+                    if self._statistics is not None:
+                        self._statistics.add_cutoff(col == valid_columns[0])
+                    break
+
+            self.store_search_result(key, depth, alpha_original, beta_original,
+                                     self._last_column - column if mirrored else column, value)
+
+            return column, value
+        else:
+
+            value = math.inf
+            column = valid_columns[0]
+            for col in valid_columns:
+
+                position = col * height + heights[col]
+                aux_board.play(col, token)
+                try:
+                    if evaluator.place(position, token):
+                        new_score = loss_score(ply + 1, cells)
+                    else:
+                        new_score = self.minimax(aux_board, depth - 1, alpha, beta, True)[1]
+                finally:
+                    evaluator.remove(position, token)
+                    aux_board.undo()
+
+                if new_score < value:
+                    value = new_score
+                    column = col
+
+                beta = min(beta, value)
+                if alpha >= beta:
+                    self._move_ordering.record_cutoff(aux_board, ply, col, token, depth)
+                    if self._statistics is not None:
+                        self._statistics.add_cutoff(col == valid_columns[0])
+                    break
+
+            self.store_search_result(key, depth, alpha_original, beta_original,
+                                     self._last_column - column if mirrored else column, value)
+
+            return column, value
+
+    def store_search_result(self, key: int, depth: int, alpha, beta, column: int, value):
+
+        """
+        Stores the result of a minimax node in the transposition table, together with the kind of bound it represents
+        :param key: key of the searched position
+        :param depth: depth with which the position was searched
+        :param alpha: alpha value the node was searched with
+        :param beta: beta value the node was searched with
+        :param column: best column found
+        :param value: score found
+        :return:
+        """
+
+        if value <= alpha:
+            flag = UPPER_BOUND
+        elif value >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+
+        self._transposition_table.store(key, depth, flag, value, column)
+
+
+def search(board: BitBoard, max_depth: int = 7, time_budget: float = None, node_budget: int = None,
+           token: str = "X"):
+
+    """
+    Searches the best move on a position with a new engine, so that nothing is shared between calls
+    :param board: position to be searched, left unchanged
+    :param max_depth: deepest iteration searched, None to search until the board is full
+    :param time_budget: seconds the search may take, None for no limit
+    :param node_budget: nodes the search may visit, None for no limit
+    :param token: token of the player to move
+    :return: tuple (column, score)
+    """
+
+    engine = SearchEngine(token, max_depth=max_depth, time_budget=time_budget, node_budget=node_budget)
+
+    return engine.search(board)
@@ -0,0 +1,146 @@
+BOOK = "book"
+PONDERED = "pondered"
+THREAT = "threat"
+ENDGAME = "endgame"
+SEARCH = "search"
+PARALLEL = "parallel"
+
+
+class SearchStatistics:
+
+    def __init__(self):
+
+        """
+        Counters filled by a search it is given to. Searches given no statistics only test for None, so the
+        counting costs nothing when it is off
+        """
+
+        self._source = None
+        self._nodes = 0
+        self._leaves = 0
+        self._cutoffs = 0
+        self._first_move_cutoffs = 0
+        self._table_hits = 0
+        self._depths = []
+
+    @property
+    def source(self):
+
+        """
+        Returns where the move came from, BOOK, PONDERED, THREAT, ENDGAME, SEARCH or PARALLEL
+        """
+
+        return self._source
+
+    @source.setter
+    def source(self, source: str):
+        self._source = source
+
+    @property
+    def nodes(self):
+        return self._nodes
+
+    @property
+    def leaves(self):
+        return self._leaves
+
+    @property
+    def cutoffs(self):
+        return self._cutoffs
+
+    @property
+    def first_move_cutoffs(self):
+        return self._first_move_cutoffs
+
+    @property
+    def table_hits(self):
+        return self._table_hits
+
+    @property
+    def depths(self):
+
+        """
+        Returns a tuple (depth, seconds, nodes) for every completed iteration
+        """
+
+        return self._depths
+
+    @property
+    def seconds(self):
+        return sum(seconds for depth, seconds, nodes in self._depths)
+
+    @property
+    def first_move_cutoff_ratio(self):
+
+        """
+        Returns the share of the cutoffs made by the first move searched, close to 1 when the moves are well ordered
+        """
+
+        if self._cutoffs == 0:
+            return 0.0
+
+        return self._first_move_cutoffs / self._cutoffs
+
+    @property
+    def branching_factor(self):
+
+        """
+        Returns the effective branching factor, the growth of the nodes between the last two completed iterations
+        """
+
+        if len(self._depths) < 2 or self._depths[-2][2] == 0:
+            return 0.0
+
+        return self._depths[-1][2] / self._depths[-2][2]
+
+    def add_nodes(self, nodes: int):
+
+        self._nodes += nodes
+
+    def add_leaf(self):
+
+        self._leaves += 1
+
+    def add_cutoff(self, first_move: bool):
+
+        """
+        Counts a cutoff
+        :param first_move: True if the move making the cutoff was the first one searched
+        :return:
+        """
+
+        self._cutoffs += 1
+
+        if first_move:
+            self._first_move_cutoffs += 1
+
+    def add_table_hit(self):
+
+        self._table_hits += 1
+
+    def add_depth(self, depth: int, seconds: float, nodes: int):
+
+        """
+        Records a completed iteration
+        :param depth: depth of the iteration
+        :param seconds: time the iteration took
+        :param nodes: nodes searched by the iteration
+        :return:
+        """
+
+        self._depths.append((depth, seconds, nodes))
+
+    def summary(self):
+
+        """
+        Returns a line of text with all the counters, to be logged
+        :return: string
+        """
+
+        depths = ", ".join("{}: {:.3f} s/{} nodes".format(depth, seconds, nodes)
+                           for depth, seconds, nodes in self._depths)
+
+        return ("source {}, {} nodes, {} leaves, {} cutoffs ({:.1%} by the first move), {} table hits, "
+                "branching factor {:.2f}, depths [{}]").format(self._source, self._nodes, self._leaves, self._cutoffs,
+                                                                self.first_move_cutoff_ratio, self._table_hits,
+                                                                self.branching_factor, depths)
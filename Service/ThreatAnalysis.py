@@ -0,0 +1,115 @@
+from Domain.BitBoard import BitBoard, OPPONENT, winning_cells
+
+
+def non_losing_cells(threats: int, possible: int):
+
+    """
+    Finds the moves that do not let the opponent win on its next move. A move has to block the only winning cell
+    of the opponent if it has one, and must not be played right below a winning cell of the opponent
+    :param threats: mask of the winning cells of the opponent, as returned by winning_cells
+    :param possible: mask of the playable cells
+    :return: mask of the playable cells that do not lose right away, 0 if every move does
+    """
+
+    forced = threats & possible
+
+    if forced:
+
+        # Two winning cells cannot both be blocked
+        if forced & (forced - 1):
+            return 0
+
+        possible = forced
+
+    return possible & ~(threats >> 1)
+
+
+class ThreatAnalysis:
+
+    def __init__(self, board: BitBoard, token: str):
+
+        """
+        Tactical pre-pass over the moves of a position, run before searching it: the columns that win right away,
+        the columns the opponent must be blocked on and the poisoned columns that would let the opponent win on top
+        of the token played
+        :param board: position on which the player has to move, none of the players having won on it
+        :param token: token of the player to move
+        """
+
+        geometry = board.geometry
+        position = board.masks[token]
+        opponent = board.masks[OPPONENT[token]]
+        mask = board.mask
+        possible = board.playable_cells()
+
+        threats = winning_cells(opponent, mask, geometry)
+
+        self._winning_columns = self.columns_of(board, winning_cells(position, mask, geometry) & possible)
+        self._forced_columns = self.columns_of(board, threats & possible)
+        self._poisoned_columns = self.columns_of(board, possible & (threats >> 1))
+        self._safe_columns = self.columns_of(board, non_losing_cells(threats, possible))
+        self._valid_columns = self.columns_of(board, possible)
+
+    @staticmethod
+    def columns_of(board: BitBoard, cells: int):
+
+        """
+        Returns the columns holding some of the cells of a mask
+        :param board: position the cells belong to
+        :param cells: mask of cells
+        :return: list of column indexes, from the center to the edges
+        """
+
+        column_masks = board.geometry.column_masks
+
+        return [column for column in board.geometry.center_order if cells & column_masks[column]]
+
+    @property
+    def winning_columns(self):
+        return self._winning_columns
+
+    @property
+    def forced_columns(self):
+        return self._forced_columns
+
+    @property
+    def poisoned_columns(self):
+        return self._poisoned_columns
+
+    @property
+    def safe_columns(self):
+
+        """
+        Returns the columns that do not let the opponent win on its next move
+        """
+
+        return self._safe_columns
+
+    @property
+    def lost(self):
+
+        """
+        Checks if the opponent wins on its next move whatever the player does
+        """
+
+        return not self._winning_columns and not self._safe_columns
+
+    @property
+    def obvious_column(self):
+
+        """
+        Returns the column that needs no search: a winning one, the only one that does not lose right away, or the
+        block of a lost position, which at least stops one of the threats
+        :return: column index, None if the position has to be searched
+        """
+
+        if self._winning_columns:
+            return self._winning_columns[0]
+
+        if len(self._safe_columns) == 1:
+            return self._safe_columns[0]
+
+        if not self._safe_columns:
+            return (self._forced_columns or self._valid_columns or [None])[0]
+
+        return None
@@ -0,0 +1,134 @@
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+ALWAYS_REPLACE = "always"
+DEPTH_PREFERRED = "depth"
+
+# Odd 64 bit constant close to 2 ** 64 / golden ratio, spreading the keys over the slots by multiplication
+HASH_MULTIPLIER = 0x9E3779B97F4A7C15
+
+# Number of searches after which the generation counter of the entries wraps around
+GENERATIONS = 255
+
+
+class TranspositionTable:
+
+    def __init__(self, size: int = 1 << 20, replacement: str = DEPTH_PREFERRED):
+
+        """
+        Fixed size table of the positions already searched by minimax. The key of a position is mixed before
+        choosing its slot, since the low bits of a key only describe the first columns of the board. The slots are
+        allocated on the first store, so an engine that never searches costs no memory
+        :param size: number of slots, which bounds the memory used by the table
+        :param replacement: ALWAYS_REPLACE to overwrite the slot on every store, DEPTH_PREFERRED to keep
+                            an entry searched deeper than the new one during the same search
+        """
+
+        if size <= 0:
+            raise ValueError("The size of the transposition table must be positive!\n")
+
+        if replacement not in (ALWAYS_REPLACE, DEPTH_PREFERRED):
+            raise ValueError("Unknown replacement policy!\n")
+
+        self._size = size
+        self._replacement = replacement
+        self._entries = None
+
+        # Search during which every entry was stored, entries of older searches being replaced whatever their depth
+        self._generation = 1
+        self._generations = None
+
+    @property
+    def size(self):
+        return self._size
+
+    @property
+    def replacement(self):
+        return self._replacement
+
+    @property
+    def generation(self):
+        return self._generation
+
+    def slot(self, key: int):
+
+        """
+        Returns the slot of a position, the high bits of the key being folded into the low ones before the
+        multiplication so that every column of the board takes part in the choice of the slot
+        :param key: key of the position
+        :return: slot index
+        """
+
+        return ((key ^ key >> 32) * HASH_MULTIPLIER >> 32) % self._size
+
+    def new_search(self):
+
+        """
+        Starts a new generation of entries, called before every search so that the deep entries of the previous
+        moves, which mostly describe positions that can no longer be reached, stop holding on to their slots
+        :return:
+        """
+
+        self._generation = self._generation % GENERATIONS + 1
+
+    def lookup(self, key: int):
+
+        """
+        Finds the entry stored for a position
+        :param key: key of the position
+        :return: tuple (key, depth, flag, score, column), None if the position is not in the table
+        """
+
+        if self._entries is None:
+            return None
+
+        entry = self._entries[self.slot(key)]
+
+        if entry is not None and entry[0] == key:
+            return entry
+
+        return None
+
+    def store(self, key: int, depth: int, flag: int, score, column: int):
+
+        """
+        Stores the result of the search of a position
+        :param key: key of the position
+        :param depth: depth with which the position was searched
+        :param flag: EXACT, LOWER_BOUND or UPPER_BOUND
+        :param score: score found by the search
+        :param column: best column found by the search
+        :return:
+        """
+
+        if self._entries is None:
+            self._entries = [None] * self._size
+            self._generations = bytearray(self._size)
+
+        index = self.slot(key)
+        entry = self._entries[index]
+
+        if self._replacement == DEPTH_PREFERRED and entry is not None and entry[0] != key and entry[1] > depth and \
+                self._generations[index] == self._generation:
+            return
+
+        self._entries[index] = (key, depth, flag, score, column)
+        self._generations[index] = self._generation
+
+    def clear(self):
+
+        """
+        Removes all the entries from the table
+        :return:
+        """
+
+        self._entries = None
+        self._generations = None
+
+    def __len__(self):
+
+        if self._entries is None:
+            return 0
+
+        return sum(1 for entry in self._entries if entry is not None)
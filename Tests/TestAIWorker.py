@@ -0,0 +1,72 @@
+import time
+import unittest
+
+from Domain.Board import Board
+from Domain.MoveValidator import MoveValidator
+from Service.AIWorker import AIWorker
+from Service.BoardService import BoardService
+
+
+class TestAIWorker(unittest.TestCase):
+
+    def test_move_in_background(self):
+
+        board_service = BoardService(Board(), MoveValidator(), max_depth=3)
+        ai_worker = AIWorker(board_service)
+
+        board_service.player_move(3)
+        future = ai_worker.start()
+
+        self.assertTrue(ai_worker.thinking)
+        self.assertRaises(ValueError, ai_worker.start)
+
+        future.result()
+
+        self.assertTrue(ai_worker.done())
+
+        move = ai_worker.result()
+
+        self.assertEqual(move.token, "X")
+        self.assertFalse(ai_worker.thinking)
+
+        ai_worker.shutdown()
+
+    def test_cancel(self):
+
+        board_service = BoardService(Board(), MoveValidator(), max_depth=None)
+        ai_worker = AIWorker(board_service)
+
+        board_service.player_move(3)
+        ai_worker.start()
+        time.sleep(0.05)
+
+        start = time.perf_counter()
+        ai_worker.cancel()
+
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertFalse(ai_worker.thinking)
+        self.assertFalse(ai_worker.done())
+
+        ai_worker.shutdown()
+
+    def test_ponder(self):
+
+        board_service = BoardService(Board(), MoveValidator(), max_depth=None, time_budget=0.5)
+        ai_worker = AIWorker(board_service)
+
+        board_service.player_move(3)
+        board_service.ai_move()
+        ai_worker.ponder()
+
+        self.assertTrue(ai_worker.pondering)
+
+        board_service.player_move(3)
+        time.sleep(0.05)
+
+        start = time.perf_counter()
+        ai_worker.stop_pondering()
+
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertFalse(ai_worker.pondering)
+
+        ai_worker.shutdown()
@@ -0,0 +1,76 @@
+import unittest
+
+from Domain.BitBoard import BitBoard
+from Service.Arena import Arena, PlayerConfig, ArenaStatistics, play_game, RANDOM, SEARCH
+
+
+class TestArena(unittest.TestCase):
+
+    def test_play_game(self):
+
+        first = PlayerConfig("search", SEARCH, max_depth=3)
+        second = PlayerConfig("random", RANDOM)
+
+        result = play_game(0, first, second, seed=1)
+        board = BitBoard()
+
+        for index, column in enumerate(result.columns):
+            board.play(column, "0" if index % 2 == 0 else "X")
+
+        self.assertEqual(result.winner, "search")
+        self.assertTrue(board.is_win("0"))
+        self.assertEqual(result.move_count("search") + result.move_count("random"), len(result.columns))
+        self.assertEqual(result.nodes["random"], 0)
+        self.assertGreater(result.nodes["search"], 0)
+
+    def test_statistics(self):
+
+        first = PlayerConfig("first", RANDOM)
+        second = PlayerConfig("second", RANDOM)
+        statistics = ArenaStatistics(["first", "second"])
+
+        for index in range(10):
+            statistics.add(play_game(index, first, second, seed=index))
+
+        self.assertEqual(statistics.games, 10)
+        self.assertEqual(statistics.wins("first") + statistics.wins("second") + statistics.draws, 10)
+        self.assertAlmostEqual(statistics.win_rate("first"), statistics.wins("first") / 10)
+        self.assertEqual(statistics.nodes_per_second("first"), 0)
+
+    def test_arena(self):
+
+        first = PlayerConfig("search", SEARCH, max_depth=2)
+        second = PlayerConfig("random", RANDOM)
+
+        with Arena(first, second, workers=2) as arena:
+            results = list(arena.play(4))
+
+        self.assertEqual(sorted(result.index for result in results), [0, 1, 2, 3])
+        self.assertEqual([result.first for result in sorted(results, key=lambda result: result.index)],
+                         ["search", "random", "search", "random"])
+        self.assertEqual(arena.statistics.games, 4)
+        self.assertGreater(arena.statistics.win_rate("search"), 0.5)
+
+    def test_random_openings(self):
+
+        first = PlayerConfig("deep", SEARCH, max_depth=3)
+        second = PlayerConfig("shallow", SEARCH, max_depth=2)
+
+        games = [play_game(0, first, second, seed, opening_plies=4, opening_seed=seed).columns for seed in range(4)]
+
+        self.assertEqual(len({tuple(columns) for columns in games}), 4)
+
+        result = play_game(1, second, first, opening_plies=4, opening_seed=0)
+
+        self.assertEqual(result.columns[:4], games[0][:4])
+        self.assertEqual(result.opening_plies, 4)
+        self.assertEqual(result.move_count("shallow") + result.move_count("deep"), len(result.columns) - 4)
+
+    def test_parse(self):
+
+        player = PlayerConfig.parse("first", "search:5:0.5")
+
+        self.assertEqual((player.kind, player.max_depth, player.time_budget), (SEARCH, 5, 0.5))
+        self.assertEqual(PlayerConfig.parse("second", "random").kind, RANDOM)
+        self.assertRaises(ValueError, PlayerConfig.parse, "first", "minimax")
+        self.assertRaises(ValueError, Arena, player, player)
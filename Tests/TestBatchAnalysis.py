@@ -0,0 +1,94 @@
+import unittest
+
+from Domain.Windows import get_geometry
+from Service.BatchEvaluator import BatchEvaluator, numpy
+from Service.BatchAnalysis import BatchAnalysis, parse_position, board_from_moves, analyse_position
+from Service.SearchEngine import SearchEngine
+
+
+class TestBatchAnalysis(unittest.TestCase):
+
+    def test_parse_position(self):
+
+        self.assertEqual(parse_position('"334"'), "334")
+        self.assertEqual(parse_position('{"moves": "3", "game": 1}'), "3")
+        self.assertRaises(ValueError, parse_position, '{"columns": "3"}')
+
+    def test_board_from_moves(self):
+
+        board, token = board_from_moves("334")
+
+        self.assertEqual(token, "X")
+        self.assertEqual(board.get_token(5, 3), "0")
+        self.assertEqual(board.get_token(4, 3), "X")
+        self.assertRaises(ValueError, board_from_moves, "9")
+        self.assertRaises(ValueError, board_from_moves, "0101010")
+
+    def test_analyse_position(self):
+
+        result = analyse_position("010101", max_depth=3)
+
+        self.assertEqual((result["token"], result["column"], result["source"]), ("0", 0, "search"))
+        self.assertGreater(result["nodes"], 0)
+        self.assertIn("error", analyse_position("0101010"))
+
+    def test_analyse_endgame(self):
+
+        moves = "10606606331060263454525"
+        board, token = board_from_moves(moves)
+        result = analyse_position(moves, endgame_threshold=19)
+
+        self.assertEqual((result["source"], result["outcome"], result["distance"]), ("endgame", "loss", 4))
+        self.assertEqual((result["column"], result["score"]), SearchEngine(token, max_depth=5).search(board))
+        self.assertIsNone(analyse_position(moves, max_depth=3, endgame_threshold=None)["outcome"])
+
+    def test_analyse_other_geometry(self):
+
+        geometry = get_geometry(4, 8, 3)
+        result = analyse_position("0011", max_depth=3, geometry=geometry)
+
+        self.assertEqual((result["token"], result["column"]), ("0", 2))
+        self.assertIn("error", analyse_position("7"))
+
+        with BatchAnalysis(workers=1, max_depth=2, geometry=geometry) as analysis:
+            results = list(analysis.analyse(['"7"', '"0011"']))
+
+        self.assertEqual(results[0]["token"], "X")
+        self.assertEqual(results[1]["column"], 2)
+
+    def test_analyse(self):
+
+        lines = ['"3"', "", '{"moves": "33"}', "not json", '"0101010"', '"010101"'] * 3
+
+        with BatchAnalysis(workers=2, max_in_flight=3, max_depth=2) as analysis:
+            results = list(analysis.analyse(iter(lines)))
+
+        self.assertEqual(len(results), 15)
+        self.assertEqual([result.get("moves") for result in results[:5]], ["3", "33", None, "0101010", "010101"])
+        self.assertEqual(results[0]["token"], "X")
+        self.assertIn("error", results[2])
+        self.assertIn("error", results[3])
+        self.assertEqual(results[4]["column"], 0)
+        self.assertEqual([result.get("column") for result in results[:5]],
+                         [result.get("column") for result in results[10:]])
+        self.assertRaises(ValueError, BatchAnalysis, max_in_flight=0)
+
+    @unittest.skipIf(numpy is None, "numpy is not installed")
+    def test_analyse_static(self):
+
+        lines = ['"3"', "not json", '"333333"', '"010101"'] * 2
+
+        with BatchAnalysis(max_in_flight=3, static=True) as analysis:
+            results = list(analysis.analyse(iter(lines)))
+
+        board, token = board_from_moves("3")
+        scores = BatchEvaluator().score_moves(board, token)
+
+        self.assertEqual(len(results), 8)
+        self.assertEqual([result.get("moves") for result in results[:4]], ["3", None, "333333", "010101"])
+        self.assertEqual(results[0]["source"], "static")
+        self.assertEqual(results[0]["scores"], {str(column): score for column, score in scores.items()})
+        self.assertEqual(results[0]["score"], max(scores.values()))
+        self.assertIn("error", results[1])
+        self.assertNotIn("3", results[2]["scores"])
+        self.assertEqual(results[4:], results[:4])
@@ -0,0 +1,83 @@
+import random
+import unittest
+
+from Domain.BitBoard import BitBoard
+from Domain.Board import Board
+from Domain.MoveValidator import MoveValidator
+from Service.BatchEvaluator import BatchEvaluator, numpy
+from Service.BoardService import BoardService
+
+
+@unittest.skipIf(numpy is None, "numpy is not installed")
+class TestBatchEvaluator(unittest.TestCase):
+
+    def test_score(self):
+
+        board_service = BoardService(Board(), MoveValidator())
+        generator = random.Random(7)
+        bitboards = []
+
+        for index in range(50):
+
+            bitboard = BitBoard()
+            for move in range(generator.randrange(42)):
+                bitboard.play(generator.choice(bitboard.valid_columns()), "0" if move % 2 == 0 else "X")
+
+            bitboards.append(bitboard)
+
+        boards = [[[bitboard.get_token(row, column) for column in range(7)] for row in range(6)]
+                  for bitboard in bitboards]
+
+        evaluator = BatchEvaluator()
+        array = evaluator.encode_boards(boards)
+
+        self.assertEqual(array.shape, (50, 6, 7))
+        self.assertTrue((array == evaluator.encode_bitboards(bitboards)).all())
+
+        for token in ("X", "0"):
+            self.assertEqual(list(evaluator.score(array, token)),
+                             [board_service.score(board, token) for board in boards])
+
+    def test_score_moves(self):
+
+        board = BitBoard()
+        board.play(3, "0")
+
+        scores = BatchEvaluator().score_moves(board, "X")
+
+        self.assertEqual(sorted(scores), list(range(7)))
+        self.assertEqual(board.moves, [3])
+
+        board.play(2, "X")
+
+        self.assertEqual(scores[2], BoardService.score_bitboard(board, "X"))
+
+    def test_score_other_geometry(self):
+
+        board = Board(8, 9, 5)
+        board_service = BoardService(board, MoveValidator())
+        evaluator = BatchEvaluator(board.geometry)
+        generator = random.Random(9)
+
+        for move in range(30):
+            column = generator.choice(board.bitboard.valid_columns())
+            board.update_board(board.bitboard.next_row(column), column, "0" if move % 2 == 0 else "X")
+
+        array = evaluator.encode_bitboards([board.bitboard])
+
+        self.assertEqual(array.shape, (1, 8, 9))
+        self.assertTrue((array == evaluator.encode_boards([board.board])).all())
+
+        for token in ("X", "0"):
+            self.assertEqual(int(evaluator.score(array, token)[0]), board_service.score(board.board, token))
+
+    def test_score_children(self):
+
+        boards = [BitBoard(), BitBoard()]
+        boards[1].play(3, "0")
+        boards[1].play(3, "X")
+
+        evaluator = BatchEvaluator()
+
+        self.assertEqual(evaluator.score_children(boards, ["0", "0"]),
+                         [evaluator.score_moves(boards[0], "0"), evaluator.score_moves(boards[1], "0")])
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import unittest
+
+from Benchmarks.Benchmark import load_position, percentile, run_benchmarks, save_results, load_results, \
+    find_regressions, OPERATIONS
+from Benchmarks.Positions import POSITION_SETS
+
+
+class TestBenchmark(unittest.TestCase):
+
+    def test_positions(self):
+
+        for positions in POSITION_SETS.values():
+            for columns in positions:
+
+                board_service = load_position(columns)
+
+                self.assertEqual(len(columns) % 2, 1)
+                self.assertEqual(board_service.winner, None)
+                self.assertFalse(board_service.check_draw())
+
+    def test_percentile(self):
+
+        self.assertEqual(percentile([5, 1, 3, 2, 4], 0.5), 3)
+        self.assertEqual(percentile([5, 1, 3, 2, 4], 1), 5)
+        self.assertEqual(percentile([7], 0.95), 7)
+
+    def test_run_benchmarks(self):
+
+        results = run_benchmarks(max_depth=2, repeat=2, position_sets={"opening": ["3", "315"]})
+
+        self.assertEqual(sorted(results), sorted("opening/" + operation for operation in OPERATIONS))
+        self.assertGreater(results["opening/generate_ai_move"]["nodes_per_second"], 0)
+        self.assertLessEqual(results["opening/score"]["mean"], results["opening/score"]["p95"] * 2)
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            path = os.path.join(directory, "baseline.json")
+            save_results(path, results)
+
+            self.assertEqual(load_results(path), results)
+
+    def test_find_regressions(self):
+
+        baseline = {"opening/score": {"mean": 1.0}, "midgame/score": {"mean": 1.0}}
+        results = {"opening/score": {"mean": 1.1}, "midgame/score": {"mean": 1.5}, "endgame/score": {"mean": 9.0}}
+
+        regressions = find_regressions(results, baseline, 0.2)
+
+        self.assertEqual(len(regressions), 1)
+        self.assertTrue(regressions[0].startswith("midgame/score"))
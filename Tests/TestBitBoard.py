@@ -0,0 +1,178 @@
+import random
+import unittest
+
+from Domain.BitBoard import BitBoard, winning_cells, mirror
+from Domain.Board import Board
+from Domain.MoveValidator import MoveValidator
+from Domain.Windows import get_geometry
+from Service.BoardService import BoardService
+
+
+class TestBitBoard(unittest.TestCase):
+
+    def test_play(self):
+
+        bitboard = BitBoard()
+
+        self.assertEqual(bitboard.play(2, "X"), 5)
+        self.assertEqual(bitboard.play(2, "0"), 4)
+
+        self.assertEqual(bitboard.get_token(5, 2), "X")
+        self.assertEqual(bitboard.get_token(4, 2), "0")
+        self.assertEqual(bitboard.get_token(3, 2), " ")
+        self.assertEqual(bitboard.next_row(2), 3)
+
+    def test_valid_columns(self):
+
+        bitboard = BitBoard()
+
+        for row in range(6):
+            bitboard.play(4, "X")
+
+        self.assertFalse(bitboard.can_play(4))
+        self.assertEqual(bitboard.next_row(4), None)
+        self.assertEqual(bitboard.valid_columns(), [0, 1, 2, 3, 5, 6])
+
+    def test_is_win(self):
+
+        bitboard = BitBoard()
+
+        for column in range(3):
+            bitboard.play(column, "X")
+
+        self.assertFalse(bitboard.is_win("X"))
+
+        bitboard.play(3, "X")
+
+        self.assertTrue(bitboard.is_win("X"))
+        self.assertFalse(bitboard.is_win("0"))
+
+    def test_is_win_through(self):
+
+        bitboard = BitBoard()
+
+        for column in [0, 1, 2, 3]:
+            bitboard.play(column, "0")
+            bitboard.play(column, "X")
+
+        self.assertTrue(bitboard.is_win_through(4, 3, "X"))
+        self.assertTrue(bitboard.is_win_through(5, 0, "0"))
+        self.assertFalse(bitboard.is_win_through(5, 3, "X"))
+
+    def test_is_win_does_not_wrap_columns(self):
+
+        bitboard = BitBoard()
+
+        for token in ["0", "0", "0", "X", "X", "X"]:
+            bitboard.play(0, token)
+        bitboard.play(1, "X")
+
+        self.assertFalse(bitboard.is_win("X"))
+
+    def test_board_keeps_bitboard_in_sync(self):
+
+        board = Board()
+
+        board.update_board(5, 3, "X")
+        board.update_board(4, 3, "0")
+
+        self.assertEqual(board.bitboard.get_token(5, 3), "X")
+        self.assertEqual(board.bitboard.get_token(4, 3), "0")
+        self.assertEqual(board.bitboard.heights[3], 2)
+
+        board.update_board(4, 3, " ")
+
+        self.assertEqual(board.bitboard.heights[3], 1)
+
+    def test_score_bitboard(self):
+
+        board = Board()
+        board_service = BoardService(board, MoveValidator())
+
+        for row, column, token in [(5, 3, "X"), (5, 4, "0"), (4, 3, "X"), (5, 2, "0"), (3, 3, "X"), (5, 5, "0")]:
+            board.update_board(row, column, token)
+
+        for token in ["X", "0"]:
+            self.assertEqual(board_service.score_bitboard(board.bitboard, token),
+                             board_service.score(board.board, token))
+
+    def test_undo(self):
+
+        bitboard = BitBoard()
+
+        bitboard.play(3, "X")
+        key = bitboard.key()
+
+        bitboard.play(3, "0")
+        bitboard.play(4, "X")
+
+        self.assertEqual(bitboard.moves, [3, 3, 4])
+        self.assertEqual(bitboard.undo(), 4)
+        self.assertEqual(bitboard.undo(), 3)
+
+        self.assertEqual(bitboard.key(), key)
+        self.assertEqual(bitboard.heights, [0, 0, 0, 1, 0, 0, 0])
+        self.assertEqual(bitboard.masks["0"], 0)
+
+    def test_other_geometries(self):
+
+        random_generator = random.Random(7)
+
+        for geometry in [get_geometry(7, 8), get_geometry(8, 9, 5), get_geometry(4, 4, 3), get_geometry(6, 7, 6)]:
+            for game in range(20):
+
+                bitboard = BitBoard(geometry)
+                token = "X"
+
+                while bitboard.valid_columns():
+
+                    bitboard.play(random_generator.choice(bitboard.valid_columns()), token)
+                    token = "0" if token == "X" else "X"
+
+                    for sign in ["X", "0"]:
+
+                        position = bitboard.masks[sign]
+                        lines = [window for window in geometry.window_masks if window & position == window]
+
+                        self.assertEqual(bitboard.is_win(sign), bool(lines))
+
+                        expected = 0
+                        for row in range(geometry.rows):
+                            for column in range(geometry.columns):
+
+                                cell = geometry.cell_bit(row, column)
+                                completed = [window for window in geometry.window_masks
+                                             if window & cell and window & (position | cell) == window]
+
+                                if bitboard.mask & cell == 0 and completed:
+                                    expected |= cell
+
+                        self.assertEqual(winning_cells(position, bitboard.mask, geometry), expected)
+
+                    if bitboard.is_win("X") or bitboard.is_win("0"):
+                        break
+
+    def test_mirror(self):
+
+        for geometry in [get_geometry(), get_geometry(7, 8)]:
+
+            board = BitBoard(geometry)
+            reflection = BitBoard(geometry)
+
+            for column, token in [(0, "X"), (1, "0"), (1, "X"), (geometry.columns - 1, "0")]:
+                board.play(column, token)
+                reflection.play(geometry.mirror_column(column), token)
+
+            self.assertEqual(mirror(board.key(), geometry), reflection.key())
+            self.assertEqual(mirror(board.masks["0"], geometry), reflection.masks["0"])
+            self.assertEqual(mirror(mirror(board.key(), geometry), geometry), board.key())
+
+            key, mirrored = board.canonical_key()
+
+            self.assertEqual(reflection.canonical_key(), (key, not mirrored))
+            self.assertEqual(key, min(board.key(), reflection.key()))
+
+        board = BitBoard()
+        board.play(3, "X")
+
+        self.assertEqual(board.canonical_key(), (board.key(), False))
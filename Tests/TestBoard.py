@@ -22,3 +22,19 @@ class TestBoard(unittest.TestCase):
         board.update_board(1, 5, "X")
 
         self.assertEqual(board.get_token(1, 5), "X")
+
+    def test_play_undo(self):
+
+        board = Board()
+
+        self.assertEqual(board.play(3, "X"), 5)
+        self.assertEqual(board.play(3, "0"), 4)
+        self.assertEqual(board.get_token(4, 3), "0")
+        self.assertEqual(board.bitboard.moves, [3, 3])
+
+        move = board.undo()
+
+        self.assertEqual((move.row, move.column, move.token), (4, 3, "0"))
+        self.assertEqual(board.get_token(4, 3), " ")
+        self.assertEqual(board.bitboard.get_token(4, 3), " ")
+        self.assertEqual(board.bitboard.moves, [3])
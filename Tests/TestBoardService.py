@@ -1,5 +1,8 @@
+import threading
+import time
 import unittest
 
+from Domain.BitBoard import mirror
 from Domain.Board import Board
 from Domain.Move import Move
 from Domain.MoveValidator import MoveValidator
@@ -16,11 +19,14 @@ class TestBoardService(unittest.TestCase):
 
         board_service = BoardService(board, move_validator)
 
-        move = Move(1, 2, "X")
+        move = Move(5, 2, "X")
 
         board_service.make_move(move)
 
-        self.assertEqual(board_service.get_board()[1][2], "X")
+        self.assertEqual(board_service.get_board()[5][2], "X")
+        self.assertEqual(board.bitboard.moves, [2])
+
+        self.assertRaises(ValueError, board_service.make_move, Move(1, 2, "X"))
 
     def test_find_row(self):
 
@@ -108,3 +114,214 @@ class TestBoardService(unittest.TestCase):
 
         self.assertEqual(valid_moves, test_valid_moves)
 
+    def test_make_move_detects_win(self):
+
+        board = Board()
+
+        move_validator = MoveValidator()
+
+        board_service = BoardService(board, move_validator)
+
+        for column in range(3):
+            self.assertFalse(board_service.make_move(Move(5, column, "X")))
+
+        self.assertEqual(board_service.winner, None)
+
+        self.assertTrue(board_service.make_move(Move(5, 3, "X")))
+        self.assertEqual(board_service.winner, "X")
+        self.assertTrue(board_service.is_terminal_node())
+
+    def test_player_move_detects_win(self):
+
+        board = Board()
+
+        move_validator = MoveValidator()
+
+        board_service = BoardService(board, move_validator)
+
+        for column in range(3):
+            self.assertFalse(board_service.player_move(column))
+            board_service.make_move(Move(4, column, "X"))
+
+        self.assertTrue(board_service.player_move(3))
+        self.assertEqual(board_service.winner, "0")
+
+    def test_generate_ai_move_takes_win(self):
+
+        board = Board()
+
+        move_validator = MoveValidator()
+
+        board_service = BoardService(board, move_validator, max_depth=3)
+
+        for column in range(3):
+            board_service.make_move(Move(5, column, "X"))
+            board_service.make_move(Move(4, column, "0"))
+
+        move = board_service.generate_ai_move()
+
+        self.assertEqual(move.column, 3)
+        self.assertEqual(move.row, 5)
+        self.assertEqual(move.token, "X")
+
+    def test_nodes_of_move_without_search(self):
+
+        board = Board()
+
+        move_validator = MoveValidator()
+
+        board_service = BoardService(board, move_validator, max_depth=3)
+
+        board_service.player_move(3)
+        board_service.generate_ai_move()
+
+        self.assertGreater(board_service.nodes, 0)
+
+        for column in (4, 5):
+            board_service.make_move(Move(board_service.find_row(0), 0, "X"))
+            board_service.player_move(column)
+
+        # 0 threatens to complete its line, the block being played without searching
+        self.assertIn(board_service.generate_ai_move().column, (2, 6))
+        self.assertEqual(board_service.nodes, 0)
+
+    def test_generate_ai_move_node_budget(self):
+
+        board = Board()
+
+        move_validator = MoveValidator()
+
+        board_service = BoardService(board, move_validator, max_depth=None, node_budget=500)
+
+        board_service.player_move(3)
+
+        move = board_service.generate_ai_move()
+
+        self.assertIn((move.row, move.column), board_service.valid_moves())
+        self.assertLessEqual(board_service.nodes, 501)
+
+    def test_generate_ai_move_parallel_node_budget(self):
+
+        board = Board()
+
+        move_validator = MoveValidator()
+
+        with BoardService(board, move_validator, max_depth=None, node_budget=2000, workers=2) as board_service:
+
+            board_service.player_move(3)
+
+            move = board_service.generate_ai_move()
+
+            self.assertIn((move.row, move.column), board_service.valid_moves())
+            self.assertGreater(board_service.nodes, 0)
+            self.assertLessEqual(board_service.nodes, 2000 + 7)
+
+    def test_generate_ai_move_time_budget(self):
+
+        board = Board()
+
+        move_validator = MoveValidator()
+
+        board_service = BoardService(board, move_validator, max_depth=None, time_budget=0.05)
+
+        board_service.player_move(3)
+
+        start = time.perf_counter()
+        move = board_service.generate_ai_move()
+
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertIn((move.row, move.column), board_service.valid_moves())
+
+    def test_undo_redo(self):
+
+        board = Board()
+
+        move_validator = MoveValidator()
+
+        board_service = BoardService(board, move_validator)
+
+        for column in range(3):
+            board_service.player_move(column)
+        self.assertTrue(board_service.player_move(3))
+
+        move = board_service.undo()
+
+        self.assertEqual((move.row, move.column, move.token), (5, 3, "0"))
+        self.assertEqual(board.get_token(5, 3), " ")
+        self.assertEqual(board_service.winner, None)
+
+        board_service.redo()
+
+        self.assertEqual(board.get_token(5, 3), "0")
+        self.assertEqual(board_service.winner, "0")
+        self.assertEqual(board_service.redo(), None)
+
+        board_service.undo()
+        board_service.player_move(6)
+
+        self.assertEqual(board_service.redo(), None)
+        self.assertEqual(len(board_service.moves), 4)
+        self.assertEqual(board.bitboard.moves, [0, 1, 2, 6])
+        self.assertEqual([move.row for move in board_service.moves], [5, 5, 5, 5])
+
+    def test_full_column_keeps_redo_history(self):
+
+        board = Board()
+
+        move_validator = MoveValidator()
+
+        board_service = BoardService(board, move_validator)
+
+        for _ in range(6):
+            board_service.player_move(0)
+        board_service.player_move(1)
+        board_service.undo()
+
+        self.assertRaises(ValueError, board_service.player_move, 0)
+        self.assertRaises(ValueError, board_service.player_move, 7)
+
+        self.assertEqual(board_service.redo().column, 1)
+
+    def test_ponder(self):
+
+        board = Board()
+
+        move_validator = MoveValidator()
+
+        board_service = BoardService(board, move_validator, max_depth=3)
+
+        board_service.player_move(3)
+        board_service.ai_move()
+
+        board_service.ponder(board.bitboard.copy())
+
+        # The replies on both sides of the symmetric position share their answers
+        self.assertEqual(mirror(board.bitboard.key()), board.bitboard.key())
+        self.assertEqual(len(board_service.pondered_columns), 4)
+
+        board_service.player_move(4)
+        pondered_column = board_service.pondered_column(board.bitboard)
+
+        key, mirrored = board.bitboard.canonical_key()
+
+        self.assertTrue(mirrored)
+        self.assertEqual(pondered_column, 6 - board_service.pondered_columns[key])
+
+        move = board_service.generate_ai_move()
+
+        self.assertEqual(move.column, pondered_column)
+
+    def test_ponder_stopped(self):
+
+        board = Board()
+
+        move_validator = MoveValidator()
+
+        board_service = BoardService(board, move_validator, max_depth=3)
+
+        stop_event = threading.Event()
+        stop_event.set()
+
+        board_service.ponder(board.bitboard.copy(), stop_event)
+
+        self.assertEqual(board_service.pondered_columns, {})
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+
+from Domain.Board import Board
+from Domain.MoveValidator import MoveValidator
+from Service.BoardService import BoardService
+from UserInterface.CLI import Connect4CLI
+
+
+class TestCLI(unittest.TestCase):
+
+    def test_run_game(self):
+
+        board_service = BoardService(Board(), MoveValidator(), max_depth=3)
+        commands = iter(["3", "x", "9", "q"])
+        output = []
+
+        connect4 = Connect4CLI(board_service, lambda prompt: next(commands), output.append)
+
+        self.assertEqual(connect4.run_game(), 0)
+        self.assertEqual(len(board_service.moves), 2)
+        self.assertEqual(output.count("Invalid column!"), 2)
+        self.assertTrue(output[7].startswith("Computer played column"))
+        self.assertEqual(output[8], "|" + "|".join(board_service.get_board()[0]) + "|")
+
+    def test_headless_does_not_import_pygame(self):
+
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            # A pygame that cannot be imported, shadowing the real one if it is installed
+            with open(os.path.join(directory, "pygame.py"), "w") as stub:
+                stub.write("raise ImportError('pygame was imported by the headless game')\n")
+
+            environment = dict(os.environ, PYTHONPATH=os.pathsep.join([directory, root]))
+            code = "import sys, main; sys.exit(main.main(['--headless', '--depth', '1']))"
+
+            result = subprocess.run([sys.executable, "-c", code], input="q\n", capture_output=True, text=True,
+                                    cwd=root, env=environment)
+
+            self.assertEqual(result.returncode, 0, result.stderr)
+            self.assertIn("Column: ", result.stdout)
+
+            code = "import sys, main; main.main([])"
+            result = subprocess.run([sys.executable, "-c", code], input="", capture_output=True, text=True,
+                                    cwd=root, env=environment)
+
+            self.assertIn("pygame was imported", result.stderr)
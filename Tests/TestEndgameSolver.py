@@ -0,0 +1,146 @@
+import random
+import unittest
+
+from Domain.BitBoard import BitBoard, OPPONENT, popcount
+from Domain.Windows import get_geometry
+from Domain.Board import Board
+from Domain.Move import Move
+from Domain.MoveValidator import MoveValidator
+from Service.BoardService import BoardService
+from Service.EndgameSolver import EndgameSolver, WIN, DRAW, LOSS
+from Service.SearchEngine import SearchEngine, WIN_SCORE, LOSS_SCORE
+
+
+def play_columns(columns: str):
+
+    board = BitBoard()
+    token = "X"
+
+    for column in columns:
+        board.play(int(column), token)
+        token = "0" if token == "X" else "X"
+
+    return board, token
+
+
+class TestEndgameSolver(unittest.TestCase):
+
+    def test_immediate_win(self):
+
+        board, token = play_columns("001122")
+
+        result = EndgameSolver().solve(board, token)
+
+        self.assertEqual(result.column, 3)
+        self.assertEqual(result.outcome, WIN)
+        self.assertEqual(result.distance, 1)
+
+    def test_matches_full_search(self):
+
+        random_generator = random.Random(7)
+        solved = 0
+
+        while solved < 5:
+
+            board = BitBoard()
+            token = "X"
+
+            while len(board.moves) < 32:
+
+                column = random_generator.choice(board.valid_columns())
+                row = board.play(column, token)
+                token = OPPONENT[token]
+
+                if board.is_win_through(row, column, OPPONENT[token]):
+                    break
+            else:
+
+                solved += 1
+                moves = len(board.moves)
+
+                result = EndgameSolver().solve(board, token)
+                column, score = SearchEngine(token, max_depth=None).search(board)
+
+                if score >= WIN_SCORE:
+                    self.assertEqual((result.outcome, result.distance), (WIN, WIN_SCORE + 42 - score - moves))
+                elif score <= LOSS_SCORE:
+                    self.assertEqual((result.outcome, result.distance), (LOSS, score - LOSS_SCORE + 42 - moves))
+                else:
+                    self.assertEqual((result.outcome, result.distance), (DRAW, None))
+
+    def test_generate_ai_move_solves_endgame(self):
+
+        board = Board()
+        board_service = BoardService(board, MoveValidator(), endgame_threshold=42)
+
+        for column in range(3):
+            board_service.make_move(Move(5, column, "X"))
+            board_service.make_move(Move(4, column, "0"))
+
+        self.assertTrue(board_service.is_endgame())
+        self.assertEqual(board_service.solve().outcome, WIN)
+        self.assertEqual(board_service.solve().distance, 1)
+        self.assertEqual(board_service.generate_ai_move().column, 3)
+        self.assertEqual(board_service.nodes, 0)
+
+        board_service = BoardService(Board(), MoveValidator(), endgame_threshold=None)
+
+        self.assertFalse(board_service.is_endgame())
+
+    def test_other_geometry(self):
+
+        geometry = get_geometry(4, 4, 3)
+        cells = geometry.cells
+        scores = {}
+
+        def brute_force(board: BitBoard, token: str):
+
+            key = board.key()
+
+            if key not in scores:
+
+                moves = popcount(board.mask)
+                best_score = None
+
+                for column in board.valid_columns():
+
+                    row = board.play(column, token)
+
+                    if board.is_win_through(row, column, token):
+                        score = (cells + 1 - moves) // 2
+                    elif board.is_full():
+                        score = 0
+                    else:
+                        score = -brute_force(board, OPPONENT[token])
+
+                    board.undo()
+
+                    if best_score is None or score > best_score:
+                        best_score = score
+
+                scores[key] = best_score
+
+            return scores[key]
+
+        random_generator = random.Random(3)
+        solver = EndgameSolver()
+
+        for game in range(10):
+
+            board = BitBoard(geometry)
+            token = "X"
+
+            for move in range(random_generator.randrange(4)):
+                board.play(random_generator.choice(board.valid_columns()), token)
+                token = OPPONENT[token]
+
+            if board.is_win("X") or board.is_win("0"):
+                continue
+
+            result = solver.solve(board, token)
+
+            self.assertEqual(result.score, brute_force(board, token))
+
+            row = board.play(result.column, token)
+            if not board.is_win_through(row, result.column, token) and not board.is_full():
+                self.assertEqual(-brute_force(board, OPPONENT[token]), result.score)
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+from Domain.BitBoard import BitBoard
+from Domain.Windows import get_geometry
+from Service.GameRecordStore import GameRecordStore, HEADER, RECORD, record_struct
+
+
+class TestGameRecordStore(unittest.TestCase):
+
+    def test_append_and_read(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            path = os.path.join(directory, "games.c4gr")
+
+            with GameRecordStore(path) as store:
+
+                self.assertEqual(len(store), 0)
+                self.assertEqual(store.append([3, 3, 2, 2, 1, 1, 0], "0"), 0)
+
+                self.assertEqual(store[0].columns, [3, 3, 2, 2, 1, 1, 0])
+
+                store.append([], None)
+
+            self.assertEqual(os.path.getsize(path), HEADER.size + 2 * RECORD.size)
+
+            with GameRecordStore(path) as store:
+
+                store.append(list(range(7)) * 6, None)
+
+                self.assertEqual(len(store), 3)
+                self.assertEqual(store[-1].columns, list(range(7)) * 6)
+                self.assertEqual(store[0].winner, "0")
+                self.assertEqual(list(store.winners()), ["0", None, None])
+                self.assertEqual([len(record.columns) for record in store], [7, 0, 42])
+                self.assertRaises(IndexError, store.__getitem__, 3)
+
+                keys = list(store.replay(0))
+                board = BitBoard()
+                for column, token in zip([3, 3, 2, 2, 1, 1, 0], "0X0X0X0"):
+                    board.play(column, token)
+
+                self.assertEqual(len(keys), 7)
+                self.assertEqual(keys[-1], board.key())
+
+    def test_invalid_file(self):
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            path = os.path.join(directory, "games.c4gr")
+
+            with open(path, "wb") as record_file:
+                record_file.write(b"not a record file")
+
+            self.assertRaises(ValueError, GameRecordStore, path)
+
+    def test_other_geometry(self):
+
+        geometry = get_geometry(7, 8, 5)
+
+        with tempfile.TemporaryDirectory() as directory:
+
+            path = os.path.join(directory, "games.c4gr")
+
+            with GameRecordStore(path, geometry) as store:
+                store.append(list(range(8)) * 7, None)
+                store.append([7, 0, 7], "X")
+
+            self.assertEqual(os.path.getsize(path), HEADER.size + 2 * record_struct(geometry).size)
+            self.assertRaises(ValueError, GameRecordStore, path)
+
+            with GameRecordStore(path, geometry) as store:
+                self.assertEqual(store[0].columns, list(range(8)) * 7)
+                self.assertEqual(list(store.winners()), [None, "X"])
+                self.assertEqual(len(list(store.replay(1))), 3)
+
+        self.assertRaises(ValueError, GameRecordStore, path, get_geometry(16, 17))
@@ -0,0 +1,74 @@
+import random
+import unittest
+
+from Domain.Board import Board
+from Domain.MoveValidator import MoveValidator
+from Domain.Windows import DEFAULT_GEOMETRY
+from Service.BoardService import BoardService
+from Service.IncrementalEvaluator import IncrementalEvaluator
+
+
+class TestIncrementalEvaluator(unittest.TestCase):
+
+    def test_matches_score(self):
+
+        random_generator = random.Random(4)
+
+        for game in range(20):
+
+            board = Board()
+            board_service = BoardService(board, MoveValidator())
+            evaluator = IncrementalEvaluator()
+            token = "X"
+
+            while board_service.valid_moves():
+
+                row, column = random_generator.choice(board_service.valid_moves())
+                evaluator.place(column * DEFAULT_GEOMETRY.height + 5 - row, token)
+                board.update_board(row, column, token)
+
+                for sign in ["X", "0"]:
+                    self.assertEqual(evaluator.score(sign), board_service.score(board.board, sign))
+
+                token = "0" if token == "X" else "X"
+
+            self.assertEqual(IncrementalEvaluator(board.bitboard).score("X"), board_service.score(board.board, "X"))
+
+    def test_place_remove(self):
+
+        evaluator = IncrementalEvaluator()
+
+        for column in range(3):
+            self.assertFalse(evaluator.place(column * DEFAULT_GEOMETRY.height, "X"))
+
+        score = evaluator.score("0")
+
+        self.assertTrue(evaluator.place(3 * DEFAULT_GEOMETRY.height, "X"))
+
+        evaluator.remove(3 * DEFAULT_GEOMETRY.height, "X")
+
+        self.assertEqual(evaluator.score("0"), score)
+        self.assertEqual(evaluator.score("X"), 5 + 2)
+
+    def test_matches_score_other_geometry(self):
+
+        random_generator = random.Random(5)
+
+        for rows, columns, connect in [(7, 8, 4), (8, 9, 5), (4, 5, 3)]:
+
+            board = Board(rows, columns, connect)
+            board_service = BoardService(board, MoveValidator())
+            evaluator = IncrementalEvaluator(board.bitboard)
+            geometry = board.geometry
+            token = "X"
+
+            while board_service.valid_moves():
+
+                row, column = random_generator.choice(board_service.valid_moves())
+                evaluator.place(geometry.cell_position(row, column), token)
+                board.update_board(row, column, token)
+
+                for sign in ["X", "0"]:
+                    self.assertEqual(evaluator.score(sign), board_service.score(board.board, sign))
+
+                token = "0" if token == "X" else "X"
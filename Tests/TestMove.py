@@ -28,3 +28,19 @@ class TestMoveValidator(unittest.TestCase):
         except ValueError as ex:
 
             self.assertEqual(ex, "The column is already full!\n")
+
+    def test_validate_move_other_geometry(self):
+
+        board = Board(7, 9, 5)
+        move_validator = MoveValidator()
+
+        move_validator.validate(Move(6, 8, "X"), board)
+
+        self.assertRaises(ValueError, move_validator.validate, Move(6, 9, "X"), board)
+
+    def test_validate_full_column(self):
+
+        board = Board()
+        move_validator = MoveValidator()
+
+        self.assertRaises(ValueError, move_validator.validate, Move(None, 3, "X"), board)
@@ -0,0 +1,40 @@
+import unittest
+
+from Domain.BitBoard import BitBoard
+from Domain.Windows import DEFAULT_GEOMETRY
+from Service.MoveOrdering import MoveOrdering
+
+
+class TestMoveOrdering(unittest.TestCase):
+
+    def test_center_first(self):
+
+        board = BitBoard()
+        move_ordering = MoveOrdering()
+
+        self.assertEqual(DEFAULT_GEOMETRY.center_order, [3, 2, 4, 1, 5, 0, 6])
+        self.assertEqual(move_ordering.order(board, board.valid_columns(), 0, "X"), [3, 2, 4, 1, 5, 0, 6])
+
+    def test_best_column_first(self):
+
+        board = BitBoard()
+        move_ordering = MoveOrdering()
+
+        self.assertEqual(move_ordering.order(board, board.valid_columns(), 0, "X", 6)[0], 6)
+
+    def test_killers_and_history(self):
+
+        board = BitBoard()
+        move_ordering = MoveOrdering()
+
+        move_ordering.record_cutoff(board, 0, 0, "X", 3)
+        move_ordering.record_cutoff(board, 0, 1, "X", 1)
+        move_ordering.record_cutoff(board, 0, 5, "X", 2)
+
+        self.assertEqual(move_ordering.killers[0], [5, 1])
+        self.assertEqual(move_ordering.order(board, board.valid_columns(), 0, "X")[:3], [5, 1, 0])
+        self.assertEqual(move_ordering.order(board, board.valid_columns(), 0, "0"), [1, 5, 3, 2, 4, 0, 6])
+
+        move_ordering.clear()
+
+        self.assertEqual(move_ordering.order(board, board.valid_columns(), 0, "X"), [3, 2, 4, 1, 5, 0, 6])
@@ -0,0 +1,113 @@
+import os
+import tempfile
+import unittest
+
+from Domain.BitBoard import BitBoard
+from Domain.Board import Board
+from Domain.MoveValidator import MoveValidator
+from Domain.Windows import get_geometry
+from Service.BoardService import BoardService
+from Service.OpeningBook import OpeningBook, collect_positions, generate_opening_book
+from Service.SearchEngine import SearchEngine
+
+
+class TestOpeningBook(unittest.TestCase):
+
+    def setUp(self):
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "book.bin")
+
+    def tearDown(self):
+
+        self.directory.cleanup()
+
+    def test_collect_positions(self):
+
+        self.assertEqual(len(collect_positions(1)), 7)
+        # 0 playing its two tokens in the other order often reaches the same position
+        self.assertEqual(len(collect_positions(3)), 245)
+        self.assertEqual(len(collect_positions(2, "0")), 1 + 49)
+
+    def test_lookup(self):
+
+        # The 245 positions are stored once for every pair of mirrored positions
+        self.assertEqual(generate_opening_book(self.path, 3, 3), 125)
+
+        with OpeningBook(self.path) as opening_book:
+
+            self.assertEqual(len(opening_book), 125)
+            self.assertEqual(opening_book.token, "X")
+            self.assertEqual(opening_book.plies, 3)
+
+            board = BitBoard()
+            self.assertEqual(opening_book.lookup(board), None)
+
+            for column, token in [(3, "0"), (2, "X"), (3, "0")]:
+                board.play(column, token)
+
+            self.assertEqual(opening_book.lookup(board), SearchEngine("X", max_depth=3).search(board)[0])
+
+            mirror = BitBoard()
+            for column, token in [(3, "0"), (4, "X"), (3, "0")]:
+                mirror.play(column, token)
+
+            self.assertEqual(opening_book.lookup(mirror), 6 - opening_book.lookup(board))
+
+    def test_lookup_even_width(self):
+
+        geometry = get_geometry(6, 8)
+        generate_opening_book(self.path, 2, 3, geometry=geometry)
+
+        with OpeningBook(self.path) as opening_book:
+
+            for board in collect_positions(2, geometry=geometry).values():
+
+                mirror = BitBoard(geometry)
+                for column, token in zip(board.moves, ["0", "X"]):
+                    mirror.play(geometry.mirror_column(column), token)
+
+                # The book holds the answer searched on the position or on its mirror, which score alike
+                column, score = SearchEngine("X", max_depth=3).search(board)
+                mirror_column, mirror_score = SearchEngine("X", max_depth=3).search(mirror)
+
+                self.assertEqual(score, mirror_score)
+                self.assertIn(opening_book.lookup(board), (column, geometry.mirror_column(mirror_column)))
+
+    def test_generate_ai_move_uses_book(self):
+
+        with open(self.path, "wb"):
+            pass
+
+        self.assertRaises(ValueError, OpeningBook, self.path)
+
+        generate_opening_book(self.path, 1, 1)
+
+        with OpeningBook(self.path) as opening_book:
+
+            board = Board()
+            board_service = BoardService(board, MoveValidator(), opening_book=opening_book)
+
+            board_service.player_move(0)
+
+            self.assertEqual(board_service.generate_ai_move().column, opening_book.lookup(board.bitboard))
+            self.assertEqual(board_service.nodes, 0)
+
+    def test_other_geometry(self):
+
+        geometry = get_geometry(5, 6, 3)
+
+        self.assertEqual(generate_opening_book(self.path, 1, 3, geometry=geometry), 3)
+
+        with OpeningBook(self.path) as opening_book:
+
+            self.assertIs(opening_book.geometry, geometry)
+            self.assertIn(opening_book.lookup(next(iter(collect_positions(1, geometry=geometry).values()))), range(6))
+            self.assertRaises(ValueError, BoardService, Board(), MoveValidator(), opening_book=opening_book)
+
+            board = Board(5, 6, 3)
+            board_service = BoardService(board, MoveValidator(), opening_book=opening_book)
+
+            self.assertIs(board_service.opening_book, opening_book)
+
+        self.assertRaises(ValueError, generate_opening_book, self.path, 1, 1, geometry=get_geometry(9, 7))
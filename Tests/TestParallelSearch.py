@@ -0,0 +1,84 @@
+import math
+import threading
+import time
+import unittest
+
+from Domain.BitBoard import BitBoard
+from Service import ParallelSearch as parallel_search_module
+from Service.ParallelSearch import ParallelSearch
+from Service.SearchEngine import search
+
+
+class TestParallelSearch(unittest.TestCase):
+
+    def test_same_score_as_serial_search(self):
+
+        board = BitBoard()
+
+        for column, token in [(3, "X"), (3, "0"), (2, "X"), (4, "0")]:
+            board.play(column, token)
+
+        with ParallelSearch("X", 2, 5) as parallel_search:
+
+            column, score = parallel_search.search(board)
+
+            self.assertEqual(score, search(board, 5)[1])
+            self.assertGreater(parallel_search.nodes, 0)
+
+        self.assertEqual(board.moves, [3, 3, 2, 4])
+
+    def test_takes_win(self):
+
+        board = BitBoard()
+
+        for column in range(3):
+            board.play(column, "0")
+            board.play(column, "X")
+
+        with ParallelSearch("0", 2, 3) as parallel_search:
+            self.assertEqual(parallel_search.search(board)[0], 3)
+
+    def test_time_budget_shared_by_queued_moves(self):
+
+        board = BitBoard()
+        board.play(3, "X")
+        board.play(3, "0")
+
+        with ParallelSearch("X", 1, None, 0.3) as parallel_search:
+
+            parallel_search.search(board)
+
+            start = time.perf_counter()
+            column, score = parallel_search.search(board)
+
+            self.assertIsNotNone(column)
+            self.assertLess(time.perf_counter() - start, 0.45)
+
+    def test_stop_event_cancels_iteration(self):
+
+        board = BitBoard()
+        stop_event = threading.Event()
+
+        with ParallelSearch("X", 1, None, 2) as parallel_search:
+
+            threading.Timer(0.2, stop_event.set).start()
+
+            start = time.perf_counter()
+            column, score = parallel_search.search(board, stop_event)
+
+            self.assertLess(time.perf_counter() - start, 1)
+            self.assertIsNotNone(column)
+
+    def test_worker_table_aged_once_per_search(self):
+
+        parallel_search_module._initialize_worker(1 << 10)
+
+        parallel_search_module._search_root_move(BitBoard(), 3, "X", 3, -math.inf, None, None, 1)
+        table = parallel_search_module._worker_engines["X"].transposition_table
+        generation = table.generation
+
+        parallel_search_module._search_root_move(BitBoard(), 2, "X", 3, -math.inf, None, None, 1)
+        self.assertEqual(table.generation, generation)
+
+        parallel_search_module._search_root_move(BitBoard(), 3, "X", 3, -math.inf, None, None, 2)
+        self.assertNotEqual(table.generation, generation)
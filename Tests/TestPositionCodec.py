@@ -0,0 +1,62 @@
+import random
+import unittest
+
+from Domain.BitBoard import BitBoard
+from Domain.Board import Board
+from Domain.PositionCodec import encode_board, decode_board, decode_bitboard, pack_moves, unpack_moves
+from Domain.Windows import get_geometry
+
+
+class TestPositionCodec(unittest.TestCase):
+
+    def test_encode_decode(self):
+
+        generator = random.Random(3)
+
+        for game in range(20):
+
+            board = Board()
+            bitboard = BitBoard()
+
+            for move in range(generator.randrange(43)):
+
+                column = generator.choice(bitboard.valid_columns())
+                token = "0" if move % 2 == 0 else "X"
+                board.update_board(bitboard.play(column, token), column, token)
+
+            key = encode_board(board)
+
+            self.assertLess(key, 1 << 64)
+            self.assertEqual(decode_board(key).board, board.board)
+            self.assertEqual(decode_bitboard(key).masks, bitboard.masks)
+            self.assertEqual(decode_bitboard(key).heights, bitboard.heights)
+
+        self.assertRaises(ValueError, decode_bitboard, 0)
+        self.assertRaises(ValueError, decode_bitboard, -1)
+
+    def test_pack_moves(self):
+
+        columns = [3, 3, 4, 0, 6, 2, 1]
+        packed = pack_moves(columns)
+
+        self.assertEqual(len(packed), 4)
+        self.assertEqual(unpack_moves(packed, len(columns)), columns)
+        self.assertEqual(pack_moves([]), b"")
+        self.assertRaises(ValueError, pack_moves, [7])
+
+    def test_other_geometry(self):
+
+        geometry = get_geometry(8, 9, 5)
+        bitboard = BitBoard(geometry)
+
+        for column in [8, 8, 0, 4, 4, 4]:
+            bitboard.play(column, "X" if len(bitboard.moves) % 2 == 0 else "0")
+
+        board = decode_board(bitboard.key(), geometry)
+
+        self.assertEqual(board.geometry, geometry)
+        self.assertEqual(board.get_token(7, 8), "X")
+        self.assertEqual(board.get_token(5, 4), "0")
+        self.assertEqual(decode_bitboard(bitboard.key(), geometry).masks, bitboard.masks)
+        self.assertEqual(unpack_moves(pack_moves([8, 0], geometry), 2), [8, 0])
+        self.assertRaises(ValueError, pack_moves, [9], geometry)
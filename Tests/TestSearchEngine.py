@@ -0,0 +1,118 @@
+import unittest
+
+from Domain.BitBoard import BitBoard
+from Domain.Windows import DEFAULT_GEOMETRY, get_geometry
+from Service.IncrementalEvaluator import IncrementalEvaluator
+from Service.SearchEngine import SearchEngine, search, score_bitboard, win_score, loss_score, WIN_SCORE, LOSS_SCORE
+from Service.SearchStatistics import SearchStatistics
+
+
+def play_columns(columns: list):
+
+    board = BitBoard()
+    token = "X"
+
+    for column in columns:
+        board.play(column, token)
+        token = "0" if token == "X" else "X"
+
+    return board
+
+
+class TestSearchEngine(unittest.TestCase):
+
+    def test_search_takes_win(self):
+
+        board = play_columns([0, 0, 1, 1, 2, 2])
+
+        column, score = search(board, 3)
+
+        self.assertEqual(column, 3)
+        self.assertEqual(score, win_score(7, DEFAULT_GEOMETRY.cells))
+
+    def test_scores_of_late_results_on_larger_board(self):
+
+        cells = get_geometry(9, 11).cells
+
+        self.assertEqual(win_score(cells, cells), WIN_SCORE)
+        self.assertEqual(loss_score(cells, cells), LOSS_SCORE)
+        self.assertGreater(win_score(1, cells), win_score(cells, cells))
+
+    def test_search_blocks_loss(self):
+
+        board = play_columns([0, 0, 1, 1, 2])
+
+        column, score = search(board, 4, token="0")
+
+        self.assertEqual(column, 3)
+
+    def test_search_finds_forced_win(self):
+
+        # X plays on the bottom row with two free cells on both sides of its tokens, so 0 cannot block both
+        board = play_columns([2, 2, 3, 3])
+
+        column, score = search(board, 3)
+
+        self.assertIn(column, [1, 4])
+        self.assertGreaterEqual(score, WIN_SCORE)
+
+    def test_search_sees_losses_on_searched_position(self):
+
+        board = play_columns([3, 0, 3, 0, 3, 6])
+
+        engine = SearchEngine("0", max_depth=2)
+        column, score = engine.search(board)
+
+        self.assertEqual(column, 3)
+        self.assertGreater(score, LOSS_SCORE)
+
+    def test_search_leaves_board_unchanged(self):
+
+        board = play_columns([3, 3, 4])
+        key = board.key()
+
+        search(board, 5)
+
+        self.assertEqual(board.key(), key)
+        self.assertEqual(board.moves, [3, 3, 4])
+
+    def test_search_full_board(self):
+
+        board = BitBoard()
+
+        for column in range(7):
+            for row in range(6):
+                board.play(column, "X" if (row + column // 2) % 2 else "0")
+
+        self.assertEqual(search(board, 3), (None, 0))
+
+    def test_search_shares_mirrored_positions(self):
+
+        board = play_columns([3, 2, 3, 1])
+        mirror = play_columns([3, 4, 3, 5])
+
+        self.assertEqual(search(board, 5)[1], search(mirror, 5)[1])
+
+        engine = SearchEngine("X", max_depth=5)
+        engine.search(board)
+
+        statistics = SearchStatistics()
+        column, score = engine.search(mirror, statistics=statistics)
+
+        self.assertEqual(score, search(board, 5)[1])
+        self.assertEqual(statistics.table_hits, len(statistics.depths))
+        self.assertEqual(statistics.nodes, len(statistics.depths))
+
+    def test_mirrored_positions_score_alike_on_even_width(self):
+
+        geometry = get_geometry(6, 8)
+
+        for column in range(geometry.columns):
+
+            board = BitBoard(geometry)
+            board.play(column, "X")
+            mirror = BitBoard(geometry)
+            mirror.play(geometry.mirror_column(column), "X")
+
+            self.assertEqual(score_bitboard(board, "X"), score_bitboard(mirror, "X"))
+            self.assertEqual(IncrementalEvaluator(board).score("X"), score_bitboard(board, "X"))
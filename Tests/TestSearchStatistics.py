@@ -0,0 +1,76 @@
+import unittest
+
+from Benchmarks.Benchmark import load_position
+from Benchmarks.Positions import ENDGAME as ENDGAME_POSITIONS
+from Domain.Board import Board
+from Domain.MoveValidator import MoveValidator
+from Service.BoardService import BoardService
+from Service.SearchEngine import SearchEngine
+from Service.SearchStatistics import SearchStatistics, SEARCH, ENDGAME, THREAT
+
+
+class TestSearchStatistics(unittest.TestCase):
+
+    def test_counters(self):
+
+        statistics = SearchStatistics()
+
+        statistics.add_cutoff(True)
+        statistics.add_cutoff(False)
+        statistics.add_depth(1, 0.5, 10)
+        statistics.add_depth(2, 1.0, 40)
+
+        self.assertEqual(statistics.first_move_cutoff_ratio, 0.5)
+        self.assertEqual(statistics.branching_factor, 4)
+        self.assertEqual(statistics.seconds, 1.5)
+        self.assertIn("2 cutoffs", statistics.summary())
+
+    def test_search(self):
+
+        board_service = BoardService(Board(), MoveValidator(), max_depth=5)
+        board_service.player_move(3)
+
+        engine = SearchEngine("X", max_depth=5)
+        expected = engine.search(board_service.game_board.bitboard)
+
+        statistics = SearchStatistics()
+        engine = SearchEngine("X", max_depth=5)
+
+        self.assertEqual(engine.search(board_service.game_board.bitboard, statistics=statistics), expected)
+        self.assertEqual(statistics.nodes, engine.nodes)
+        self.assertEqual([depth for depth, seconds, nodes in statistics.depths], [1, 2, 3, 4, 5])
+        self.assertEqual(sum(nodes for depth, seconds, nodes in statistics.depths), engine.nodes)
+        self.assertGreater(statistics.leaves, 0)
+        self.assertGreater(statistics.cutoffs, 0)
+        self.assertGreater(statistics.first_move_cutoff_ratio, 0.5)
+        self.assertGreater(statistics.table_hits, 0)
+
+    def test_generate_ai_move(self):
+
+        board_service = BoardService(Board(), MoveValidator(), max_depth=3)
+        board_service.player_move(3)
+
+        statistics = SearchStatistics()
+
+        with self.assertLogs("Service.BoardService", "INFO"):
+            board_service.generate_ai_move(statistics=statistics)
+
+        self.assertEqual(statistics.source, SEARCH)
+        self.assertEqual(statistics.nodes, board_service.nodes)
+
+        board_service = load_position(ENDGAME_POSITIONS[5])
+
+        statistics = SearchStatistics()
+        board_service.generate_ai_move(statistics=statistics)
+
+        self.assertEqual(statistics.source, ENDGAME)
+        self.assertGreater(statistics.nodes, 0)
+
+        # The only move that does not lose right away is played without searching
+        board_service = load_position(ENDGAME_POSITIONS[3])
+
+        statistics = SearchStatistics()
+        board_service.generate_ai_move(statistics=statistics)
+
+        self.assertEqual(statistics.source, THREAT)
+        self.assertEqual(statistics.nodes, 0)
@@ -0,0 +1,105 @@
+import unittest
+
+from Domain.BitBoard import BitBoard
+from Domain.Windows import DEFAULT_GEOMETRY
+from Service.BatchAnalysis import board_from_moves
+from Service.ParallelSearch import ParallelSearch
+from Service.SearchEngine import SearchEngine, win_score
+from Service.ThreatAnalysis import ThreatAnalysis
+
+
+class TestThreatAnalysis(unittest.TestCase):
+
+    def setUp(self):
+
+        self.board = BitBoard()
+
+        for column in range(3):
+            self.board.play(column, "X")
+
+        self.board.play(6, "0")
+        self.board.play(6, "0")
+
+    def test_immediate_win(self):
+
+        threats = ThreatAnalysis(self.board, "X")
+
+        self.assertEqual(threats.winning_columns, [3])
+        self.assertEqual(threats.forced_columns, [])
+        self.assertEqual(threats.obvious_column, 3)
+        self.assertFalse(threats.lost)
+
+    def test_forced_block(self):
+
+        threats = ThreatAnalysis(self.board, "0")
+
+        self.assertEqual(threats.winning_columns, [])
+        self.assertEqual(threats.forced_columns, [3])
+        self.assertEqual(threats.safe_columns, [3])
+        self.assertEqual(threats.obvious_column, 3)
+
+    def test_poisoned_column(self):
+
+        board = BitBoard()
+
+        for column, token in zip(range(3), ["0", "X", "0"]):
+            board.set_token(5, column, token)
+            board.set_token(4, column, "X")
+
+        board.set_token(5, 5, "0")
+        board.set_token(5, 6, "0")
+
+        threats = ThreatAnalysis(board, "0")
+
+        self.assertEqual(threats.forced_columns, [])
+        self.assertEqual(threats.poisoned_columns, [3])
+        self.assertEqual(threats.safe_columns, [2, 4, 1, 5, 0, 6])
+        self.assertIsNone(threats.obvious_column)
+
+    def test_lost(self):
+
+        board = BitBoard()
+
+        for column in range(1, 4):
+            board.play(column, "X")
+
+        board.play(6, "0")
+        board.play(6, "0")
+
+        threats = ThreatAnalysis(board, "0")
+
+        self.assertEqual(threats.forced_columns, [4, 0])
+        self.assertEqual(threats.safe_columns, [])
+        self.assertTrue(threats.lost)
+        self.assertEqual(threats.obvious_column, 4)
+
+    def test_search_shortcuts(self):
+
+        engine = SearchEngine("X", max_depth=7)
+
+        self.assertEqual(engine.search(self.board), (3, win_score(6, DEFAULT_GEOMETRY.cells)))
+        self.assertEqual(engine.nodes, 1)
+
+        engine = SearchEngine("0", max_depth=7)
+
+        self.assertEqual(engine.search(self.board)[0], 3)
+
+    def test_search_forced_move(self):
+
+        # Black has a single move that does not lose right away, and loses after it
+        board, token = board_from_moves("10606606331060263454525")
+        threats = ThreatAnalysis(board, token)
+
+        self.assertEqual(len(threats.safe_columns), 1)
+        self.assertEqual(SearchEngine(token, max_depth=5).search(board), SearchEngine(token, max_depth=3).search(board))
+        self.assertLess(SearchEngine(token, max_depth=5).search(board)[1], 0)
+
+    def test_parallel_search_lost(self):
+
+        board, token = board_from_moves("6546113211234651234")
+        expected = SearchEngine(token, max_depth=7).search(board)
+
+        self.assertTrue(ThreatAnalysis(board, token).lost)
+
+        with ParallelSearch(token, workers=2, max_depth=7) as search:
+            self.assertEqual(search.search(board), expected)
@@ -0,0 +1,102 @@
+import unittest
+
+from Domain.BitBoard import BitBoard
+from Service.TranspositionTable import TranspositionTable, ALWAYS_REPLACE, DEPTH_PREFERRED, EXACT, LOWER_BOUND
+
+
+def colliding_key(table: TranspositionTable, key: int):
+
+    return next(other for other in range(key + 1, key + (1 << 16)) if table.slot(other) == table.slot(key))
+
+
+class TestTranspositionTable(unittest.TestCase):
+
+    def test_store_lookup(self):
+
+        table = TranspositionTable(64)
+
+        table.store(130, 3, EXACT, 12, 4)
+
+        self.assertEqual(table.lookup(130), (130, 3, EXACT, 12, 4))
+        self.assertEqual(table.lookup(131), None)
+        self.assertEqual(table.lookup(130 + 64), None)
+        self.assertEqual(len(table), 1)
+
+    def test_depth_preferred(self):
+
+        table = TranspositionTable(64, DEPTH_PREFERRED)
+        other = colliding_key(table, 1)
+
+        table.store(1, 5, EXACT, 12, 4)
+        table.store(other, 2, LOWER_BOUND, 7, 3)
+
+        self.assertNotEqual(table.lookup(1), None)
+        self.assertEqual(table.lookup(other), None)
+
+        table.store(1, 1, LOWER_BOUND, 9, 2)
+
+        self.assertEqual(table.lookup(1), (1, 1, LOWER_BOUND, 9, 2))
+
+        # The deep entry of a previous search gives its slot away
+        table.new_search()
+        table.store(other, 2, LOWER_BOUND, 7, 3)
+
+        self.assertEqual(table.lookup(1), None)
+        self.assertEqual(table.lookup(other), (other, 2, LOWER_BOUND, 7, 3))
+
+    def test_always_replace(self):
+
+        table = TranspositionTable(64, ALWAYS_REPLACE)
+        other = colliding_key(table, 1)
+
+        table.store(1, 5, EXACT, 12, 4)
+        table.store(other, 2, LOWER_BOUND, 7, 3)
+
+        self.assertEqual(table.lookup(1), None)
+        self.assertEqual(table.lookup(other), (other, 2, LOWER_BOUND, 7, 3))
+        self.assertEqual(len(table), 1)
+
+    def test_invalid_table(self):
+
+        self.assertRaises(ValueError, TranspositionTable, 0)
+        self.assertRaises(ValueError, TranspositionTable, 64, "random")
+
+    def test_transpositions_share_key(self):
+
+        first = BitBoard()
+        second = BitBoard()
+
+        for column, token in [(3, "X"), (2, "0"), (4, "X")]:
+            first.play(column, token)
+        for column, token in [(4, "X"), (2, "0"), (3, "X")]:
+            second.play(column, token)
+
+        self.assertEqual(first.key(), second.key())
+
+        second.play(3, "0")
+
+        self.assertNotEqual(first.key(), second.key())
+
+    def test_slots_use_every_column(self):
+
+        table = TranspositionTable(1 << 20)
+
+        self.assertEqual(len(table), 0)
+
+        # Keys differing only on the last columns of the board must spread over the table
+        board = BitBoard()
+        slots = set()
+
+        for first in range(3, 7):
+            for second in range(3, 7):
+                for third in range(3, 7):
+
+                    for column, token in [(first, "X"), (second, "0"), (third, "X")]:
+                        board.play(column, token)
+
+                    slots.add(table.slot(board.key()))
+
+                    for _ in range(3):
+                        board.undo()
+
+        self.assertGreater(len(slots), 30)
@@ -0,0 +1,79 @@
+import argparse
+import pickle
+import unittest
+
+from Domain.Windows import TOKEN_CODES, DEFAULT_GEOMETRY, get_geometry, add_geometry_arguments, geometry_from_arguments
+
+
+class TestWindows(unittest.TestCase):
+
+    def test_windows(self):
+
+        window_cells = DEFAULT_GEOMETRY.window_cells
+
+        self.assertEqual(len(window_cells), 69)
+        self.assertEqual(len(set(DEFAULT_GEOMETRY.window_masks)), 69)
+        self.assertEqual(window_cells[0], ((5, 0), (5, 1), (5, 2), (5, 3)))
+
+    def test_cell_windows(self):
+
+        cell_windows = DEFAULT_GEOMETRY.cell_windows
+        cell_position = DEFAULT_GEOMETRY.cell_position
+
+        self.assertEqual(len(cell_windows[cell_position(5, 0)]), 3)
+        self.assertEqual(len(cell_windows[cell_position(2, 3)]), 13)
+
+        for index in cell_windows[cell_position(2, 3)]:
+            self.assertIn((2, 3), DEFAULT_GEOMETRY.window_cells[index])
+
+    def test_pattern_scores(self):
+
+        def pattern(window: list):
+            return sum(TOKEN_CODES[cell] * 3 ** index for index, cell in enumerate(window))
+
+        pattern_scores = DEFAULT_GEOMETRY.pattern_scores
+
+        self.assertEqual(len(pattern_scores["X"]), 81)
+        self.assertEqual(pattern_scores["X"][pattern(["X", "X", "X", "X"])], 10000)
+        self.assertEqual(pattern_scores["0"][pattern(["X", "X", "X", "X"])], -10000)
+        self.assertEqual(pattern_scores["X"][pattern(["X", " ", "X", "X"])], 5)
+        self.assertEqual(pattern_scores["X"][pattern([" ", "X", " ", "X"])], 2)
+        self.assertEqual(pattern_scores["X"][pattern(["0", "0", " ", "0"])], -4)
+        self.assertEqual(pattern_scores["X"][pattern(["0", "X", "X", "X"])], 0)
+
+    def test_geometry(self):
+
+        geometry = get_geometry(7, 8)
+
+        self.assertIs(geometry, get_geometry(7, 8, 4))
+        self.assertEqual(geometry.height, 8)
+        self.assertEqual(geometry.cells, 56)
+        self.assertEqual(len(geometry.window_cells), 7 * 5 + 8 * 4 + 2 * 4 * 5)
+        self.assertEqual(geometry.center_order[:2], [3, 4])
+        self.assertEqual(geometry.center_columns, (3, 4))
+        self.assertEqual(DEFAULT_GEOMETRY.center_columns, (3,))
+
+        geometry = get_geometry(8, 9, 5)
+
+        self.assertEqual(len(geometry.window_cells), 8 * 5 + 9 * 4 + 2 * 4 * 5)
+        self.assertEqual(len(geometry.pattern_scores["X"]), 3 ** 5)
+        self.assertEqual(len(set(geometry.window_masks)), len(geometry.window_masks))
+        self.assertEqual(geometry.center_order[0], 4)
+
+        self.assertIs(DEFAULT_GEOMETRY, get_geometry())
+        self.assertIs(pickle.loads(pickle.dumps(geometry)), geometry)
+
+    def test_invalid_geometry(self):
+
+        self.assertRaises(ValueError, get_geometry, 0, 7)
+        self.assertRaises(ValueError, get_geometry, 6, 7, 8)
+        self.assertRaises(ValueError, get_geometry, 6, 7, 1)
+        self.assertRaises(ValueError, get_geometry, 6, 7, 2)
+
+    def test_geometry_arguments(self):
+
+        parser = argparse.ArgumentParser()
+        add_geometry_arguments(parser)
+
+        self.assertIs(geometry_from_arguments(parser.parse_args([])), DEFAULT_GEOMETRY)
+        self.assertIs(geometry_from_arguments(parser.parse_args(["--columns", "8"])), get_geometry(6, 8))
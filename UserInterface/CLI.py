@@ -0,0 +1,68 @@
+from Service.BoardService import BoardService
+
+
+class Connect4CLI:
+
+    def __init__(self, board_service: BoardService, input_function=input, output_function=print):
+        """
+        Text interface of the game, importing nothing but the engine so that it runs where pygame is not installed
+        :param board_service: service of the game
+        :param input_function: function reading a line typed by the player
+        :param output_function: function showing a line to the player
+        """
+
+        self._board_service = board_service
+        self._input = input_function
+        self._output = output_function
+
+    def draw_board(self):
+        """
+        Shows the board, with the column indexes under it
+        :return:
+        """
+
+        for line in self._board_service.get_board():
+            self._output("|" + "|".join(line) + "|")
+
+        self._output(" " + " ".join(str(column) for column in range(len(self._board_service.get_board()[0]))))
+
+    def run_game(self):
+        """
+        Runs game, the player typing the column of every move. Q quits
+        :return: exit code of the game
+        """
+
+        self.draw_board()
+
+        while True:
+
+            command = self._input("Column: ").strip().lower()
+
+            if command == "q":
+                return 0
+
+            if not command.isdigit() or int(command) not in self._board_service.game_board.bitboard.valid_columns():
+                self._output("Invalid column!")
+                continue
+
+            if self._board_service.player_move(int(command)):
+                self.draw_board()
+                self._output("Congrats, you win!")
+                return 0
+
+            if self._board_service.check_draw():
+                self.draw_board()
+                self._output("It's a DRAW!")
+                return 0
+
+            computer_won = self._board_service.ai_move()
+            self._output("Computer played column " + str(self._board_service.moves[-1].column))
+            self.draw_board()
+
+            if computer_won:
+                self._output("Game over! Computer wins!")
+                return 0
+
+            if self._board_service.check_draw():
+                self._output("It's a DRAW!")
+                return 0
@@ -2,120 +2,238 @@ import sys
 
 import pygame
 
+from Service.AIWorker import AIWorker
 from Service.BoardService import BoardService
 
+FRAME_RATE = 30
+
+SQUARE_SIZE = 100
+RADIUS = 45
+
+BLUE = (0, 0, 255)
+BLACK = (0, 0, 0)
+RED = (255, 0, 0)
+YELLOW = (255, 255, 0)
+
+TOKEN_COLORS = {" ": BLACK, "X": RED, "0": YELLOW}
+
 
 class Connect4GUI:
 
     def __init__(self, board_service: BoardService):
         self._board_service = board_service
 
-        pygame.init()
         pygame.mixer.pre_init(44100, -16, 2, 2048)
-        pygame.mixer.init()
-        pygame.mixer.music.load('background.mp3')
-        pygame.mixer.music.play(-1)
+        pygame.init()
 
-        self.piece = pygame.mixer.Sound("piece_drop.mp3")
+        self._piece = None
 
         pygame.display.set_caption('Connect 4')
-        size = (700, 600)
+        geometry = board_service.game_board.geometry
+        size = (geometry.columns * SQUARE_SIZE, geometry.rows * SQUARE_SIZE)
         self.screen = pygame.display.set_mode(size)
 
+        self._ai_worker = AIWorker(board_service)
+
+        self._cell_surfaces = self.render_cells()
+        self._drawn_tokens = None
+
+    @property
+    def piece(self):
+
+        """
+        Returns the sound of a dropped piece, decoded the first time a piece is dropped
+        """
+
+        if self._piece is None:
+            self._piece = pygame.mixer.Sound("piece_drop.mp3")
+
+        return self._piece
+
+    @staticmethod
+    def play_music():
+        """
+        Streams the background music from its file instead of decoding it all in memory
+        :return:
+        """
+
+        pygame.mixer.music.load('background.mp3')
+        pygame.mixer.music.play(-1)
+
+    @staticmethod
+    def render_cells():
+        """
+        Renders once the square of a cell for every token, so that drawing a cell is a single blit
+        :return: dictionary from every token to the surface of its cell
+        """
+
+        cell_surfaces = {}
+
+        for token, color in TOKEN_COLORS.items():
+
+            surface = pygame.Surface((SQUARE_SIZE, SQUARE_SIZE)).convert()
+            surface.fill(BLUE)
+            pygame.draw.circle(surface, color, (SQUARE_SIZE // 2, SQUARE_SIZE // 2), RADIUS)
+
+            cell_surfaces[token] = surface
+
+        return cell_surfaces
+
     def draw_board(self):
         """
-        Draws board
+        Draws the cells whose token changed since the last call and updates only their part of the display
         :return:
         """
 
-        blue = (0, 0, 255)
-        black = (0, 0, 0)
-        red = (255, 0, 0)
-        yellow = (255, 255, 0)
+        board = self._board_service.game_board.board
 
-        for column in range(7):
-            for line in range(5, -1, -1):
-                pygame.draw.rect(self.screen, blue, (column * 100, line * 100, 100, 100))
+        if self._drawn_tokens is None:
+            self._drawn_tokens = [[None] * len(line) for line in board]
 
-                if self._board_service.game_board.get_token(line, column) == "X":
-                    pygame.draw.circle(self.screen, red, (int(column * 100 + 100 / 2),
-                                                          int(line * 100 + 100 / 2)), 45)
+        dirty_rects = []
 
-                elif self._board_service.game_board.get_token(line, column) == "0":
-                    pygame.draw.circle(self.screen, yellow, (int(column * 100 + 100 / 2),
-                                                             int(line * 100 + 100 / 2)), 45)
-                else:
-                    pygame.draw.circle(self.screen, black, (int(column * 100 + 100 / 2),
-                                                            int(line * 100 + 100 / 2)), 45)
+        for line, tokens in enumerate(board):
+            for column, token in enumerate(tokens):
+
+                if self._drawn_tokens[line][column] != token:
+
+                    dirty_rects.append(self.screen.blit(self._cell_surfaces[token],
+                                                        (column * SQUARE_SIZE, line * SQUARE_SIZE)))
+                    self._drawn_tokens[line][column] = token
+
+        if dirty_rects:
+            pygame.display.update(dirty_rects)
+
+    def invalidate_board(self):
+        """
+        Makes the next call of draw_board draw every cell, for when the content of the window was lost
+        :return:
+        """
+
+        self._drawn_tokens = None
+
+    def draw_status(self):
+        """
+        Shows in the title of the window whether the computer is thinking
+        :return:
+        """
+
+        caption = 'Connect 4 - thinking...' if self._ai_worker.thinking else 'Connect 4'
 
-        pygame.display.update()
+        if pygame.display.get_caption()[0] != caption:
+            pygame.display.set_caption(caption)
 
     def run_game(self):
 
         """
-        Runs game
+        Runs game, the computer thinking on a background thread while the window keeps handling events and
+        being redrawn. The loop sleeps until the next event while the player is thinking and is capped to
+        FRAME_RATE otherwise. N starts a new game
         :return:
         """
 
+        clock = pygame.time.Clock()
+        self.play_music()
+        self.draw_board()
+
         while True:
             try:
 
-                for event in pygame.event.get():
+                if self._ai_worker.thinking:
+                    events = pygame.event.get()
+                else:
+                    # Nothing changes on the board until the player acts
+                    events = [pygame.event.wait()] + pygame.event.get()
+
+                for event in events:
+                    if event.type == pygame.VIDEOEXPOSE:
+                        self.invalidate_board()
+
                     if event.type == pygame.QUIT:
+                        self._ai_worker.shutdown()
                         sys.exit()
 
-                    self.draw_board()
+                    if event.type == pygame.KEYDOWN and event.key == pygame.K_n:
+                        self.new_game()
 
-                    if event.type == pygame.MOUSEBUTTONDOWN:
+                    if event.type == pygame.MOUSEBUTTONDOWN and not self._ai_worker.thinking:
 
                         self.piece.play()
-                        self.handle_player_move(event)
+                        player_won = self.handle_player_move(event)
                         self.draw_board()
 
-                        if self._board_service.check_win("0"):
+                        if player_won:
                             print("Congrats, you win!")
-                            pygame.time.wait(5000)
-                            return 0
+                            return self.end_game()
 
                         if self._board_service.check_draw():
                             print("It's a DRAW!")
-                            pygame.time.wait(5000)
-                            return 0
+                            return self.end_game()
 
-                        self.handle_computer_move()
-                        self.piece.play()
-                        self.draw_board()
+                        self._ai_worker.start()
 
-                        if self._board_service.check_win("X"):
-                            print("Game over! Computer wins!")
-                            pygame.time.wait(5000)
-                            return 0
+                if self._ai_worker.done():
 
-                        if self._board_service.check_draw():
-                            print("It's a DRAW!")
-                            pygame.time.wait(5000)
-                            return 0
+                    computer_won = self.handle_computer_move()
+                    self.piece.play()
+                    self.draw_board()
+
+                    if computer_won:
+                        print("Game over! Computer wins!")
+                        return self.end_game()
+
+                    if self._board_service.check_draw():
+                        print("It's a DRAW!")
+                        return self.end_game()
+
+                    self._ai_worker.ponder()
+
+                self.draw_status()
+                self.draw_board()
+                clock.tick(FRAME_RATE)
 
             except Exception as ex:
                 print("Oops: ", ex)
 
+    def new_game(self):
+        """
+        Cancels the search of the computer and clears the board
+        :return:
+        """
+
+        self._ai_worker.cancel()
+
+        while self._board_service.undo() is not None:
+            pass
+
+    def end_game(self):
+        """
+        Shows the final board for a while and stops the worker of the computer
+        :return: exit code of the game
+        """
+
+        pygame.time.wait(5000)
+        self._ai_worker.shutdown()
+
+        return 0
+
     def handle_player_move(self, event):
         """
         Handles the move made by the player
         :param event:
-        :return:
+        :return: True if the player won, False otherwise
         """
 
         column_pos_clicked = event.pos[0]
 
-        column = column_pos_clicked // 100
+        column = column_pos_clicked // SQUARE_SIZE
 
-        self._board_service.player_move(column)
+        return self._board_service.player_move(column)
 
     def handle_computer_move(self):
         """
-        Handles the move made by the computer
-        :return:
+        Makes the move found by the computer on the background thread
+        :return: True if the computer won, False otherwise
         """
 
-        self._board_service.ai_move()
+        return self._board_service.make_move(self._ai_worker.result())
@@ -1,18 +1,36 @@
+import argparse
+
 from Domain.Board import Board
 from Domain.MoveValidator import MoveValidator
+from Domain.Windows import add_geometry_arguments
 from Service.BoardService import BoardService
-from UserInterface.GUI import Connect4GUI
 
 
-def main():
+def main(arguments: list = None):
+
+    parser = argparse.ArgumentParser(description="Connect 4 against the computer")
+    parser.add_argument("--headless", action="store_true", help="plays in the terminal, without loading pygame")
+    parser.add_argument("--depth", type=int, default=7, help="deepest iteration searched by the computer")
+    parser.add_argument("--time", type=float, default=None, help="seconds the computer may spend on a move")
+    add_geometry_arguments(parser)
 
-    board = Board()
+    arguments = parser.parse_args(arguments)
+
+    board = Board(arguments.rows, arguments.columns, arguments.connect)
     move_validator = MoveValidator()
 
-    board_service = BoardService(board, move_validator)
+    with BoardService(board, move_validator, max_depth=arguments.depth, time_budget=arguments.time) as board_service:
+
+        # pygame and the audio files are only loaded when the window is shown
+        if arguments.headless:
+            from UserInterface.CLI import Connect4CLI
+            connect4 = Connect4CLI(board_service)
+        else:
+            from UserInterface.GUI import Connect4GUI
+            connect4 = Connect4GUI(board_service)
 
-    connect4 = Connect4GUI(board_service)
+        return connect4.run_game()
 
-    connect4.run_game()
 
-main()
+if __name__ == "__main__":
+    main()